@@ -0,0 +1,243 @@
+# content_factory/asset_library.py (CATALOGUE LOCAL INDEXÉ DES ASSETS)
+
+import os
+import re
+import time
+import heapq
+import random
+import sqlite3
+import hashlib
+import threading
+import subprocess
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+
+from content_factory.utils import ensure_directory
+from content_factory.config_loader import ConfigLoader
+from content_factory.audio_mastering import get_ffmpeg_binary
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+ASSET_KINDS = {
+    '.gif': 'gif',
+    '.mp4': 'video', '.mov': 'video', '.webm': 'video',
+    '.jpg': 'image', '.jpeg': 'image', '.png': 'image', '.webp': 'image',
+    '.mp3': 'music', '.wav': 'music', '.m4a': 'music', '.ogg': 'music',
+}
+
+_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+_VIDEO_SIZE_RE = re.compile(r'Video: .*?, (\d{2,5})x(\d{2,5})')
+
+
+class AssetLibrary:
+    """
+    Catalogue SQLite des GIFs, vidéos, images et musiques locales: mis à jour
+    incrémentalement (os.scandir + mtime/taille, seuls les fichiers nouveaux ou
+    modifiés sont analysés), avec catégorie, dimensions, durée, nombre de frames,
+    hash et usage. Tirage aléatoire pondéré (moins utilisés favorisés) avec filtres.
+    """
+
+    SYNC_INTERVAL = 60
+
+    def __init__(self, db_path: str):
+        ensure_directory(os.path.dirname(db_path) or '.')
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._last_sync: Dict[str, float] = {}
+        self.ffmpeg = get_ffmpeg_binary()
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS assets (
+                path TEXT PRIMARY KEY,
+                root TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                category TEXT NOT NULL DEFAULT '',
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                duration REAL,
+                frames INTEGER,
+                hash TEXT,
+                use_count INTEGER NOT NULL DEFAULT 0,
+                last_used REAL NOT NULL DEFAULT 0
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_assets_filter ON assets (kind, category, last_used)")
+        self.db.commit()
+
+    # --- ANALYSE DES FICHIERS ---
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _probe_image(self, path: str) -> Dict[str, Any]:
+        with Image.open(path) as img:
+            info = {'width': img.width, 'height': img.height, 'frames': getattr(img, 'n_frames', 1)}
+            if info['frames'] > 1:
+                total_ms = 0
+                for frame in range(info['frames']):
+                    img.seek(frame)
+                    total_ms += img.info.get('duration', 100) or 100
+                info['duration'] = total_ms / 1000.0
+            return info
+
+    def _probe_media(self, path: str) -> Dict[str, Any]:
+        """Durée (et taille vidéo) lues dans l'en-tête par ffmpeg, sans décoder."""
+        if not self.ffmpeg:
+            return {}
+        result = subprocess.run([self.ffmpeg, '-hide_banner', '-i', path],
+                                capture_output=True, timeout=30)
+        output = result.stderr.decode('utf-8', errors='ignore')
+
+        info = {}
+        duration = _DURATION_RE.search(output)
+        if duration:
+            hours, minutes, seconds = duration.groups()
+            info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        size = _VIDEO_SIZE_RE.search(output)
+        if size:
+            info['width'], info['height'] = int(size.group(1)), int(size.group(2))
+        return info
+
+    def _probe(self, path: str, kind: str) -> Dict[str, Any]:
+        try:
+            if kind in ('gif', 'image') and HAS_PIL:
+                return self._probe_image(path)
+            return self._probe_media(path)
+        except Exception as e:
+            print(f"⚠️ Analyse impossible ({os.path.basename(path)}): {e}")
+            return {}
+
+    # --- SYNCHRONISATION INCRÉMENTALE ---
+
+    def _scan(self, root: str, skip_dirs: Iterable[str]) -> Iterable[Tuple[str, os.stat_result, str, str]]:
+        stack = [(root, '')]
+        while stack:
+            directory, category = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in skip_dirs:
+                                stack.append((entry.path, category or entry.name))
+                        elif entry.is_file():
+                            kind = ASSET_KINDS.get(os.path.splitext(entry.name)[1].lower())
+                            if kind:
+                                yield entry.path, entry.stat(), kind, category
+            except OSError:
+                continue
+
+    def sync(self, root: str, skip_dirs: Iterable[str] = (), force: bool = False) -> int:
+        """Met l'index à jour pour un dossier; seuls les fichiers nouveaux/modifiés sont analysés."""
+        if not os.path.isdir(root):
+            return 0
+        if not force and time.time() - self._last_sync.get(root, 0) < self.SYNC_INTERVAL:
+            return 0
+
+        with self._lock:
+            known = {row['path']: (row['mtime'], row['size'])
+                     for row in self.db.execute("SELECT path, mtime, size FROM assets WHERE root = ?", (root,))}
+            seen = set()
+            updated = 0
+
+            for path, stat, kind, category in self._scan(root, set(skip_dirs)):
+                seen.add(path)
+                if known.get(path) == (stat.st_mtime, stat.st_size):
+                    continue
+
+                info = self._probe(path, kind)
+                self.db.execute("""
+                    INSERT INTO assets (path, root, kind, category, mtime, size, width, height, duration, frames, hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        kind = excluded.kind, category = excluded.category, mtime = excluded.mtime,
+                        size = excluded.size, width = excluded.width, height = excluded.height,
+                        duration = excluded.duration, frames = excluded.frames, hash = excluded.hash
+                """, (path, root, kind, category, stat.st_mtime, stat.st_size,
+                      info.get('width'), info.get('height'), info.get('duration'),
+                      info.get('frames'), self._hash_file(path)))
+                updated += 1
+
+            removed = [path for path in known if path not in seen]
+            self.db.executemany("DELETE FROM assets WHERE path = ?", [(path,) for path in removed])
+            self.db.commit()
+            self._last_sync[root] = time.time()
+
+        if updated or removed:
+            print(f"🗂️ Catalogue '{root}': {updated} fichier(s) indexé(s), {len(removed)} retiré(s)")
+        return updated
+
+    # --- TIRAGE ---
+
+    def query(self, kinds: Iterable[str], category: Optional[str] = None,
+              min_duration: Optional[float] = None, unused_days: Optional[float] = None,
+              root: Optional[str] = None) -> List[sqlite3.Row]:
+        kinds = list(kinds)
+        clauses = [f"kind IN ({','.join('?' * len(kinds))})"]
+        params: List[Any] = kinds
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if min_duration:
+            clauses.append("duration >= ?")
+            params.append(min_duration)
+        if unused_days:
+            clauses.append("last_used < ?")
+            params.append(time.time() - unused_days * 86400)
+        if root:
+            clauses.append("root = ?")
+            params.append(root)
+
+        with self._lock:
+            return self.db.execute(
+                f"SELECT * FROM assets WHERE {' AND '.join(clauses)} GROUP BY COALESCE(hash, path)", params
+            ).fetchall()
+
+    def sample(self, kinds: Iterable[str], count: int = 1, **filters) -> List[str]:
+        """
+        Tirage pondéré sans remise parmi les assets filtrés (ex: GIFs ≥ 2 s de la
+        catégorie science non utilisés depuis 7 jours). Poids: 1 / (1 + usages).
+        Clés d'Efraimidis-Spirakis u^(1/w), les `count` plus grandes retenues:
+        toujours min(count, assets filtrés) résultats, en O(n log count) après
+        la requête SQL (elle-même O(n) sur les lignes filtrées).
+        """
+        rows = self.query(kinds, **filters)
+        if not rows or count <= 0:
+            return []
+
+        keyed = ((random.random() ** (1 + row['use_count']), row['path']) for row in rows)
+        return [path for _, path in heapq.nlargest(count, keyed)]
+
+    def mark_used(self, paths: Iterable[str]):
+        with self._lock:
+            now = time.time()
+            self.db.executemany(
+                "UPDATE assets SET use_count = use_count + 1, last_used = ? WHERE path = ?",
+                [(now, path) for path in paths]
+            )
+            self.db.commit()
+
+
+_asset_library = None
+_asset_library_lock = threading.Lock()
+
+
+def get_asset_library() -> AssetLibrary:
+    """Instance partagée (une connexion SQLite par process)."""
+    global _asset_library
+    with _asset_library_lock:
+        if _asset_library is None:
+            cache_dir = ConfigLoader().get_config().get('PATHS', {}).get('CACHE_DIR', 'cache')
+            _asset_library = AssetLibrary(os.path.join(cache_dir, 'asset_library.db'))
+        return _asset_library
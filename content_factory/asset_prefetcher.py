@@ -0,0 +1,140 @@
+# content_factory/asset_prefetcher.py (PRÉCHARGEMENT DES ASSETS ENTRE LES SLOTS)
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Any, Optional
+
+from content_factory.utils import ensure_directory
+
+
+class AssetPool:
+    """
+    Réserves locales d'assets prêts à l'emploi, par catégorie et par type
+    ('gifs' / 'images'). Les fichiers vivent dans le stock adressé par contenu;
+    la réserve ne garde que leurs chemins. Partagée entre threads et entre runs.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, pool_path: str):
+        self.pool_path = pool_path
+
+    def _load(self) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        if not os.path.exists(self.pool_path):
+            return {}
+        try:
+            with open(self.pool_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Réserve d'assets illisible, réinitialisation: {e}")
+            return {}
+
+    def _save(self, pools: Dict[str, Dict[str, List[Dict[str, Any]]]]):
+        try:
+            ensure_directory(os.path.dirname(self.pool_path) or '.')
+            temp_path = f"{self.pool_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(pools, f, indent=2)
+            os.replace(temp_path, self.pool_path)
+        except Exception as e:
+            print(f"⚠️ Réserve d'assets non sauvegardée: {e}")
+
+    def size(self, category: str, kind: str) -> int:
+        with self._lock:
+            entries = self._load().get(category, {}).get(kind, [])
+            return sum(1 for entry in entries if os.path.exists(entry['path']))
+
+    def add(self, category: str, kind: str, paths: List[str]):
+        with self._lock:
+            pools = self._load()
+            entries = pools.setdefault(category, {}).setdefault(kind, [])
+            known = {entry['path'] for entry in entries}
+            now = int(time.time())
+            entries.extend({'path': path, 'added_at': now} for path in paths if path not in known)
+            self._save(pools)
+
+    def take(self, category: str, kind: str, count: int) -> List[str]:
+        """Retire jusqu'à `count` assets encore présents sur disque (les plus anciens d'abord)."""
+        if count <= 0:
+            return []
+
+        with self._lock:
+            pools = self._load()
+            entries = pools.get(category, {}).get(kind, [])
+            # Fichiers évincés du stock entre-temps: simplement oubliés
+            entries = [entry for entry in entries if os.path.exists(entry['path'])]
+            taken, remaining = entries[:count], entries[count:]
+            if category in pools:
+                pools[category][kind] = remaining
+            self._save(pools)
+            return [entry['path'] for entry in taken]
+
+
+class AssetPrefetcher:
+    """
+    Remplit les réserves par catégorie hors du chemin critique (pendant le rendu
+    du slot en cours / entre deux slots): GIFs et images téléchargés dans le stock,
+    GIFs déjà convertis au format final. Respecte le quota Unsplash restant.
+    """
+
+    GIFS_PER_CATEGORY = 4
+    IMAGES_PER_CATEGORY = 8
+    UNSPLASH_QUOTA_RESERVE = 10
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.pool = manager.asset_pool
+
+    def _quota_allows_unsplash(self) -> bool:
+        remaining = self.manager.unsplash_remaining
+        if remaining is not None and remaining < self.UNSPLASH_QUOTA_RESERVE:
+            print(f"   ⏸️ Préchargement Unsplash suspendu (quota restant: {remaining})")
+            return False
+        return self.manager.unsplash_enabled
+
+    def prefetch(self, content_data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, int]:
+        """Complète la réserve de la catégorie du contenu (GIFs puis images)."""
+        category = content_data.get('category', 'science')
+        added = {'gifs': 0, 'images': 0}
+
+        missing_gifs = self.GIFS_PER_CATEGORY - self.pool.size(category, 'gifs')
+        if missing_gifs > 0 and (deadline is None or time.time() < deadline):
+            gif_paths = self.manager._get_intelligent_gifs(content_data, missing_gifs)
+            # Conversion GIF → MP4 au format final faite maintenant (cache du normaliseur)
+            for path in gif_paths:
+                self.manager.normalizer.normalize(path)
+            self.pool.add(category, 'gifs', gif_paths)
+            added['gifs'] = len(gif_paths)
+
+        missing_images = self.IMAGES_PER_CATEGORY - self.pool.size(category, 'images')
+        if missing_images > 0 and (deadline is None or time.time() < deadline) and self._quota_allows_unsplash():
+            image_paths = self.manager._get_ai_enhanced_unsplash(content_data, missing_images)
+            self.pool.add(category, 'images', image_paths)
+            added['images'] = len(image_paths)
+
+        return added
+
+    def run(self, contents: List[Dict[str, Any]], time_budget: Optional[float] = None):
+        """Précharge pour chaque contenu à venir (une fois par catégorie)."""
+        deadline = time.time() + time_budget if time_budget else None
+        start_time = time.time()
+        seen_categories = set()
+
+        for content_data in contents:
+            category = content_data.get('category', 'science')
+            if category in seen_categories:
+                continue
+            seen_categories.add(category)
+
+            if deadline is not None and time.time() >= deadline:
+                break
+
+            try:
+                added = self.prefetch(content_data, deadline)
+                print(f"📦 Préchargement '{category}': +{added['gifs']} GIFs, +{added['images']} images")
+            except Exception as e:
+                print(f"⚠️ Préchargement '{category}' échoué: {e}")
+
+        print(f"📦 Préchargement terminé en {time.time() - start_time:.1f}s")
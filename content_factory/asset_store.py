@@ -0,0 +1,211 @@
+# content_factory/asset_store.py (STOCKAGE D'ASSETS ADRESSÉ PAR CONTENU)
+
+import os
+import json
+import time
+import atexit
+import shutil
+import hashlib
+import threading
+from typing import Optional, Dict, Any
+
+from content_factory.utils import safe_path_join, ensure_directory
+from content_factory.config_loader import ConfigLoader
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+
+class AssetStore:
+    """
+    Stockage des images/GIFs téléchargés, adressé par hash de contenu:
+    un même fichier n'est gardé qu'une fois, quelle que soit l'URL d'origine.
+    L'index (hash → fichier + métadonnées, URL → hash) permet d'éviter un
+    téléchargement déjà fait; l'éviction LRU garde le stock sous MAX_CACHE_SIZE_MB.
+    Les simples consultations (last_used) ne sont écrites qu'au save() de fin de lot.
+    """
+
+    def __init__(self, store_dir: str, max_size_mb: int = 1000, enabled: bool = True):
+        self.store_dir = ensure_directory(store_dir)
+        self.index_path = safe_path_join(self.store_dir, "index.json")
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self.urls: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.assets = data.get('assets', {})
+            self.urls = data.get('urls', {})
+        except Exception as e:
+            print(f"⚠️ Index du stock d'assets illisible, réinitialisation: {e}")
+            self.assets, self.urls = {}, {}
+
+        # Index et disque peuvent diverger (cache restauré partiellement)
+        missing = [h for h, meta in self.assets.items() if not os.path.exists(meta['path'])]
+        for content_hash in missing:
+            self._forget(content_hash)
+
+    def _save(self):
+        try:
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'assets': self.assets, 'urls': self.urls}, f, indent=2)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ Index du stock d'assets non sauvegardé: {e}")
+
+    def save(self):
+        """Écrit l'index s'il a changé depuis la dernière sauvegarde (fin de lot, arrêt)."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _forget(self, content_hash: str):
+        self.assets.pop(content_hash, None)
+        for url in [u for u, h in self.urls.items() if h == content_hash]:
+            del self.urls[url]
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    # --- CONSULTATION ---
+
+    def has(self, url: str) -> bool:
+        return self.enabled and url in self.urls
+
+    def path_of(self, url: str) -> Optional[str]:
+        """Chemin stocké pour cette URL, sans marquer d'utilisation (consultation seule)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            meta = self.assets.get(self.urls.get(url, ''))
+            return meta['path'] if meta and os.path.exists(meta['path']) else None
+
+    def get(self, url: str) -> Optional[str]:
+        """Fichier déjà stocké pour cette URL (et marque son utilisation), sinon None."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            content_hash = self.urls.get(url)
+            meta = self.assets.get(content_hash) if content_hash else None
+            if not meta:
+                return None
+
+            if not os.path.exists(meta['path']):
+                self._forget(content_hash)
+                self._dirty = True
+                return None
+
+            meta['last_used'] = int(time.time())
+            self._dirty = True
+            return meta['path']
+
+    # --- AJOUT ---
+
+    def put_file(self, file_path: str, source_url: str = '', query: str = '') -> str:
+        """
+        Range un fichier téléchargé dans le stock (déplacé, dédupliqué par hash)
+        et retourne son chemin définitif. Stock désactivé: le fichier reste en place.
+        """
+        if not self.enabled or not os.path.exists(file_path):
+            return file_path
+
+        content_hash = self.hash_file(file_path)
+        extension = os.path.splitext(file_path)[1].lower() or '.bin'
+
+        with self._lock:
+            meta = self.assets.get(content_hash)
+            if meta and os.path.exists(meta['path']):
+                # Contenu déjà connu sous une autre URL: on garde l'exemplaire existant
+                os.remove(file_path)
+            else:
+                stored_path = safe_path_join(self.store_dir, f"{content_hash}{extension}")
+                shutil.move(file_path, stored_path)
+                meta = {
+                    'path': stored_path,
+                    'size': os.path.getsize(stored_path),
+                    'width': None,
+                    'height': None,
+                    'source_url': source_url,
+                    'query': query,
+                    'created_at': int(time.time())
+                }
+                if HAS_PIL:
+                    try:
+                        with Image.open(stored_path) as img:
+                            meta['width'], meta['height'] = img.size
+                    except Exception:
+                        pass
+                self.assets[content_hash] = meta
+
+            meta['last_used'] = int(time.time())
+            if source_url:
+                self.urls[source_url] = content_hash
+
+            self._evict()
+            self._save()
+            return meta['path']
+
+    # --- ÉVICTION ---
+
+    def total_size(self) -> int:
+        return sum(meta.get('size', 0) for meta in self.assets.values())
+
+    def _evict(self):
+        """Supprime les assets les moins récemment utilisés au-delà du budget."""
+        total = self.total_size()
+        if total <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        for content_hash, meta in sorted(self.assets.items(), key=lambda item: item[1].get('last_used', 0)):
+            if total <= self.max_size_bytes:
+                break
+            try:
+                os.remove(meta['path'])
+            except OSError:
+                pass
+            total -= meta.get('size', 0)
+            self._forget(content_hash)
+            evicted += 1
+
+        print(f"🧹 Stock d'assets: {evicted} fichier(s) évincé(s) (LRU), {total // (1024 * 1024)} MB conservés")
+
+
+_asset_store = None
+_asset_store_lock = threading.Lock()
+
+
+def get_asset_store() -> AssetStore:
+    """Instance partagée (un seul index en mémoire par process)."""
+    global _asset_store
+    with _asset_store_lock:
+        if _asset_store is None:
+            config = ConfigLoader().get_config()
+            image_config = config.get('IMAGE_MANAGER', {})
+            cache_dir = config.get('PATHS', {}).get('CACHE_DIR', 'cache')
+            _asset_store = AssetStore(
+                os.path.join(cache_dir, 'assets'),
+                max_size_mb=image_config.get('MAX_CACHE_SIZE_MB', 1000),
+                enabled=image_config.get('IMAGE_CACHE_ENABLED', True)
+            )
+            atexit.register(_asset_store.save)
+        return _asset_store
@@ -41,9 +41,32 @@ except ImportError:
     HAS_MUSIC_MANAGER = False
     print("⚠️ MusicManager non disponible")
 
+try:
+    from content_factory.loudness import normalize_segment, measure_file_loudness, save_cached_loudness
+    HAS_LOUDNESS = True
+except ImportError:
+    HAS_LOUDNESS = False
+    print("⚠️ Normalisation loudness non disponible")
+
+from content_factory.audio_mastering import FFmpegAudioMaster
+from content_factory.tts_duration_model import TTSDurationModel, fit_text_to_length
+from content_factory.tts_engines import TTSEngine, TTSEngineRegistry
+
 class AudioGenerator:
     """Générateur audio CORRIGÉ avec durée garantie de 45-60 secondes."""
     
+    # Phrases d'appel à l'action utilisées pour compléter un texte trop court
+    TTS_EXTENSIONS = [
+        " N'oublie pas de t'abonner pour ne rien rater !",
+        " Like la vidéo si tu apprends quelque chose d'incroyable !",
+        " Laisse un commentaire avec ton point préféré !",
+        " Active les notifications pour les prochains tops !",
+        " Ces révélations vont changer ta vision du monde !",
+        " Le meilleur est toujours à venir, reste jusqu'au bout !",
+        " Partage cette vidéo à tes amis pour les surprendre !",
+        " Chaque détail compte dans cette incroyable découverte !"
+    ]
+    
     def __init__(self):
         self.config = ConfigLoader().get_config()
         self.paths = self.config.get('PATHS', {})
@@ -57,12 +80,51 @@ class AudioGenerator:
         # Configuration musique
         self.music_enabled = os.getenv('BACKGROUND_MUSIC_ENABLED', 'false').lower() == 'true'
         self.music_volume = float(os.getenv('BACKGROUND_MUSIC_VOLUME', '0.25'))
+        self.fade_in = float(os.getenv('BACKGROUND_MUSIC_FADE_IN', '2.0'))
+        self.fade_out = float(os.getenv('BACKGROUND_MUSIC_FADE_OUT', '3.0'))
+        
+        # Normalisation loudness (EBU R128)
+        audio_config = self.config.get('AUDIO_GENERATOR', {})
+        self.normalization_enabled = audio_config.get('ENABLE_AUDIO_NORMALIZATION', True)
+        self.target_lufs = audio_config.get('AUDIO_TARGET_LUFS', -14.0)
+        self.true_peak_db = audio_config.get('AUDIO_TRUE_PEAK_DB', -1.0)
+        
+        # Backend de mastering: 'pydub' (historique) ou 'ffmpeg' (un seul passage)
+        self.audio_backend = audio_config.get('AUDIO_BACKEND', 'pydub').lower()
+        self.ffmpeg_master = None
+        if self.audio_backend == 'ffmpeg':
+            self.ffmpeg_master = FFmpegAudioMaster(fade_in=self.fade_in, fade_out=self.fade_out,
+                                                   target_lufs=self.target_lufs, true_peak_db=self.true_peak_db,
+                                                   normalize=self.normalization_enabled)
+            if not self.ffmpeg_master.is_available():
+                print("⚠️ ffmpeg introuvable - retour au backend pydub")
+                self.audio_backend = 'pydub'
+                self.ffmpeg_master = None
         
         # DURÉE GARANTIE - Configuration critique
         self.min_duration = 45.0  # 45 secondes MINIMUM
         self.target_duration = 60.0  # 60 secondes CIBLE
         self.max_duration = 120.0  # 120 secondes MAXIMUM
         
+        # Fenêtre visée dès la première synthèse (MIN_AUDIO_DURATION - MAX_AUDIO_DURATION)
+        self.window_min = float(audio_config.get('MIN_AUDIO_DURATION', 45))
+        self.window_max = min(float(audio_config.get('MAX_AUDIO_DURATION', 65)), self.target_duration)
+        
+        # Modèle de durée par voix, appris et persisté entre les runs
+        cache_dir = ensure_directory(self.paths.get('CACHE_DIR', 'cache'))
+        self.duration_model = TTSDurationModel(safe_path_join(cache_dir, "tts_duration_model.json"))
+        self.last_tts_voice = None
+        self.last_tts_rate = 0
+        
+        # Registre adaptatif des moteurs TTS (ordre appris, pause après échecs répétés)
+        self.tts_registry = TTSEngineRegistry(safe_path_join(cache_dir, "tts_engine_stats.json"))
+        self.tts_registry.register(TTSEngine('edge', self._try_edge_tts_optimized, lambda: HAS_EDGE_TTS,
+                                             quality_penalty=0.0, default_latency=8.0, supports_rate=True))
+        self.tts_registry.register(TTSEngine('gtts', self._try_google_tts_optimized, lambda: HAS_G_TTS,
+                                             quality_penalty=15.0, default_latency=5.0))
+        self.tts_registry.register(TTSEngine('espeak', self._create_espeak_audio, self._check_espeak_available,
+                                             quality_penalty=30.0, default_latency=2.0))
+        
         # Chemins
         output_root = self.paths.get('OUTPUT_ROOT', 'output')
         audio_dir = self.paths.get('AUDIO_DIR', 'audio')
@@ -77,7 +139,7 @@ class AudioGenerator:
         else:
             print("🎵 MusicManager désactivé")
         
-        print(f"🔊 AudioGenerator prêt - Durée garantie: {self.min_duration}-{self.target_duration}s")
+        print(f"🔊 AudioGenerator prêt - Durée garantie: {self.min_duration}-{self.target_duration}s | Backend: {self.audio_backend}")
 
     def _load_voices_from_env(self) -> List[str]:
         """Charge la liste des voix depuis .env"""
@@ -142,21 +204,10 @@ class AudioGenerator:
         
         text = '. '.join(preserved_sentences)
         
-        # PHASE 4: GARANTIR une longueur SUFFISANTE pour 45-60 secondes
-        target_min_chars = 800   # ~45 secondes
-        target_ideal_chars = 1200  # ~60 secondes
-        
-        current_chars = len(text)
-        print(f"📏 Longueur après nettoyage: {current_chars} caractères")
-        
-        if current_chars < target_min_chars:
-            print("🔄 Texte trop court, ajout de contenu...")
-            text = self._extend_text_to_target(text, target_ideal_chars)
-        
-        # PHASE 5: Nettoyage final
+        # PHASE 4: Nettoyage final (la longueur est ajustée par _plan_tts)
         text = re.sub(r'\s+', ' ', text).strip()
         
-        print(f"✅ Texte final: {len(text)} caractères (cible: {target_ideal_chars})")
+        print(f"✅ Texte nettoyé: {len(text)} caractères")
         return text
 
     def _generate_fallback_text(self) -> str:
@@ -171,16 +222,7 @@ class AudioGenerator:
 
     def _extend_text_to_target(self, text: str, target_chars: int) -> str:
         """Étend le texte pour atteindre la longueur cible"""
-        extensions = [
-            " N'oublie pas de t'abonner pour ne rien rater !",
-            " Like la vidéo si tu apprends quelque chose d'incroyable !",
-            " Laisse un commentaire avec ton point préféré !",
-            " Active les notifications pour les prochains tops !",
-            " Ces révélations vont changer ta vision du monde !",
-            " Le meilleur est toujours à venir, reste jusqu'au bout !",
-            " Partage cette vidéo à tes amis pour les surprendre !",
-            " Chaque détail compte dans cette incroyable découverte !"
-        ]
+        extensions = self.TTS_EXTENSIONS
         
         current_chars = len(text)
         while current_chars < target_chars:
@@ -194,6 +236,36 @@ class AudioGenerator:
         
         return text
 
+    def _plan_tts(self, text: str) -> tuple:
+        """
+        Choisit voix, vitesse et longueur de texte AVANT la synthèse pour que la
+        première sortie tombe dans la fenêtre de durée. Retourne (texte, plan).
+        """
+        # Plan établi pour le premier moteur dans l'ordre du registre
+        engines = self.tts_registry.ordered_engines()
+        engine = engines[0] if engines else None
+        supports_rate = bool(engine and engine.supports_rate)
+        
+        if engine and engine.name == 'edge':
+            voice = self.get_random_voice()
+        else:
+            voice = engine.name if engine else 'gtts'
+        preferred_rate = min(30, int((self.tts_speed - 1.0) * 100))
+        
+        plan = self.duration_model.plan(
+            voice, len(text), self.window_min, self.window_max,
+            preferred_rate=preferred_rate, supports_rate=supports_rate
+        )
+        
+        if plan['target_chars'] != len(text):
+            action = "raccourci" if plan['target_chars'] < len(text) else "complété"
+            text = fit_text_to_length(text, plan['target_chars'], self.TTS_EXTENSIONS)
+            print(f"✂️ Texte {action} à {len(text)} caractères pour tenir la fenêtre")
+        
+        print(f"🎯 Plan TTS: voix {voice}, vitesse {plan['rate_percent']:+d}%, "
+              f"durée prévue {plan['predicted_duration']:.1f}s (fenêtre {self.window_min:.0f}-{self.window_max:.0f}s)")
+        return text, plan
+
     def generate_audio(self, text: str, title: str, content_data: Dict[str, Any] = None) -> Optional[str]:
         """
         Génère l'audio complet avec DURÉE GARANTIE de 45-60 secondes.
@@ -222,20 +294,35 @@ class AudioGenerator:
         # NETTOYAGE INTELLIGENT qui préserve la durée
         clean_text = self.clean_text_for_tts(text)
         
+        # PLANIFICATION: vitesse et longueur choisies pour viser la fenêtre du premier coup
+        clean_text, tts_plan = self._plan_tts(clean_text)
+        
         print(f"🔊 Génération audio DURÉE GARANTIE pour: {title[:50]}...")
         
         # Préparation chemin
         clean_title = clean_filename(title)
         
         # ÉTAPE 1: Génération audio TTS de base
-        audio_tts_path = self._generate_tts_audio(clean_text, clean_title)
+        audio_tts_path = self._generate_tts_audio(clean_text, clean_title, tts_plan)
         if not audio_tts_path:
             print("❌ Échec génération TTS, utilisation du fallback durée garantie")
             return self._create_guaranteed_duration_audio(clean_title, self.target_duration)
         
         # ÉTAPE 2: MESURER et GARANTIR la durée
         tts_duration = self._get_audio_duration(audio_tts_path)
-        print(f"⏱️ Durée TTS générée: {tts_duration:.1f} secondes")
+        print(f"⏱️ Durée TTS générée: {tts_duration:.1f} secondes "
+              f"(prévue: {tts_plan['predicted_duration']:.1f}s)")
+        
+        # Apprentissage: le modèle s'affine à chaque synthèse réelle
+        if self.last_tts_voice:
+            self.duration_model.record(self.last_tts_voice, len(clean_text), self.last_tts_rate, tts_duration)
+        
+        # BACKEND FFMPEG: durée, musique et mastering en un seul passage
+        if self.ffmpeg_master:
+            final_audio_path = self._master_with_ffmpeg(audio_tts_path, clean_title, tts_duration, content_data)
+            if final_audio_path:
+                return final_audio_path
+            print("⚠️ Mastering ffmpeg échoué - retour au pipeline pydub")
         
         # ÉTAPE CRITIQUE: GARANTIR la durée minimale
         if tts_duration < self.min_duration:
@@ -262,50 +349,36 @@ class AudioGenerator:
             return final_audio_path
         else:
             print("🎵 Musique désactivée - Retour audio TTS durée garantie")
+            self._measure_loudness_for_render(audio_tts_path)
             return audio_tts_path
 
-    def _generate_tts_audio(self, text: str, clean_title: str) -> Optional[str]:
-        """Génère l'audio TTS avec fallback en cascade."""
+    def _generate_tts_audio(self, text: str, clean_title: str, plan: Dict[str, Any] = None) -> Optional[str]:
+        """Génère l'audio TTS avec fallback en cascade ordonné par le registre."""
         audio_path = safe_path_join(self.output_dir, f"audio_tts_{clean_title}.mp3")
+        plan = plan or {}
+        self.last_tts_voice = None
         
-        # ESSAI EN CHAÎNE avec gestion d'erreur améliorée
-        methods = [
-            (self._try_edge_tts_optimized, HAS_EDGE_TTS),
-            (self._try_google_tts_optimized, HAS_G_TTS),
-            (self._create_espeak_audio, self._check_espeak_available()),
-        ]
-        
-        for method, condition in methods:
-            if not condition:
-                continue
-                
-            try:
-                print(f"⚡ Essai: {method.__name__}")
-                result = method(text, audio_path)
-                
-                if result and os.path.exists(result) and os.path.getsize(result) > 5000:  # Fichier substantiel
-                    print(f"✅ SUCCÈS avec {method.__name__}")
-                    return result
-                    
-            except Exception as e:
-                print(f"❌ {method.__name__} échoué: {e}")
-                continue
+        # ESSAI dans l'ordre adaptatif (latence et taux de succès historiques)
+        result = self.tts_registry.synthesize(text, audio_path, plan)
+        if result:
+            return result
         
         print("❌ Tous les méthodes TTS ont échoué")
         return None
 
-    def _try_edge_tts_optimized(self, text: str, audio_path: str) -> Optional[str]:
+    def _try_edge_tts_optimized(self, text: str, audio_path: str, plan: Dict[str, Any] = None) -> Optional[str]:
         """Edge TTS optimisé pour la durée et la qualité"""
         if not HAS_EDGE_TTS:
             raise ImportError("edge_tts non disponible")
         
+        plan = plan or {}
+        voice = plan.get('voice') if plan.get('voice') in self.available_voices else self.get_random_voice()
+        
+        # Vitesse choisie par le modèle de durée (sinon TTS_SPEED)
+        rate_percent = plan.get('rate_percent', min(30, int((self.tts_speed - 1.0) * 100)))
+        rate_param = f"{rate_percent:+d}%"
+        
         async def generate_optimized():
-            voice = self.get_random_voice()
-            
-            # Vitesse OPTIMISÉE pour durée et compréhension
-            rate_percent = min(30, int((self.tts_speed - 1.0) * 100))
-            rate_param = f"+{rate_percent}%"
-            
             print(f"   🔊 Edge TTS - Voix: {voice}, Vitesse: {rate_param}")
             print(f"   📝 Texte: {len(text)} caractères")
             
@@ -321,30 +394,34 @@ class AudioGenerator:
             return audio_path
         
         try:
-            return asyncio.run(generate_optimized())
+            result = asyncio.run(generate_optimized())
+            self.last_tts_voice, self.last_tts_rate = voice, rate_percent
+            return result
         except Exception as e:
             # Réessayer avec une autre voix
-            return self._retry_edge_tts_fallback(text, audio_path)
+            return self._retry_edge_tts_fallback(text, audio_path, rate_percent)
 
-    def _retry_edge_tts_fallback(self, text: str, audio_path: str) -> Optional[str]:
+    def _retry_edge_tts_fallback(self, text: str, audio_path: str, rate_percent: int = 20) -> Optional[str]:
         """Réessaye avec d'autres voix rapidement."""
         fallback_voices = [v for v in self.available_voices if v != self.default_voice]
         
         for voice in fallback_voices[:2]:  # Seulement 2 essais
             try:
                 async def retry():
-                    communicate = edge_tts.Communicate(text, voice, rate="+20%")  # Vitesse fixe modérée
+                    communicate = edge_tts.Communicate(text, voice, rate=f"{rate_percent:+d}%")  # Vitesse planifiée
                     await asyncio.wait_for(communicate.save(audio_path), timeout=40.0)
                     return audio_path
                 
                 print(f"   🔄 Réessai avec voix: {voice}")
-                return asyncio.run(retry())
+                result = asyncio.run(retry())
+                self.last_tts_voice, self.last_tts_rate = voice, rate_percent
+                return result
             except Exception:
                 continue
         
         raise Exception("Toutes les voix Edge TTS ont échoué")
 
-    def _try_google_tts_optimized(self, text: str, audio_path: str) -> Optional[str]:
+    def _try_google_tts_optimized(self, text: str, audio_path: str, plan: Dict[str, Any] = None) -> Optional[str]:
         """Google TTS optimisé"""
         if not HAS_G_TTS:
             raise ImportError("gTTS non disponible")
@@ -353,16 +430,17 @@ class AudioGenerator:
             print("   🔊 Google TTS optimisé...")
             tts = gTTS(text=text, lang='fr', slow=False)
             tts.save(audio_path)
+            self.last_tts_voice, self.last_tts_rate = 'gtts', 0
             
             return audio_path
             
         except Exception as e:
             raise Exception(f"Google TTS échoué: {e}")
 
-    def _create_espeak_audio(self, text: str, audio_path: str) -> Optional[str]:
+    def _create_espeak_audio(self, text: str, audio_path: str, plan: Dict[str, Any] = None) -> Optional[str]:
         """Crée un audio avec espeak (fallback)"""
         try:
-            if not self._check_espeak_available():
+            if not self.tts_registry.is_available('espeak'):
                 raise ImportError("espeak non disponible")
             
             print("   🔊 Fallback espeak...")
@@ -384,6 +462,7 @@ class AudioGenerator:
                 ], check=True, capture_output=True, timeout=15)
                 os.remove(temp_wav)
                 
+            self.last_tts_voice, self.last_tts_rate = 'espeak', 0
             return audio_path
             
         except subprocess.TimeoutExpired:
@@ -505,11 +584,16 @@ class AudioGenerator:
             
             print(f"✅ Musique trouvée: {os.path.basename(music_path)}")
             
-            # Charger et préparer la musique
-            background_music = AudioSegment.from_file(music_path, format="mp3")
+            # Préparer la musique depuis le cache PCM (boucle/coupe/fondus sans re-décodage)
+            background_music = None
+            if self.music_manager.pcm_cache:
+                background_music = self.music_manager.pcm_cache.render_segment(
+                    music_path, tts_duration, self.fade_in, self.fade_out
+                )
             
-            # Ajuster la musique à la durée du TTS
-            background_music = self._prepare_background_music(background_music, tts_duration)
+            if background_music is None:
+                background_music = AudioSegment.from_file(music_path)
+                background_music = self._prepare_background_music(background_music, tts_duration)
             
             # Ajuster le volume de la musique
             background_music = background_music - (1 - self.music_volume) * 12  # Réduction en dB
@@ -524,9 +608,14 @@ class AudioGenerator:
             # Filtre passe-haut léger sur la musique pour éviter les conflits
             mixed_audio = high_pass_filter(mixed_audio, cutoff=100)
             
+            # Normalisation loudness en mémoire, avant l'unique export final
+            mixed_audio, loudness_stats = self._normalize_segment(mixed_audio)
+            
             # Sauvegarder le résultat final
             final_path = safe_path_join(self.output_dir, f"audio_final_{clean_title}.mp3")
             mixed_audio.export(final_path, format="mp3", bitrate="192k")
+            if loudness_stats:
+                save_cached_loudness(final_path, dict(loudness_stats, normalized=True))
             
             print(f"✅ Audio final avec musique: {final_path}")
             return final_path
@@ -535,6 +624,76 @@ class AudioGenerator:
             print(f"❌ Erreur ajout musique: {e}")
             return tts_audio_path
 
+    def _master_with_ffmpeg(self, tts_audio_path: str, clean_title: str,
+                            tts_duration: float, content_data: Dict[str, Any] = None) -> Optional[str]:
+        """Rend la piste finale (voix + musique) en un seul sous-processus ffmpeg."""
+        if tts_duration < self.min_duration:
+            final_duration = self.target_duration
+            print(f"🚨 DURÉE INSUFFISANTE! Padding ffmpeg de {tts_duration:.1f}s à {final_duration}s")
+        else:
+            final_duration = min(tts_duration, self.max_duration)
+        
+        music_path = None
+        if self.music_manager and self.music_enabled:
+            music_path = self.music_manager.find_brainrot_music(
+                final_duration,
+                content_data.get('category', 'general') if content_data else 'general'
+            )
+        
+        # PCM pré-décodé si disponible: ffmpeg boucle le fichier brut sans décoder de MP3
+        if music_path and self.music_manager.pcm_cache:
+            music_path = self.music_manager.pcm_cache.get_pcm_path(music_path) or music_path
+        
+        final_path = safe_path_join(self.output_dir, f"audio_final_{clean_title}.wav")
+        print(f"🎛️ Mastering ffmpeg un seul passage ({final_duration:.1f}s, musique: {'✅' if music_path else '❌'})")
+        
+        start_time = time.time()
+        result = self.ffmpeg_master.render(tts_audio_path, final_path, final_duration,
+                                           music_path=music_path, music_volume=self.music_volume)
+        if not result:
+            return None
+        
+        print(f"✅ Audio final ffmpeg: {final_path} ({time.time() - start_time:.1f}s)")
+        try:
+            if os.path.exists(tts_audio_path):
+                os.remove(tts_audio_path)
+        except Exception as e:
+            print(f"⚠️ Impossible de nettoyer le fichier TTS: {e}")
+        
+        return result
+
+    def _normalize_segment(self, audio: 'AudioSegment') -> tuple:
+        """Normalise un AudioSegment vers la cible LUFS (si activé). Retourne (audio, stats)."""
+        if not (self.normalization_enabled and HAS_LOUDNESS):
+            return audio, None
+        
+        try:
+            normalized, stats = normalize_segment(audio, self.target_lufs, self.true_peak_db)
+            if stats['source_lufs'] is not None:
+                print(f"📢 Loudness: {stats['source_lufs']} LUFS → {self.target_lufs} LUFS "
+                      f"(gain {stats['gain_db']:+.1f} dB, crête {stats['true_peak_db']} dBTP)")
+                return normalized, stats
+        except Exception as e:
+            print(f"⚠️ Normalisation loudness échouée: {e}")
+        
+        return audio, None
+
+    def _measure_loudness_for_render(self, audio_path: str):
+        """
+        Mesure la loudness du fichier (cache à côté du fichier) sans le réécrire:
+        le gain est appliqué par le rendu vidéo, qui encode l'audio de toute façon.
+        """
+        if not (self.normalization_enabled and HAS_LOUDNESS and HAS_PYDUB):
+            return
+        
+        try:
+            stats = measure_file_loudness(audio_path)
+            if stats and stats.get('integrated_lufs') is not None:
+                print(f"📢 Loudness: {stats['integrated_lufs']} LUFS → {self.target_lufs} LUFS "
+                      f"(gain {self.target_lufs - stats['integrated_lufs']:+.1f} dB appliqué au rendu final)")
+        except Exception as e:
+            print(f"⚠️ Mesure loudness échouée: {e}")
+
     def _prepare_background_music(self, music: AudioSegment, required_duration: float) -> AudioSegment:
         """Prépare la musique de fond (boucle, fade, etc.)."""
         music_duration = len(music) / 1000.0
@@ -542,17 +701,14 @@ class AudioGenerator:
         # Si la musique est trop courte, la boucler
         if music_duration < required_duration:
             loops_needed = int(required_duration / music_duration) + 1
-            looped_music = music
-            for _ in range(loops_needed - 1):
-                looped_music = looped_music + music
-            music = looped_music
+            music = music * loops_needed  # Une seule jointure des données brutes
         
         # Couper à la durée exacte
         music = music[:int(required_duration * 1000)]
         
         # Appliquer fade in/out
-        fade_in = int(float(os.getenv('BACKGROUND_MUSIC_FADE_IN', '2.0')) * 1000)
-        fade_out = int(float(os.getenv('BACKGROUND_MUSIC_FADE_OUT', '3.0')) * 1000)
+        fade_in = int(self.fade_in * 1000)
+        fade_out = int(self.fade_out * 1000)
         
         if fade_in > 0:
             music = music.fade_in(fade_in)
@@ -0,0 +1,134 @@
+# content_factory/audio_mastering.py (BACKEND FFMPEG UN SEUL PASSAGE)
+
+import os
+import shutil
+import subprocess
+from typing import Optional, List
+
+try:
+    import imageio_ffmpeg
+    HAS_IMAGEIO_FFMPEG = True
+except ImportError:
+    HAS_IMAGEIO_FFMPEG = False
+
+
+def get_ffmpeg_binary() -> Optional[str]:
+    """Retourne le binaire ffmpeg disponible (système, puis celui d'imageio-ffmpeg)."""
+    system_ffmpeg = shutil.which('ffmpeg')
+    if system_ffmpeg:
+        return system_ffmpeg
+
+    if HAS_IMAGEIO_FFMPEG:
+        try:
+            return imageio_ffmpeg.get_ffmpeg_exe()
+        except Exception:
+            return None
+
+    return None
+
+
+class FFmpegAudioMaster:
+    """
+    Mastering voix + musique en UN SEUL passage ffmpeg.
+    Durée garantie (apad/atrim), boucle musique, volume, fondus, passe-haut,
+    compression et loudnorm sont réunis dans un seul filtergraph: la voix n'est
+    décodée qu'une fois et le résultat est écrit en PCM (aucun ré-encodage MP3).
+    """
+
+    def __init__(self, sample_rate: int = 44100, highpass_hz: int = 100,
+                 fade_in: float = 2.0, fade_out: float = 3.0,
+                 target_lufs: float = -14.0, true_peak_db: float = -1.0,
+                 normalize: bool = True):
+        self.ffmpeg = get_ffmpeg_binary()
+        self.sample_rate = sample_rate
+        self.highpass_hz = highpass_hz
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+        self.target_lufs = target_lufs
+        self.true_peak_db = true_peak_db
+        self.normalize = normalize
+
+    def is_available(self) -> bool:
+        return bool(self.ffmpeg)
+
+    def build_filtergraph(self, duration: float, has_music: bool, music_volume: float = 0.25) -> str:
+        """Construit le filtergraph complet pour une durée finale donnée."""
+        fmt = f"aformat=sample_fmts=fltp:sample_rates={self.sample_rate}:channel_layouts=stereo"
+
+        # Voix: durée garantie par padding silencieux puis coupe exacte
+        voice_chain = f"[0:a]{fmt},apad=whole_dur={duration:.3f},atrim=0:{duration:.3f},asetpts=N/SR/TB"
+
+        # Mastering final: passe-haut, compression douce, normalisation EBU R128
+        master_chain = f"highpass=f={self.highpass_hz},acompressor=threshold=-20dB:ratio=4"
+        if self.normalize:
+            master_chain += f",loudnorm=I={self.target_lufs}:TP={self.true_peak_db}:LRA=11"
+        master_chain += f",aresample={self.sample_rate}"
+
+        if not has_music:
+            return f"{voice_chain},{master_chain}[out]"
+
+        # Même réduction en dB que le backend pydub: -(1 - volume) * 12
+        music_gain_db = -(1.0 - music_volume) * 12
+        fade_out_start = max(0.0, duration - self.fade_out)
+
+        music_chain = f"[1:a]{fmt},atrim=0:{duration:.3f},asetpts=N/SR/TB,volume={music_gain_db:.2f}dB"
+        if self.fade_in > 0:
+            music_chain += f",afade=t=in:st=0:d={self.fade_in:.2f}"
+        if self.fade_out > 0:
+            music_chain += f",afade=t=out:st={fade_out_start:.3f}:d={self.fade_out:.2f}"
+
+        return (
+            f"{voice_chain}[voice];"
+            f"{music_chain}[music];"
+            f"[voice][music]amix=inputs=2:duration=first:dropout_transition=0:normalize=0,"
+            f"{master_chain}[out]"
+        )
+
+    def build_command(self, voice_path: str, output_path: str, duration: float,
+                      music_path: Optional[str] = None, music_volume: float = 0.25) -> List[str]:
+        """Construit la ligne de commande ffmpeg complète."""
+        command = [self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-y', '-i', voice_path]
+
+        if music_path:
+            # Boucle infinie côté démuxeur: aucune concaténation en mémoire
+            command += ['-stream_loop', '-1']
+            if music_path.endswith('.pcm'):
+                # PCM pré-décodé du cache musique: aucun décodage MP3
+                command += ['-f', 's16le', '-ar', '44100', '-ac', '2']
+            command += ['-i', music_path]
+
+        filtergraph = self.build_filtergraph(duration, bool(music_path), music_volume)
+        command += [
+            '-filter_complex', filtergraph,
+            '-map', '[out]',
+            '-ac', '2',
+            '-ar', str(self.sample_rate),
+            '-c:a', 'pcm_s16le',
+            output_path
+        ]
+        return command
+
+    def render(self, voice_path: str, output_path: str, duration: float,
+               music_path: Optional[str] = None, music_volume: float = 0.25,
+               timeout: int = 120) -> Optional[str]:
+        """Rend la piste finale en un seul sous-processus ffmpeg."""
+        if not self.is_available():
+            print("❌ ffmpeg introuvable - backend ffmpeg indisponible")
+            return None
+
+        command = self.build_command(voice_path, output_path, duration, music_path, music_volume)
+
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print(f"❌ Timeout mastering ffmpeg après {timeout}s")
+            return None
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.decode('utf-8', errors='ignore').strip() if e.stderr else str(e)
+            print(f"❌ Mastering ffmpeg échoué: {error[:300]}")
+            return None
+
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            return output_path
+
+        return None
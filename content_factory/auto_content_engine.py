@@ -68,6 +68,7 @@ try:
     from content_factory.video_creator import VideoCreator
     from content_factory.youtube_uploader import YouTubeUploader
     from content_factory.config_loader import ConfigLoader
+    from content_factory.image_manager import start_background_prefetch
     MODULES_LOADED = True
 except ImportError as e:
     print(f"❌ Erreur import: {e}")
@@ -161,14 +162,24 @@ def execute_production_cycle(config: Dict, args: argparse.Namespace) -> bool:
     
     # 3. Création des vidéos
     successful_videos = []
-    for slot_idx in slots_to_process:
+    prefetch_thread = None
+    for position, slot_idx in enumerate(slots_to_process):
+        # Préchargement des assets des créneaux suivants pendant le rendu de celui-ci
+        upcoming = [contents[i] for i in slots_to_process[position + 1:] if i < len(contents)]
+        if not (prefetch_thread and prefetch_thread.is_alive()):
+            prefetch_thread = start_background_prefetch(upcoming)
+        
         result = process_single_slot(slot_idx, contents)
         if result:
             successful_videos.append(result)
         
-        # Pause entre les créneaux
+        # Pause entre les créneaux (mise à profit pour terminer le préchargement)
         if slot_idx != slots_to_process[-1]:
-            time.sleep(config.get('WORKFLOW', {}).get('SLOT_PAUSE_SECONDS', 10))
+            pause = config.get('WORKFLOW', {}).get('SLOT_PAUSE_SECONDS', 10)
+            pause_start = time.time()
+            if prefetch_thread:
+                prefetch_thread.join(timeout=pause)
+            time.sleep(max(0.0, pause - (time.time() - pause_start)))
     
     # 4. Upload YouTube
     if successful_videos and config.get('YOUTUBE', {}).get('ENABLE_AUTO_UPLOAD', False):
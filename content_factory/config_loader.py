@@ -29,10 +29,13 @@ class ConfigLoader:
                 'IMAGE_DIR': self._get_str('IMAGE_DIR', 'images'),
                 'LOG_DIR': self._get_str('LOG_DIR', 'logs'),
                 'MUSIC_DIR': self._get_str('MUSIC_DIR', 'assets/music'),
-                'TEMP_DIR': self._get_str('TEMP_DIR', 'temp')
+                'TEMP_DIR': self._get_str('TEMP_DIR', 'temp'),
+                'CACHE_DIR': self._get_str('CACHE_DIR', 'cache')
             },
             'VIDEO_CREATOR': {
-                'RESOLUTION': [1080, 1920],
+                'RESOLUTION': self._get_resolution('VIDEO_RESOLUTION', [1080, 1920],
+                                                   self._get_str('VIDEO_ORIENTATION', 'portrait')),
+                'ORIENTATION': self._get_str('VIDEO_ORIENTATION', 'portrait'),
                 'FPS': self._get_int('VIDEO_FPS', 30),
                 'VIDEO_CODEC': self._get_str('VIDEO_CODEC', 'libx264'),
                 'AUDIO_CODEC': self._get_str('AUDIO_CODEC', 'aac'),
@@ -40,7 +43,8 @@ class ConfigLoader:
                 'AUDIO_BITRATE': self._get_str('AUDIO_BITRATE', '320k'),
                 'MIN_IMAGE_DURATION': self._get_float('MIN_IMAGE_DURATION', 3.0),
                 'MAX_IMAGE_DURATION': self._get_float('MAX_IMAGE_DURATION', 6.0),
-                'MAX_VIDEO_GENERATION_TIME': self._get_int('MAX_VIDEO_GENERATION_TIME', 600)
+                'MAX_VIDEO_GENERATION_TIME': self._get_int('MAX_VIDEO_GENERATION_TIME', 600),
+                'FRAME_CACHE_SIZE_MB': self._get_int('FRAME_CACHE_SIZE_MB', 1000)
             },
             'AUDIO_GENERATOR': {
                 'MAX_AUDIO_DURATION': self._get_int('MAX_AUDIO_DURATION', 65),
@@ -53,8 +57,12 @@ class ConfigLoader:
                 'AUDIO_QUALITY': self._get_str('AUDIO_QUALITY', 'ultra'),
                 'AUDIO_BITRATE': self._get_str('AUDIO_BITRATE', '320k'),
                 'ENABLE_AUDIO_NORMALIZATION': self._get_bool('ENABLE_AUDIO_NORMALIZATION', True),
+                'AUDIO_BACKEND': self._get_str('AUDIO_BACKEND', 'pydub'),
+                'AUDIO_TARGET_LUFS': self._get_float('AUDIO_TARGET_LUFS', -14.0),
+                'AUDIO_TRUE_PEAK_DB': self._get_float('AUDIO_TRUE_PEAK_DB', -1.0),
                 'BACKGROUND_MUSIC_ENABLED': self._get_bool('BACKGROUND_MUSIC_ENABLED', False),
-                'BACKGROUND_MUSIC_VOLUME': self._get_float('BACKGROUND_MUSIC_VOLUME', 0.20)
+                'BACKGROUND_MUSIC_VOLUME': self._get_float('BACKGROUND_MUSIC_VOLUME', 0.20),
+                'MUSIC_PCM_CACHE_SIZE_MB': self._get_int('MUSIC_PCM_CACHE_SIZE_MB', 500)
             },
             'AI_GENERATOR': {
                 'DEEPSEEK_API_KEY': self._get_str('DEEPSEEK_API_KEY', ''),
@@ -77,7 +85,12 @@ class ConfigLoader:
                 'MAX_CACHE_SIZE_MB': self._get_int('MAX_CACHE_SIZE_MB', 1000),
                 'CLEANUP_OLD_IMAGES': self._get_bool('CLEANUP_OLD_IMAGES', True),
                 'MAX_IMAGES_TO_KEEP': self._get_int('MAX_IMAGES_TO_KEEP', 50),
-                'IMAGE_SEARCH_TIMEOUT': self._get_int('IMAGE_SEARCH_TIMEOUT', 45)
+                'MAX_DOWNLOAD_MB': self._get_int('MAX_DOWNLOAD_MB', 20),
+                'IMAGE_SEARCH_TIMEOUT': self._get_int('IMAGE_SEARCH_TIMEOUT', 45),
+                'GIF_ASYNC_SEARCH': self._get_bool('GIF_ASYNC_SEARCH', True),
+                'GIF_MAX_PARALLEL_REQUESTS': self._get_int('GIF_MAX_PARALLEL_REQUESTS', 6),
+                'GIF_SOURCE_BASE_URL': self._get_str('GIF_SOURCE_BASE_URL', ''),
+                'GIF_LISTING_INDEX': self._get_bool('GIF_LISTING_INDEX', True)
             },
             'BRAINROT': {
                 'ENABLE_BRAINROT_STYLE': self._get_bool('ENABLE_BRAINROT_STYLE', True),
@@ -139,6 +152,18 @@ class ConfigLoader:
             return default
         return [item.strip() for item in value.split(',') if item.strip()]
 
+    def _get_resolution(self, key: str, default: List[int], orientation: str = 'portrait') -> List[int]:
+        """Lit une résolution 'LxH', l'oriente (portrait/paysage) et garantit des dimensions paires."""
+        try:
+            width, height = [int(v) for v in os.getenv(key, '').lower().split('x')]
+        except (ValueError, TypeError):
+            width, height = default
+        
+        if (orientation == 'portrait' and width > height) or (orientation == 'landscape' and height > width):
+            width, height = height, width
+        
+        return [width - width % 2, height - height % 2]
+
     def _get_int_list(self, key: str, default: List[int]) -> List[int]:
         value = os.getenv(key, '')
         if not value:
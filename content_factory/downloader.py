@@ -0,0 +1,190 @@
+# content_factory/downloader.py (TÉLÉCHARGEMENT EN FLUX AVEC VALIDATION)
+
+import os
+from typing import Optional, Tuple, Iterable
+
+import requests
+
+# Signatures binaires reconnues (magic bytes du premier bloc)
+MEDIA_EXTENSIONS = {
+    'gif': '.gif',
+    'jpeg': '.jpg',
+    'png': '.png',
+    'webp': '.webp',
+    'mp4': '.mp4',
+}
+
+IMAGE_TYPES = ('jpeg', 'png', 'webp')
+ANIMATED_TYPES = ('gif', 'mp4')
+
+# Content-Type annoncé → format (sert à valider sans rien télécharger)
+CONTENT_TYPES = {
+    'image/gif': 'gif',
+    'image/jpeg': 'jpeg',
+    'image/jpg': 'jpeg',
+    'image/png': 'png',
+    'image/webp': 'webp',
+    'video/mp4': 'mp4',
+}
+
+# Échecs passagers: à retenter plus tard (le reste est définitif)
+TRANSIENT_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+def detect_media_type(head: bytes) -> Optional[str]:
+    """Identifie le format réel d'après les premiers octets (indépendamment de l'URL)."""
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'gif'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    return None
+
+
+def _content_type_allowed(content_type: str) -> bool:
+    """Rejette d'emblée les pages HTML/JSON d'erreur servies avec un code 200."""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if not content_type:
+        return True
+    return content_type.startswith(('image/', 'video/')) or content_type in (
+        'application/octet-stream', 'binary/octet-stream'
+    )
+
+
+def is_permanent_failure(reason: str) -> bool:
+    """Classe une raison d'échec de probe_url/stream_download (définitive ou passagère)."""
+    if reason.startswith('HTTP '):
+        status = reason[5:].split()[0]
+        return not (status.isdigit() and int(status) in TRANSIENT_STATUS)
+    return reason.startswith(('type ', 'trop volumineux', 'signature invalide', 'dépasse', 'trop petit'))
+
+
+def _size_from_headers(headers) -> Optional[int]:
+    """Taille totale: Content-Range (GET partiel) ou Content-Length."""
+    content_range = headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    content_length = headers.get('Content-Length')
+    return int(content_length) if content_length and content_length.isdigit() else None
+
+
+def probe_url(session: requests.Session, url: str,
+              allowed_types: Iterable[str] = IMAGE_TYPES + ANIMATED_TYPES,
+              max_bytes: int = 20 * 1024 * 1024, min_bytes: int = 2048,
+              timeout: int = 8, headers: dict = None) -> Tuple[bool, str]:
+    """
+    Valide une URL sans la télécharger: HEAD (type et taille annoncés), puis si
+    la réponse est ambiguë ou refusée, GET partiel des 64 premiers octets pour
+    lire la signature réelle. Retourne (True, "") ou (False, raison).
+    """
+    def check_size(size: Optional[int]) -> str:
+        if size is not None and size > max_bytes:
+            return f"trop volumineux ({size // 1024} KB)"
+        if size is not None and size < min_bytes:
+            return f"trop petit ({size} octets)"
+        return ""
+
+    try:
+        response = session.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        if response.status_code == 200:
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if not _content_type_allowed(content_type):
+                return False, f"type {content_type}"
+            media_type = CONTENT_TYPES.get(content_type)
+            if media_type:
+                if media_type not in allowed_types:
+                    return False, f"type {content_type}"
+                error = check_size(_size_from_headers(response.headers))
+                return (not error), error
+        elif response.status_code not in (403, 405, 501) and not 300 <= response.status_code < 400:
+            # HEAD refusé par certains CDN: seul le GET partiel tranche
+            return False, f"HTTP {response.status_code}"
+
+        range_headers = dict(headers or {}, Range='bytes=0-63')
+        with session.get(url, headers=range_headers, timeout=timeout, stream=True) as response:
+            if response.status_code not in (200, 206):
+                return False, f"HTTP {response.status_code}"
+            if not _content_type_allowed(response.headers.get('Content-Type', '')):
+                return False, f"type {response.headers.get('Content-Type')}"
+
+            head = b''
+            for chunk in response.iter_content(chunk_size=64):
+                head += chunk
+                if len(head) >= 16:
+                    break
+            media_type = detect_media_type(head[:16])
+            if media_type not in allowed_types:
+                return False, f"signature invalide ({media_type or 'inconnue'})"
+
+            error = check_size(_size_from_headers(response.headers))
+            return (not error), error
+
+    except requests.RequestException as e:
+        return False, str(e)
+
+
+def stream_download(session: requests.Session, url: str, output_path: str,
+                    allowed_types: Iterable[str] = IMAGE_TYPES + ANIMATED_TYPES,
+                    max_bytes: int = 20 * 1024 * 1024, min_bytes: int = 2048,
+                    timeout: int = 15, headers: dict = None,
+                    chunk_size: int = 64 * 1024) -> Tuple[Optional[str], str]:
+    """
+    Télécharge par blocs dans un fichier temporaire, sans jamais tout garder en
+    mémoire. Abandon dès la première violation (Content-Type, Content-Length,
+    signature du premier bloc, taille maximale); renommage atomique à la fin.
+    L'extension du fichier final suit le format réellement reçu.
+
+    Retourne (chemin, "") en cas de succès, sinon (None, raison).
+    """
+    temp_path = f"{output_path}.part"
+
+    try:
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code != 200:
+                return None, f"HTTP {response.status_code}"
+
+            if not _content_type_allowed(response.headers.get('Content-Type', '')):
+                return None, f"type {response.headers.get('Content-Type')}"
+
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                return None, f"trop volumineux ({int(content_length) // 1024} KB)"
+
+            media_type = None
+            written = 0
+            with open(temp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+
+                    if media_type is None:
+                        media_type = detect_media_type(chunk[:16])
+                        if media_type not in allowed_types:
+                            return None, f"signature invalide ({media_type or 'inconnue'})"
+
+                    written += len(chunk)
+                    if written > max_bytes:
+                        return None, f"dépasse {max_bytes // 1024} KB"
+
+                    f.write(chunk)
+
+        if written < min_bytes:
+            return None, f"trop petit ({written} octets)"
+
+        final_path = os.path.splitext(output_path)[0] + MEDIA_EXTENSIONS[media_type]
+        os.replace(temp_path, final_path)
+        return final_path, ""
+
+    except requests.RequestException as e:
+        return None, str(e)
+    except OSError as e:
+        return None, f"écriture: {e}"
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,306 @@
+# content_factory/fake_gif_server.py (SERVEUR LOCAL IMITANT REDDIT / GIPHY / TENOR)
+
+import math
+import json
+import random
+import hashlib
+import asyncio
+import threading
+from typing import Dict, Optional, List, Any
+from urllib.parse import quote
+
+try:
+    from aiohttp import web
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Vocabulaire des titres générés (recouvre les termes du chasseur de GIFs)
+VOCABULARY = [
+    'amazing', 'awesome', 'cool', 'interesting', 'mindblowing', 'epic', 'incredible',
+    'unbelievable', 'fantastic', 'wow', 'perfect', 'technology', 'future', 'robot',
+    'digital', 'computer', 'science', 'experiment', 'physics', 'chemistry', 'space',
+    'planet', 'brain', 'mind', 'emotion', 'memory', 'history', 'ancient', 'castle',
+    'pyramid', 'empire', 'discovery', 'invention', 'secret', 'mystery', 'hidden',
+    'dangerous', 'extreme', 'intense', 'success', 'victory', 'shocking', 'explosive',
+    'cat', 'dog', 'loop', 'reaction', 'water', 'fire', 'machine', 'satisfying',
+]
+# Dimensions des renditions servies (portrait, paysage, carré)
+FRAME_SIZES = [(1080, 1920), (720, 1280), (1920, 1080), (1280, 720), (480, 480), (720, 720)]
+
+
+class FakeSourceProfile:
+    """Comportement d'une route: latence log-normale (médiane, dispersion) et taux d'échec."""
+
+    def __init__(self, latency: float = 0.05, latency_sigma: float = 0.6,
+                 failure_rate: float = 0.0, throttle_rate: float = 0.0, empty_rate: float = 0.25):
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate      # Réponses 503
+        self.throttle_rate = throttle_rate    # Réponses 429 (Retry-After: 1)
+        self.empty_rate = empty_rate          # Recherches sans résultat
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(vars(self))
+
+
+class FakeGIFServer:
+    """
+    Serveur HTTP local (aiohttp, thread dédié) servant des réponses au format
+    Reddit (search.json, listings top/hot), Giphy (v1/gifs/search), Tenor (page
+    de recherche) et les médias MP4 correspondants (HEAD et Range gérés).
+    Contenu, latences et échecs sont tirés d'un générateur initialisé par
+    (graine, requête, rang de la requête): deux runs de même graine reçoivent
+    les mêmes réponses, quel que soit l'entrelacement des requêtes concurrentes.
+
+    Utilisé avec GIF_SOURCE_BASE_URL=<url> ou build_gif_sources(base_url=...).
+    """
+
+    ROUTES = ('reddit', 'giphy', 'tenor', 'media')
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, seed: int = 0,
+                 profiles: Dict[str, FakeSourceProfile] = None, default_profile: FakeSourceProfile = None):
+        if not HAS_AIOHTTP:
+            raise RuntimeError("aiohttp requis pour FakeGIFServer")
+        self.host = host
+        self.port = port
+        self.seed = seed
+        default_profile = default_profile or FakeSourceProfile()
+        self.profiles = {route: (profiles or {}).get(route, default_profile) for route in self.ROUTES}
+
+        self.url = ''
+        self.stats: Dict[str, Dict[str, int]] = {route: {} for route in self.ROUTES}
+        self._request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    # --- CYCLE DE VIE ---
+
+    def start(self) -> 'FakeGIFServer':
+        self._thread = threading.Thread(target=self._serve, name="fake-gif-server", daemon=True)
+        self._thread.start()
+        if not self._started.wait(timeout=10) or not self.url:
+            raise RuntimeError("FakeGIFServer n'a pas démarré")
+        return self
+
+    def stop(self):
+        if self._loop and self._runner:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=10)
+        self._loop = self._runner = self._thread = None
+
+    def __enter__(self) -> 'FakeGIFServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._start_site())
+        finally:
+            self._started.set()
+        if self.url:
+            self._loop.run_forever()
+        self._loop.close()
+
+    async def _start_site(self):
+        app = web.Application()
+        app.router.add_get('/r/{subreddit}/search.json', self._reddit_search)
+        app.router.add_get('/r/{subreddit}/{listing}.json', self._reddit_listing)
+        app.router.add_get('/v1/gifs/search', self._giphy_search)
+        app.router.add_get('/search/{slug}', self._tenor_search)
+        app.router.add_route('*', '/media/{name}', self._media)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self.url = f"http://{self.host}:{self.port}"
+
+    # --- ALÉA REPRODUCTIBLE ---
+
+    def _rng(self, *parts: Any) -> random.Random:
+        return random.Random('|'.join(str(part) for part in (self.seed,) + parts))
+
+    def _request_rng(self, request) -> random.Random:
+        """Générateur propre à la n-ième occurrence de cette requête exacte."""
+        key = f"{request.method} {request.path_qs}"
+        with self._lock:
+            occurrence = self._request_counts.get(key, 0)
+            self._request_counts[key] = occurrence + 1
+        return self._rng('request', key, occurrence)
+
+    def _record(self, route: str, status: int):
+        with self._lock:
+            self.stats[route][str(status)] = self.stats[route].get(str(status), 0) + 1
+
+    async def _simulate(self, route: str, request) -> Optional[web.Response]:
+        """Latence puis, éventuellement, une erreur (429/503) à la place de la réponse."""
+        profile = self.profiles[route]
+        rng = self._request_rng(request)
+        delay = rng.lognormvariate(math.log(profile.latency), profile.latency_sigma) if profile.latency > 0 else 0
+        roll = rng.random()
+        await asyncio.sleep(delay)
+
+        if roll < profile.throttle_rate:
+            self._record(route, 429)
+            return web.Response(status=429, headers={'Retry-After': '1'}, text='Too Many Requests')
+        if roll < profile.throttle_rate + profile.failure_rate:
+            self._record(route, 503)
+            return web.Response(status=503, text='Service Unavailable')
+        return None
+
+    def _media_url(self, media_id: str, width: int, height: int) -> str:
+        return f"{self.url}/media/{media_id}-{width}x{height}.mp4"
+
+    # --- REDDIT ---
+
+    def _reddit_post(self, rng: random.Random, media_id: str, title: str) -> Dict[str, Any]:
+        width, height = rng.choice(FRAME_SIZES)
+        resolutions = [{'url': self._media_url(media_id, width * h // height, h), 'width': width * h // height,
+                        'height': h} for h in (height // 4, height // 2) if h > 0]
+        source = {'url': self._media_url(media_id, width, height), 'width': width, 'height': height}
+        return {'kind': 't3', 'data': {
+            'id': media_id,
+            'title': title,
+            'score': int(rng.lognormvariate(4.0, 1.6)),
+            'over_18': rng.random() < 0.03,
+            'url': f"{self.url}/media/{media_id}.gif",
+            'secure_media': {'reddit_video': {'duration': rng.randint(1, 20), 'is_gif': True,
+                                              'fallback_url': source['url'],
+                                              'width': width, 'height': height}},
+            'preview': {'images': [{'source': source, 'variants': {
+                'mp4': {'source': source, 'resolutions': resolutions}
+            }}]},
+        }}
+
+    def _reddit_listing_payload(self, posts: List[Dict[str, Any]]) -> str:
+        return json.dumps({'kind': 'Listing', 'data': {'children': posts}})
+
+    async def _reddit_search(self, request):
+        error = await self._simulate('reddit', request)
+        if error:
+            return error
+        subreddit = request.match_info['subreddit']
+        term = request.query.get('q', '').lower()
+        limit = int(request.query.get('limit', 25))
+        rng = self._rng('reddit', subreddit, term)
+
+        posts = []
+        if rng.random() >= self.profiles['reddit'].empty_rate:
+            for i in range(rng.randint(1, limit)):
+                media_id = hashlib.sha1(f"{subreddit}|{term}|{i}".encode('utf-8')).hexdigest()[:12]
+                title = ' '.join([term] + rng.sample(VOCABULARY, 3))
+                posts.append(self._reddit_post(rng, media_id, title))
+        self._record('reddit', 200)
+        return web.Response(text=self._reddit_listing_payload(posts), content_type='application/json')
+
+    async def _reddit_listing(self, request):
+        error = await self._simulate('reddit', request)
+        if error:
+            return error
+        subreddit = request.match_info['subreddit']
+        listing = request.match_info['listing']
+        rng = self._rng('listing', subreddit, listing)
+
+        posts = []
+        for i in range(int(request.query.get('limit', 25))):
+            media_id = hashlib.sha1(f"{subreddit}|{listing}|{i}".encode('utf-8')).hexdigest()[:12]
+            title = ' '.join(rng.sample(VOCABULARY, rng.randint(2, 5)))
+            posts.append(self._reddit_post(rng, media_id, title))
+        self._record('reddit', 200)
+        return web.Response(text=self._reddit_listing_payload(posts), content_type='application/json')
+
+    # --- GIPHY ---
+
+    async def _giphy_search(self, request):
+        error = await self._simulate('giphy', request)
+        if error:
+            return error
+        term = request.query.get('q', '').lower()
+        rng = self._rng('giphy', term)
+
+        gifs = []
+        if rng.random() >= self.profiles['giphy'].empty_rate:
+            for i in range(int(request.query.get('limit', 10))):
+                media_id = hashlib.sha1(f"giphy|{term}|{i}".encode('utf-8')).hexdigest()[:12]
+                width, height = rng.choice(FRAME_SIZES)
+                images = {}
+                for name, scale in (('original', 1), ('downsized', 2), ('fixed_height', 4)):
+                    w, h = width // scale, height // scale
+                    images[name] = {'url': f"{self.url}/media/{media_id}-{w}x{h}.gif",
+                                    'mp4': self._media_url(media_id, w, h), 'width': str(w), 'height': str(h)}
+                gifs.append({'id': media_id, 'rating': 'r' if rng.random() < 0.03 else 'g', 'images': images})
+        self._record('giphy', 200)
+        return web.json_response({'data': gifs, 'meta': {'status': 200}})
+
+    # --- TENOR ---
+
+    async def _tenor_search(self, request):
+        error = await self._simulate('tenor', request)
+        if error:
+            return error
+        slug = request.match_info['slug']
+        rng = self._rng('tenor', slug)
+
+        items = []
+        if rng.random() >= self.profiles['tenor'].empty_rate:
+            for i in range(rng.randint(1, 12)):
+                media_id = hashlib.sha1(f"tenor|{slug}|{i}".encode('utf-8')).hexdigest()[:12]
+                width, height = rng.choice(FRAME_SIZES)
+                items.append(f'<div class="Gif"><video src="{self._media_url(media_id, width, height)}"></video></div>')
+        self._record('tenor', 200)
+        page = f"<html><head><title>{quote(slug)}</title></head><body>{''.join(items)}</body></html>"
+        return web.Response(text=page, content_type='text/html')
+
+    # --- MÉDIAS ---
+
+    def _media_bytes(self, name: str) -> bytes:
+        """Contenu stable par nom: signature MP4 (ftyp) ou GIF, puis octets de remplissage."""
+        rng = self._rng('media', name)
+        size = rng.randint(64, 640) * 1024
+        header = b'GIF89a' if name.endswith('.gif') else b'\x00\x00\x00\x20ftypisom\x00\x00\x02\x00'
+        return header + hashlib.sha1(name.encode('utf-8')).digest() * ((size - len(header)) // 20 + 1)
+
+    async def _media(self, request):
+        error = await self._simulate('media', request)
+        if error:
+            return error
+        name = request.match_info['name']
+        body = self._media_bytes(name)
+        content_type = 'image/gif' if name.endswith('.gif') else 'video/mp4'
+        headers = {'Accept-Ranges': 'bytes'}
+
+        status = 200
+        byte_range = request.headers.get('Range', '')
+        if byte_range.startswith('bytes='):
+            start, _, end = byte_range[len('bytes='):].partition('-')
+            start, end = int(start or 0), min(int(end) if end else len(body) - 1, len(body) - 1)
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(body)}"
+            body = body[start:end + 1]
+            status = 206
+
+        self._record('media', status)
+        # HEAD: aiohttp n'envoie que les en-têtes (Content-Length compris)
+        return web.Response(status=status, body=body, headers=headers, content_type=content_type)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("🧪 FAKE GIF SERVER (Ctrl+C pour arrêter)")
+    with FakeGIFServer(port=8765) as server:
+        print(f"   🌐 {server.url} - lancer la production avec GIF_SOURCE_BASE_URL={server.url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\n📊 Requêtes servies: {server.stats}")
@@ -0,0 +1,209 @@
+# content_factory/frame_normalizer.py (NORMALISATION UNIQUE AU FORMAT FINAL)
+
+import os
+import re
+import hashlib
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Tuple, Dict
+
+from PIL import Image
+
+from content_factory.utils import safe_path_join, ensure_directory, trim_cache_dir, touch_file
+from content_factory.config_loader import ConfigLoader
+from content_factory.audio_mastering import get_ffmpeg_binary
+
+VIDEO_EXTENSIONS = ('.gif', '.mp4', '.mov', '.webm')
+# Nom des fichiers de l'AssetStore: sha1 du contenu
+_CONTENT_HASH_RE = re.compile(r'^[0-9a-f]{40}$')
+# Marge au-delà de la durée max d'un segment (les durées sont remises à l'échelle)
+LOOP_MARGIN = 1.5
+
+# Transcodages en arrière-plan partagés par toutes les instances (clé: fichier de sortie)
+_transcode_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gif-transcode")
+_pending_transcodes: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+
+def is_video_asset(path: str) -> bool:
+    """GIF et vidéos sont traités comme des clips animés."""
+    return bool(path) and path.lower().endswith(VIDEO_EXTENSIONS)
+
+
+class FrameNormalizer:
+    """
+    Étape UNIQUE de mise au format: chaque asset (image, GIF, vidéo) est amené
+    une fois pour toutes à la taille exacte de la vidéo finale (recadrage
+    "cover", dimensions paires) et mis en cache. Le rendu n'a plus rien à
+    redimensionner. Le cache est borné par FRAME_CACHE_SIZE_MB (LRU).
+    """
+
+    def __init__(self, resolution: Tuple[int, int] = None, fps: int = None, cache_dir: str = None):
+        config = ConfigLoader().get_config()
+        video_config = config.get('VIDEO_CREATOR', {})
+
+        width, height = resolution or video_config.get('RESOLUTION', [1080, 1920])
+        self.resolution = (width - width % 2, height - height % 2)
+        self.fps = fps or video_config.get('FPS', 30)
+        # Clips bouclés jusqu'à couvrir le plus long segment possible
+        self.loop_seconds = round(video_config.get('MAX_IMAGE_DURATION', 6.0) * LOOP_MARGIN, 2)
+
+        cache_root = config.get('PATHS', {}).get('CACHE_DIR', 'cache')
+        self.cache_dir = ensure_directory(cache_dir or os.path.join(cache_root, 'frames'))
+        self.max_cache_mb = video_config.get('FRAME_CACHE_SIZE_MB', 1000)
+        self.ffmpeg = get_ffmpeg_binary()
+
+    def _trim_cache(self):
+        evicted = trim_cache_dir(self.cache_dir, self.max_cache_mb)
+        if evicted:
+            print(f"🧹 Cache de normalisation: {evicted} fichier(s) évincé(s) (LRU)")
+
+    def _cache_key(self, path: str) -> str:
+        stat = os.stat(path)
+        raw_key = (f"{os.path.abspath(path)}|{stat.st_size}|{int(stat.st_mtime)}|"
+                   f"{self.resolution[0]}x{self.resolution[1]}|{self.fps}")
+        return hashlib.sha1(raw_key.encode('utf-8')).hexdigest()[:20]
+
+    @staticmethod
+    def _content_hash(path: str) -> str:
+        """sha1 du contenu (lu depuis le nom pour les fichiers de l'AssetStore)."""
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if _CONTENT_HASH_RE.match(stem):
+            return stem
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _video_output_path(self, video_path: str) -> str:
+        raw_key = (f"{self._content_hash(video_path)}|{self.resolution[0]}x{self.resolution[1]}|"
+                   f"{self.fps}|loop{self.loop_seconds}")
+        return safe_path_join(self.cache_dir, f"{hashlib.sha1(raw_key.encode('utf-8')).hexdigest()[:20]}.mp4")
+
+    # --- IMAGES ---
+
+    def cover_image(self, img: Image.Image) -> Image.Image:
+        """Recadrage "cover" à la taille exacte en un seul rééchantillonnage."""
+        target_width, target_height = self.resolution
+        if img.size == (target_width, target_height):
+            return img.convert('RGB')
+
+        # JPEG pas encore décodé: décodage réduit en DCT au plus près de la cible
+        if img.format == 'JPEG':
+            img.draft('RGB', (target_width, target_height))
+
+        scale = max(target_width / img.width, target_height / img.height)
+        new_width = max(target_width, round(img.width * scale))
+        new_height = max(target_height, round(img.height * scale))
+
+        img = img.convert('RGB').resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        left = (new_width - target_width) // 2
+        top = (new_height - target_height) // 2
+        return img.crop((left, top, left + target_width, top + target_height))
+
+    def normalize_image(self, image_path: str) -> str:
+        """Image au format final (cache); retourne le chemin d'origine si déjà conforme."""
+        try:
+            with Image.open(image_path) as img:
+                if img.size == self.resolution:
+                    return image_path
+
+                output_path = safe_path_join(self.cache_dir, f"{self._cache_key(image_path)}.jpg")
+                if os.path.exists(output_path):
+                    touch_file(output_path)
+                    return output_path
+
+                self.cover_image(img).save(output_path, 'JPEG', quality=92)
+                self._trim_cache()
+                return output_path
+
+        except Exception as e:
+            print(f"⚠️ Normalisation image échouée ({os.path.basename(image_path)}): {e}")
+            return image_path
+
+    # --- GIFS / VIDÉOS ---
+
+    def schedule_video(self, video_path: str) -> Optional[Future]:
+        """Lance le transcodage en arrière-plan (dès le téléchargement); None si déjà en cache."""
+        if not self.ffmpeg or not os.path.exists(video_path):
+            return None
+        output_path = self._video_output_path(video_path)
+        if os.path.exists(output_path):
+            touch_file(output_path)
+            return None
+
+        with _pending_lock:
+            future = _pending_transcodes.get(output_path)
+            if future is None:
+                future = _transcode_executor.submit(self._transcode_video, video_path, output_path)
+                _pending_transcodes[output_path] = future
+                future.add_done_callback(lambda _: self._forget_pending(output_path))
+            return future
+
+    @staticmethod
+    def _forget_pending(output_path: str):
+        with _pending_lock:
+            _pending_transcodes.pop(output_path, None)
+
+    def normalize_video(self, video_path: str) -> Optional[str]:
+        """
+        GIF/vidéo → MP4 H.264 au format final, bouclé sur `loop_seconds`, mis en
+        cache par hash du contenu. Attend le transcodage d'arrière-plan s'il est
+        en cours plutôt que de le relancer.
+        """
+        if not self.ffmpeg:
+            print("⚠️ ffmpeg introuvable - GIF non normalisé")
+            return None
+
+        output_path = self._video_output_path(video_path)
+        if os.path.exists(output_path):
+            touch_file(output_path)
+            return output_path
+
+        with _pending_lock:
+            future = _pending_transcodes.get(output_path)
+        if future is not None:
+            return future.result()
+        return self._transcode_video(video_path, output_path)
+
+    def _transcode_video(self, video_path: str, output_path: str) -> Optional[str]:
+        """Scale/crop ffmpeg, fps fixe, boucle jusqu'à `loop_seconds`, sans audio."""
+        if os.path.exists(output_path):
+            return output_path
+
+        target_width, target_height = self.resolution
+        video_filter = (
+            f"scale={target_width}:{target_height}:force_original_aspect_ratio=increase:flags=lanczos,"
+            f"crop={target_width}:{target_height},fps={self.fps},format=yuv420p"
+        )
+        temp_path = f"{output_path}.{threading.get_ident()}.tmp.mp4"
+
+        try:
+            subprocess.run([
+                self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+                '-stream_loop', '-1', '-i', video_path, '-t', str(self.loop_seconds),
+                '-vf', video_filter, '-an',
+                '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18',
+                '-movflags', '+faststart', temp_path
+            ], check=True, capture_output=True, timeout=120)
+            os.replace(temp_path, output_path)
+            self._trim_cache()
+            return output_path
+
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.decode('utf-8', errors='ignore').strip() if e.stderr else str(e)
+            print(f"⚠️ Normalisation GIF échouée ({os.path.basename(video_path)}): {error[:200]}")
+        except Exception as e:
+            print(f"⚠️ Normalisation GIF échouée ({os.path.basename(video_path)}): {e}")
+
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+    def normalize(self, asset_path: str) -> Optional[str]:
+        if is_video_asset(asset_path):
+            return self.normalize_video(asset_path)
+        return self.normalize_image(asset_path)
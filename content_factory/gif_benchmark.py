@@ -0,0 +1,170 @@
+# content_factory/gif_benchmark.py (BENCHMARK HORS LIGNE DE LA CHASSE AUX GIFS)
+
+import io
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+from typing import Dict, List, Any
+
+import requests
+
+from content_factory.rate_limiter import HostRateLimiter
+from content_factory.gif_sources import build_gif_sources
+from content_factory.downloader import probe_url, ANIMATED_TYPES
+from content_factory.fake_gif_server import FakeGIFServer, FakeSourceProfile
+from content_factory.reddit_gifs import UltimateGIFHunter
+
+# Contenus types des chasses (un par catégorie)
+BENCHMARK_CONTENTS = [
+    {'title': 'LES 10 SECRETS TECHNOLOGIQUES QUE LES GÉANTS CACHENT', 'category': 'technologie', 'is_part1': True},
+    {'title': 'CETTE EXPÉRIENCE DE PHYSIQUE VA TE CHOQUER', 'category': 'science', 'is_part1': True},
+    {'title': 'LE CERVEAU HUMAIN CACHE UN MYSTÈRE INCROYABLE', 'category': 'psychologie', 'is_part1': False},
+    {'title': 'LA PYRAMIDE SECRÈTE DE CET EMPIRE OUBLIÉ', 'category': 'histoire', 'is_part1': True},
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentile par rang le plus proche (0 si aucune valeur)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    return {
+        'p50': round(percentile(values, 0.50), 3),
+        'p95': round(percentile(values, 0.95), 3),
+        'p99': round(percentile(values, 0.99), 3),
+        'max': round(max(values), 3) if values else 0.0,
+    }
+
+
+def run_hunt_benchmark(hunts: int = 20, target_count: int = 8, max_attempts: int = 25, seed: int = 0,
+                       profile: FakeSourceProfile = None, profiles: Dict[str, FakeSourceProfile] = None,
+                       async_search: bool = True, listing_index: bool = False, warm: bool = False,
+                       requests_per_second: float = 50.0, probe: bool = False,
+                       verbose: bool = False) -> Dict[str, Any]:
+    """
+    Chasses successives contre FakeGIFServer: débit (candidats/s) et latence de
+    queue des chasses, plus les statuts servis par route. Chaque chasse part d'un
+    état vierge (cache, bandit, liste noire) sauf avec `warm`.
+    """
+    random.seed(seed)
+    server_profile = profile or FakeSourceProfile()
+    hunt_seconds: List[float] = []
+    probe_seconds: List[float] = []
+    candidates_found = 0
+    hunts_on_target = 0
+    valid_media = 0
+    state_root = tempfile.mkdtemp(prefix='gif_benchmark_')
+
+    with FakeGIFServer(seed=seed, profiles=profiles, default_profile=server_profile) as server:
+        limiter = HostRateLimiter(host_limits={}, default_limit=(requests_per_second, max(1, int(requests_per_second))))
+        http = requests.Session()
+        hunter = None
+
+        try:
+            for index in range(hunts):
+                if hunter is None or not warm:
+                    state_dir = os.path.join(state_root, 'shared' if warm else f"hunt_{index}")
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        hunter = UltimateGIFHunter(rate_limiter=limiter, state_dir=state_dir)
+                        hunter.sources = build_gif_sources(hunter.guaranteed_subreddits, hunter.resolution,
+                                                           hunter.min_rendition_height, server.url)
+                    hunter.async_search = async_search and hunter.async_search
+                    if not listing_index:
+                        hunter.listing_index = None
+
+                content_data = BENCHMARK_CONTENTS[index % len(BENCHMARK_CONTENTS)]
+                output = None if verbose else io.StringIO()
+                started = time.monotonic()
+                with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+                    urls = hunter.hunt_gifs_persistently(content_data, target_count, max_attempts)
+                hunt_seconds.append(time.monotonic() - started)
+
+                # Le fallback local (URLs externes) ne compte pas comme trouvaille
+                found = [url for url in urls if url.startswith(server.url)]
+                candidates_found += len(found)
+                hunts_on_target += len(found) >= target_count
+
+                if probe:
+                    for url in found[:target_count]:
+                        started = time.monotonic()
+                        ok, _ = probe_url(http, url, allowed_types=ANIMATED_TYPES, max_bytes=20 * 1024 * 1024)
+                        probe_seconds.append(time.monotonic() - started)
+                        valid_media += ok
+        finally:
+            http.close()
+            shutil.rmtree(state_root, ignore_errors=True)
+
+        total_seconds = sum(hunt_seconds)
+        report = {
+            'config': {
+                'hunts': hunts, 'target_count': target_count, 'max_attempts': max_attempts, 'seed': seed,
+                'async_search': async_search, 'listing_index': listing_index, 'warm': warm,
+                'requests_per_second': requests_per_second, 'profile': server_profile.to_dict(),
+            },
+            'hunt_seconds': _latency_summary(hunt_seconds),
+            'hunts_on_target': hunts_on_target,
+            'candidates_per_second': round(candidates_found / total_seconds, 2) if total_seconds else 0.0,
+            'hunts_per_minute': round(60 * len(hunt_seconds) / total_seconds, 2) if total_seconds else 0.0,
+            'server_statuses': server.stats,
+        }
+        if probe:
+            report['probe_seconds'] = _latency_summary(probe_seconds)
+            report['valid_media'] = valid_media
+        return report
+
+
+def print_report(report: Dict[str, Any]):
+    hunt = report['hunt_seconds']
+    print(f"\n📊 BENCHMARK CHASSE AUX GIFS ({report['config']['hunts']} chasses, graine {report['config']['seed']})")
+    print(f"   ⏱️ Durée de chasse: p50 {hunt['p50']}s | p95 {hunt['p95']}s | p99 {hunt['p99']}s | max {hunt['max']}s")
+    print(f"   🚀 Débit: {report['candidates_per_second']} candidats/s | {report['hunts_per_minute']} chasses/min")
+    print(f"   🎯 Cible atteinte: {report['hunts_on_target']}/{report['config']['hunts']}")
+    if 'probe_seconds' in report:
+        probe = report['probe_seconds']
+        print(f"   🔎 Validation médias: p50 {probe['p50']}s | p95 {probe['p95']}s | {report['valid_media']} valides")
+    for route, statuses in report['server_statuses'].items():
+        if statuses:
+            print(f"   🌐 {route}: {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne de la chasse aux GIFs (FakeGIFServer)")
+    parser.add_argument('--hunts', type=int, default=20)
+    parser.add_argument('--target', type=int, default=8)
+    parser.add_argument('--max-attempts', type=int, default=25)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.05, help="Latence médiane (s)")
+    parser.add_argument('--latency-sigma', type=float, default=0.6, help="Dispersion log-normale")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Part de réponses 503")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Part de réponses 429")
+    parser.add_argument('--empty-rate', type=float, default=0.25, help="Part de recherches sans résultat")
+    parser.add_argument('--rps', type=float, default=50.0, help="Requêtes/s autorisées vers le serveur local")
+    parser.add_argument('--sync', action='store_true', help="Chasse séquentielle au lieu d'aiohttp")
+    parser.add_argument('--index', action='store_true', help="Activer l'index local des listings Reddit")
+    parser.add_argument('--warm', action='store_true', help="Conserver cache et bandit entre les chasses")
+    parser.add_argument('--probe', action='store_true', help="Valider aussi les médias retenus")
+    parser.add_argument('--json', type=str, default='', help="Écrire le rapport dans ce fichier")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    report = run_hunt_benchmark(
+        hunts=args.hunts, target_count=args.target, max_attempts=args.max_attempts, seed=args.seed,
+        profile=FakeSourceProfile(args.latency, args.latency_sigma, args.failure_rate,
+                                  args.throttle_rate, args.empty_rate),
+        async_search=not args.sync, listing_index=args.index, warm=args.warm,
+        requests_per_second=args.rps, probe=args.probe, verbose=args.verbose,
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"   💾 Rapport: {args.json}")
@@ -0,0 +1,99 @@
+# content_factory/gif_candidates.py (CANDIDATS GIF ET CLASSEMENT)
+
+import math
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+# Poids du score de classement (somme = 1)
+RANK_WEIGHTS = {
+    'resolution': 0.30,
+    'aspect': 0.25,
+    'duration': 0.20,
+    'popularity': 0.25,
+}
+# Durée idéale d'un clip dans un short (secondes)
+IDEAL_DURATION = (2.0, 10.0)
+# Valeur neutre quand la métadonnée est inconnue
+UNKNOWN_SCORE = 0.5
+
+
+class GIFCandidate:
+    """
+    Résultat de recherche avant téléchargement: URL plus les métadonnées déjà
+    fournies par la source (score Reddit, dimensions de la rendition, durée, NSFW).
+    """
+
+    __slots__ = ('url', 'source', 'score', 'width', 'height', 'duration', 'nsfw')
+
+    def __init__(self, url: str, source: str = '', score: Optional[int] = None,
+                 width: Optional[int] = None, height: Optional[int] = None,
+                 duration: Optional[float] = None, nsfw: bool = False):
+        self.url = url
+        self.source = source
+        self.score = score
+        self.width = width or None
+        self.height = height or None
+        self.duration = duration or None
+        self.nsfw = nsfw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__slots__ if getattr(self, key) not in (None, False, '')}
+
+    @classmethod
+    def from_cache(cls, item: Union[str, Dict[str, Any]]) -> 'GIFCandidate':
+        """Entrée du cache de recherche (anciennes entrées: simple URL)."""
+        if isinstance(item, str):
+            return cls(item)
+        return cls(**{key: value for key, value in item.items() if key in cls.__slots__})
+
+    def __repr__(self) -> str:
+        size = f"{self.width}x{self.height}" if self.width and self.height else "?"
+        return f"GIFCandidate({self.source or '?'}, {size}, {self.url[:60]})"
+
+
+def _resolution_score(candidate: GIFCandidate, min_height: int) -> float:
+    if not candidate.height:
+        return UNKNOWN_SCORE
+    return min(1.0, candidate.height / float(min_height))
+
+
+def _aspect_score(candidate: GIFCandidate, resolution: Tuple[int, int]) -> float:
+    """Part de l'image conservée par le recadrage "cover" au format final."""
+    if not candidate.width or not candidate.height:
+        return UNKNOWN_SCORE
+    source_ratio = candidate.width / float(candidate.height)
+    target_ratio = resolution[0] / float(resolution[1])
+    return min(source_ratio, target_ratio) / max(source_ratio, target_ratio)
+
+
+def _duration_score(candidate: GIFCandidate) -> float:
+    if not candidate.duration:
+        return UNKNOWN_SCORE
+    low, high = IDEAL_DURATION
+    if candidate.duration < low:
+        return candidate.duration / low
+    if candidate.duration > high:
+        return max(0.0, 1.0 - (candidate.duration - high) / (3 * high))
+    return 1.0
+
+
+def _popularity_score(candidate: GIFCandidate) -> float:
+    if candidate.score is None:
+        return UNKNOWN_SCORE
+    # 10 000 upvotes ≈ score maximal
+    return min(1.0, math.log10(1 + max(0, candidate.score)) / 4.0)
+
+
+def rank_score(candidate: GIFCandidate, resolution: Tuple[int, int], min_height: int) -> float:
+    """Score 0-1: adéquation de résolution, ratio, durée et popularité."""
+    return (RANK_WEIGHTS['resolution'] * _resolution_score(candidate, min_height)
+            + RANK_WEIGHTS['aspect'] * _aspect_score(candidate, resolution)
+            + RANK_WEIGHTS['duration'] * _duration_score(candidate)
+            + RANK_WEIGHTS['popularity'] * _popularity_score(candidate))
+
+
+def rank_candidates(candidates: List[GIFCandidate], resolution: Tuple[int, int], min_height: int,
+                    bonus: Dict[str, float] = None) -> List[GIFCandidate]:
+    """Candidats NSFW écartés, puis tri par score décroissant (bonus éventuel par URL)."""
+    bonus = bonus or {}
+    safe = [candidate for candidate in candidates if not candidate.nsfw]
+    return sorted(safe, key=lambda c: rank_score(c, resolution, min_height) + bonus.get(c.url, 0.0), reverse=True)
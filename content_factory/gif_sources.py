@@ -0,0 +1,293 @@
+# content_factory/gif_sources.py (SOURCES DE GIFS INTERCHANGEABLES)
+
+import re
+import html
+import asyncio
+import requests
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Tuple, Any, Iterable
+from urllib.parse import quote, urlparse
+
+from content_factory.rate_limiter import HostRateLimiter
+from content_factory.gif_candidates import GIFCandidate, rank_candidates
+
+
+def pick_rendition(renditions: List[Tuple[str, int, int]], min_height: int) -> Optional[Tuple[str, int, int]]:
+    """Plus petite rendition (url, largeur, hauteur) assez haute, sinon la plus grande."""
+    renditions = [r for r in renditions if r[0]]
+    if not renditions:
+        return None
+    large_enough = [r for r in renditions if r[2] >= min_height]
+    if large_enough:
+        return min(large_enough, key=lambda r: r[1] * r[2])
+    return max(renditions, key=lambda r: r[1] * r[2])
+
+
+def clean_gif_url(url: str) -> str:
+    """Nettoie et normalise l'URL GIF (rendition MP4 quand l'hébergeur en fournit une)"""
+    # Imgur sert la même animation en MP4 (le .gifv n'est qu'une page autour)
+    if 'i.imgur.com' in url and url.endswith(('.gifv', '.gif')):
+        return url.rsplit('.', 1)[0] + '.mp4'
+
+    # Convertir GIFV en GIF
+    if url.endswith('.gifv'):
+        return url.replace('.gifv', '.gif')
+
+    # Giphy: giphy.gif → giphy.mp4 sur le même média
+    if 'giphy.com/media/' in url and url.endswith('/giphy.gif'):
+        return url[:-len('giphy.gif')] + 'giphy.mp4'
+
+    # Nettoyer les URLs Imgur
+    if 'imgur.com' in url and not url.endswith(('.gif', '.mp4')):
+        if '/gallery/' not in url:  # Éviter les galleries
+            return url + '.mp4'
+
+    return url
+
+
+class GIFSource(ABC):
+    """
+    Source de GIFs: un terme (et éventuellement une partition, ex: subreddit) donne
+    une requête HTTP, dont la réponse est convertie en candidats avec métadonnées.
+    Le transport (débit par hôte, sync/async) est commun à toutes les sources;
+    chacune ne décrit que sa requête et son parsing.
+    """
+
+    name = ''
+    DEFAULT_BASE_URL = ''
+    # 'json' ou 'text' (page HTML)
+    response_type = 'json'
+
+    def __init__(self, base_url: str = None, min_rendition_height: int = 720):
+        self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip('/')
+        self.min_rendition_height = min_rendition_height
+
+    def shards(self) -> List[Optional[str]]:
+        """Partitions interrogées séparément pour un même terme (aucune par défaut)."""
+        return [None]
+
+    def cache_params(self, shard: Optional[str]) -> Optional[Dict[str, Any]]:
+        return None
+
+    def label(self, shard: Optional[str]) -> str:
+        return self.name.capitalize()
+
+    @abstractmethod
+    def build_request(self, term: str, shard: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """(url, paramètres de requête) pour un terme et une partition."""
+
+    @abstractmethod
+    def parse(self, payload: Any) -> List[GIFCandidate]:
+        """Réponse décodée (JSON ou texte selon `response_type`) → candidats."""
+
+    def search(self, term: str, shard: Optional[str], rate_limiter: HostRateLimiter,
+               headers: Dict[str, str] = None, timeout: float = 15) -> Optional[List[GIFCandidate]]:
+        """Recherche bloquante; None si la réponse n'est pas exploitable (erreur HTTP)."""
+        url, params = self.build_request(term, shard)
+        rate_limiter.wait(url)
+        response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        pause = rate_limiter.observe(url, response.status_code, response.headers)
+        if response.status_code != 200:
+            self._report_status(url, response.status_code, pause)
+            return None
+        return self.parse(response.json() if self.response_type == 'json' else response.text)
+
+    async def search_async(self, session, term: str, shard: Optional[str],
+                           rate_limiter: HostRateLimiter) -> Optional[List[GIFCandidate]]:
+        """Même recherche sur une session aiohttp (jeton réservé pour l'hôte avant l'envoi)."""
+        url, params = self.build_request(term, shard)
+        delay = rate_limiter.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with session.get(url, params=params) as response:
+            pause = rate_limiter.observe(url, response.status, response.headers)
+            if response.status != 200:
+                self._report_status(url, response.status, pause)
+                return None
+            if self.response_type == 'json':
+                payload = await response.json(content_type=None)
+            else:
+                payload = await response.text()
+        return self.parse(payload)
+
+    def _report_status(self, url: str, status: int, pause: Optional[float]):
+        if status == 429:
+            print(f"      ⏳ Rate limit {urlparse(url).netloc}, reprise dans {pause or 0:.0f}s")
+
+
+class RedditSource(GIFSource):
+    """Recherche par subreddit (search.json) et listings top/hot pour l'index local."""
+
+    name = 'reddit'
+    DEFAULT_BASE_URL = "https://www.reddit.com"
+    # Score minimal d'un post (filtre très permissif)
+    MIN_SCORE = 5
+    MAX_RESULTS = 8
+
+    def __init__(self, subreddits: Iterable[str], resolution: Tuple[int, int] = (1080, 1920),
+                 base_url: str = None, min_rendition_height: int = 720):
+        super().__init__(base_url, min_rendition_height)
+        self.subreddits = list(subreddits)
+        self.resolution = resolution
+
+    def shards(self) -> List[Optional[str]]:
+        return list(self.subreddits)
+
+    def cache_params(self, shard: Optional[str]) -> Optional[Dict[str, Any]]:
+        return {'subreddit': shard}
+
+    def label(self, shard: Optional[str]) -> str:
+        return f"r/{shard}"
+
+    def build_request(self, term: str, shard: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        params = {
+            'q': term,
+            'restrict_sr': 'on',
+            'sort': 'relevance',  # Relevance pour meilleurs résultats
+            't': 'year',          # Année entière pour plus de contenu
+            'limit': 25           # Beaucoup de résultats
+        }
+        return f"{self.base_url}/r/{shard}/search.json", params
+
+    def listing_url(self, subreddit: str, listing: str) -> str:
+        return f"{self.base_url}/r/{subreddit}/{listing}.json"
+
+    def parse(self, payload: Any) -> List[GIFCandidate]:
+        """Les meilleurs GIFs du listing (et non les premiers), métadonnées conservées."""
+        candidates = [candidate for _, candidate in self.parse_listing(payload)]
+        unique = list({candidate.url: candidate for candidate in candidates}.values())
+        return rank_candidates(unique, self.resolution, self.min_rendition_height)[:self.MAX_RESULTS]
+
+    def parse_listing(self, payload: Any) -> List[Tuple[str, GIFCandidate]]:
+        """(titre, candidat) de chaque post exploitable d'un listing."""
+        posts = []
+        for post in (payload or {}).get('data', {}).get('children', []):
+            post_data = post.get('data', {})
+            candidate = self.post_to_candidate(post_data)
+            if candidate:
+                posts.append((post_data.get('title', ''), candidate))
+        return posts
+
+    def post_to_candidate(self, post_data: dict) -> Optional[GIFCandidate]:
+        """Post Reddit → candidat (rendition MP4 de préférence), ou None s'il n'est pas exploitable"""
+        score = post_data.get('score', 0)
+        if score < self.MIN_SCORE or post_data.get('over_18'):
+            return None
+
+        # MP4 d'abord: 5 à 20x plus léger que le GIF et bien plus rapide à décoder
+        rendition = self.mp4_rendition(post_data)
+        if rendition:
+            url, width, height, duration = rendition
+            return GIFCandidate(url, self.name, score, width, height, duration)
+
+        url = post_data.get('url', '')
+
+        # Accepter TOUS les types de GIFs possibles
+        if (url.endswith('.gif') or
+            '.gif?' in url or
+            'gif' in url.lower() or
+            'redgifs' in url or
+            'imgur' in url or
+            'gfycat' in url):
+
+            clean_url = clean_gif_url(url)
+            if clean_url:
+                source = (post_data.get('preview', {}).get('images') or [{}])[0].get('source', {})
+                return GIFCandidate(clean_url, self.name, score, source.get('width'), source.get('height'))
+
+        return None
+
+    def mp4_rendition(self, post_data: dict) -> Optional[Tuple[str, int, int, Optional[float]]]:
+        """MP4 fourni par Reddit (url, largeur, hauteur, durée): variantes mp4 de l'aperçu, puis reddit_video."""
+        media = post_data.get('secure_media') or post_data.get('media') or {}
+        reddit_video = media.get('reddit_video') if isinstance(media, dict) else None
+        duration = reddit_video.get('duration') if reddit_video else None
+
+        for image in post_data.get('preview', {}).get('images', [])[:1]:
+            mp4 = image.get('variants', {}).get('mp4')
+            if mp4:
+                renditions = [
+                    (html.unescape(r.get('url', '')), r.get('width', 0), r.get('height', 0))
+                    for r in mp4.get('resolutions', []) + [mp4.get('source', {})]
+                ]
+                rendition = pick_rendition(renditions, self.min_rendition_height)
+                if rendition:
+                    return rendition + (duration,)
+
+        if reddit_video and reddit_video.get('fallback_url'):
+            # Clips courts seulement (les GIFs convertis par Reddit sont marqués is_gif)
+            if reddit_video.get('is_gif') or (duration or 0) <= 30:
+                return (html.unescape(reddit_video['fallback_url']),
+                        reddit_video.get('width', 0), reddit_video.get('height', 0), duration)
+
+        return None
+
+
+class GiphySource(GIFSource):
+    """API de recherche Giphy (clé publique beta)."""
+
+    name = 'giphy'
+    DEFAULT_BASE_URL = "https://api.giphy.com"
+    PUBLIC_API_KEY = 'dc6zaTOxFJmzC'
+
+    def build_request(self, term: str, shard: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        params = {'q': term, 'limit': 10, 'rating': 'pg-13', 'api_key': self.PUBLIC_API_KEY}
+        return f"{self.base_url}/v1/gifs/search", params
+
+    def parse(self, payload: Any) -> List[GIFCandidate]:
+        candidates = []
+        for gif in (payload or {}).get('data', [])[:5]:
+            images = gif.get('images', {})
+            # Toutes les renditions MP4 proposées (original, fixed_height, downsized...)
+            renditions = [
+                (rendition.get('mp4'), int(rendition.get('width') or 0), int(rendition.get('height') or 0))
+                for rendition in images.values() if isinstance(rendition, dict) and rendition.get('mp4')
+            ]
+            original = images.get('original', {})
+            url, width, height = pick_rendition(renditions, self.min_rendition_height) or (
+                original.get('url'), int(original.get('width') or 0), int(original.get('height') or 0)
+            )
+            if url:
+                candidates.append(GIFCandidate(url, self.name, width=width, height=height,
+                                               nsfw=gif.get('rating') in ('r', 'nc-17')))
+        return candidates
+
+
+class TenorSource(GIFSource):
+    """Page de recherche publique Tenor (sans clé d'API), renditions MP4 extraites du HTML."""
+
+    name = 'tenor'
+    DEFAULT_BASE_URL = "https://tenor.com"
+    response_type = 'text'
+    MEDIA_HOSTS = ('media.tenor.com',)
+
+    def __init__(self, base_url: str = None, min_rendition_height: int = 720):
+        super().__init__(base_url, min_rendition_height)
+        # Une base personnalisée (miroir, serveur local) sert aussi ses médias
+        hosts = set(self.MEDIA_HOSTS) | {urlparse(self.base_url).netloc}
+        host_pattern = '|'.join(re.escape(host) for host in sorted(hosts))
+        self._mp4_re = re.compile(rf'https?://(?:{host_pattern})/[^"\'\s]*\.mp4')
+
+    def build_request(self, term: str, shard: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        return f"{self.base_url}/search/{quote(term)}-gifs", {}
+
+    def parse(self, payload: Any) -> List[GIFCandidate]:
+        # Extraction basique: renditions MP4 de la page d'abord, GIF sinon
+        urls = list(dict.fromkeys(self._mp4_re.findall(payload or '')))
+        if not urls:
+            urls = list(dict.fromkeys(re.findall(r'https://[^"\']*\.gif[^"\']*', payload or '')))
+        return [GIFCandidate(url, self.name) for url in urls[:5]]
+
+
+def build_gif_sources(subreddits: Iterable[str], resolution: Tuple[int, int], min_rendition_height: int,
+                      base_url: str = None) -> Dict[str, GIFSource]:
+    """
+    Sources par défaut, dans l'ordre. `base_url` redirige toutes les sources vers un
+    même serveur (ex: FakeGIFServer pour les benchmarks hors ligne).
+    """
+    sources = [
+        RedditSource(subreddits, resolution, base_url, min_rendition_height),
+        GiphySource(base_url, min_rendition_height),
+        TenorSource(base_url, min_rendition_height),
+    ]
+    return {source.name: source for source in sources}
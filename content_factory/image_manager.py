@@ -1,14 +1,26 @@
 # content_factory/image_manager.py (VERSION CORRIGÉE - Unsplash + IA)
 
 import os
+import json
 import random
 import requests
 from typing import List, Dict, Optional
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from content_factory.utils import ensure_directory, safe_path_join
 from content_factory.config_loader import ConfigLoader
+from content_factory.asset_store import get_asset_store
+from content_factory.frame_normalizer import FrameNormalizer, is_video_asset
+from content_factory.perceptual_index import get_perceptual_index
+from content_factory.title_cards import TitleCardRenderer
+from content_factory.downloader import (stream_download, probe_url, is_permanent_failure,
+                                        IMAGE_TYPES, ANIMATED_TYPES)
+from content_factory.url_blacklist import get_url_blacklist
+from content_factory.asset_prefetcher import AssetPool, AssetPrefetcher
+from content_factory.asset_library import get_asset_library
 
 try:
     from content_factory.reddit_gifs import get_brainrot_gifs
@@ -17,9 +29,17 @@ except ImportError as e:
     REDDIT_GIFS_AVAILABLE = False
     print(f"⚠️ Reddit GIFs non disponible: {e}")
 
+# La réserve de candidats Unsplash est partagée avec le préchargement en arrière-plan
+_UNSPLASH_POOL_LOCK = threading.Lock()
+
 class BrainrotImageManager:
     """Gestionnaire d'images INTELLIGENT avec IA + Unsplash - VERSION CORRIGÉE"""
     
+    # Candidats demandés par appel /photos/random (max API: 30)
+    UNSPLASH_BATCH_SIZE = 10
+    # Durée de vie des candidats gardés en réserve pour les slots suivants
+    UNSPLASH_POOL_TTL = 3 * 24 * 3600
+    
     def __init__(self):
         self.config = ConfigLoader().get_config()
         self.paths = self.config.get('PATHS', {})
@@ -29,13 +49,38 @@ class BrainrotImageManager:
         self.images_dir = safe_path_join(output_root, self.paths.get('IMAGE_DIR', 'images'))
         ensure_directory(self.images_dir)
         
-        # Résolution pour Shorts (dimensions paires)
-        self.resolution = (1080, 1920)
+        # Format final unique (VIDEO_RESOLUTION + VIDEO_ORIENTATION, dimensions paires)
+        self.normalizer = FrameNormalizer()
+        self.resolution = self.normalizer.resolution
         
         # 🔥 CORRECTION : Utiliser UNSPLASH_API_KEY au lieu de UNSPLASH_ACCESS_KEY
         self.unsplash_access_key = os.getenv('UNSPLASH_API_KEY')
         self.unsplash_enabled = bool(self.unsplash_access_key)
         
+        # Téléchargements simultanés bornés (PERFORMANCE.MAX_CONCURRENT_DOWNLOADS)
+        performance = self.config.get('PERFORMANCE', {})
+        self.max_concurrent_downloads = max(1, int(performance.get('MAX_CONCURRENT_DOWNLOADS', 2)))
+        self.http = requests.Session()
+        
+        # Réserve de candidats Unsplash non utilisés (partagée entre les slots)
+        self.cache_dir = ensure_directory(self.paths.get('CACHE_DIR', 'cache'))
+        self.unsplash_pool_path = safe_path_join(self.cache_dir, "unsplash_pool.json")
+        self.unsplash_remaining = None  # Quota horaire restant (X-Ratelimit-Remaining)
+        
+        # Réserves d'assets par catégorie, remplies entre les slots
+        self.asset_pool = AssetPool(safe_path_join(self.cache_dir, "asset_pools.json"))
+        
+        # Index perceptuel: quasi-doublons rejetés dans la vidéo et entre vidéos récentes
+        self.perceptual_index = get_perceptual_index()
+        
+        # Stock d'assets adressé par contenu, consulté avant tout téléchargement
+        image_config = self.config.get('IMAGE_MANAGER', {})
+        self.asset_store = get_asset_store()
+        self.url_blacklist = get_url_blacklist()
+        self.cleanup_old_images = image_config.get('CLEANUP_OLD_IMAGES', True)
+        self.max_images_to_keep = image_config.get('MAX_IMAGES_TO_KEEP', 50)
+        self.max_download_bytes = image_config.get('MAX_DOWNLOAD_MB', 20) * 1024 * 1024
+        
         if self.unsplash_enabled:
             print("🎨 ImageManager INTELLIGENT initialisé - Unsplash ACTIVÉ")
         else:
@@ -49,6 +94,8 @@ class BrainrotImageManager:
             'psychologie': ['#4a148c', '#8e24aa', '#e040fb'],
             'argent_business': ['#e65100', '#ff9800', '#ffb74d']
         }
+        
+        self.title_cards = TitleCardRenderer(self.resolution, self.brainrot_styles, self.images_dir)
 
     def _ensure_unique_gifs(self, gif_urls: List[str]) -> List[str]:
         """Garantit que les GIFs sont uniques"""
@@ -90,8 +137,16 @@ class BrainrotImageManager:
         
         all_assets = []
         
-        # STRATÉGIE INTELLIGENTE : GIFs en PRIORITÉ
-        gif_paths = self._get_intelligent_gifs(content_data, num_gifs)
+        if self.cleanup_old_images:
+            self._cleanup_old_images()
+        
+        # STRATÉGIE INTELLIGENTE : GIFs en PRIORITÉ (réserve préchargée d'abord)
+        gif_paths = self.perceptual_index.filter_unique(self.asset_pool.take(category, 'gifs', num_gifs), 'GIF')
+        if gif_paths:
+            print(f"   📦 {len(gif_paths)} GIFs pris dans la réserve préchargée")
+        if len(gif_paths) < num_gifs:
+            live_gifs = self._get_intelligent_gifs(content_data, num_gifs - len(gif_paths))
+            gif_paths.extend(self.perceptual_index.filter_unique(live_gifs, 'GIF'))
         all_assets.extend(gif_paths)
         
         # Images en COMPLÉMENT avec IA + Unsplash
@@ -99,8 +154,13 @@ class BrainrotImageManager:
         if needed_images > 0:
             print(f"   🖼️ Génération de {needed_images} images en complément...")
             
-            # 🎯 STRATÉGIE AMÉLIORÉE : Unsplash avec mots-clés IA
-            unsplash_images = self._get_ai_enhanced_unsplash(content_data, needed_images)
+            # 🎯 STRATÉGIE AMÉLIORÉE : réserve préchargée, puis Unsplash avec mots-clés IA
+            unsplash_images = self.perceptual_index.filter_unique(
+                self.asset_pool.take(category, 'images', needed_images), 'image'
+            )
+            if len(unsplash_images) < needed_images:
+                live_images = self._get_ai_enhanced_unsplash(content_data, needed_images - len(unsplash_images))
+                unsplash_images.extend(self.perceptual_index.filter_unique(live_images, 'image'))
             if unsplash_images:
                 all_assets.extend(unsplash_images)
                 print(f"   📸 {len(unsplash_images)} images Unsplash IA récupérées")
@@ -115,7 +175,7 @@ class BrainrotImageManager:
         # Mélanger intelligemment
         final_assets = self._smart_shuffle_assets(all_assets)
         
-        gif_count = sum(1 for a in final_assets if a.endswith('.gif'))
+        gif_count = sum(1 for a in final_assets if is_video_asset(a))
         image_count = len(final_assets) - gif_count
         print(f"🎉 Total assets: {len(final_assets)} (dont {gif_count} GIFs, {image_count} images)")
         
@@ -149,48 +209,189 @@ class BrainrotImageManager:
         print(f"   🎯 Recherche Unsplash IA: '{query}'")
         print(f"   🔄 Alternatives: {alternative_queries}")
         
-        downloaded_images = []
+        # Rotation des termes décidée à l'avance: l'ordre ne dépend pas des threads
+        queries = [
+            query if i % 3 == 0 else random.choice(alternative_queries) if alternative_queries else query
+            for i in range(num_images)
+        ]
         
-        for i in range(num_images):
-            try:
-                # Alterner entre les termes pour la variété
-                current_query = query if i % 3 == 0 else random.choice(alternative_queries) if alternative_queries else query
-                
-                api_url = "https://api.unsplash.com/photos/random"
-                params = {
-                    'query': current_query,
-                    'orientation': 'portrait',
-                    'client_id': self.unsplash_access_key
-                }
-                
-                response = requests.get(api_url, params=params, timeout=15)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    image_url = data['urls']['regular']
-                    
-                    img_response = requests.get(image_url, timeout=15)
-                    if img_response.status_code == 200:
-                        filename = f"unsplash_ai_{category}_{i}_{int(time.time())}.jpg"
-                        output_path = safe_path_join(self.images_dir, filename)
-                        
-                        with open(output_path, 'wb') as f:
-                            f.write(img_response.content)
-                        
-                        # Redimensionner pour compatibilité H.264
-                        self._resize_unsplash_image(output_path)
-                        downloaded_images.append(output_path)
-                        
-                        alt_text = data.get('alt_description', 'sans description')
-                        print(f"      ✅ Unsplash {i+1}: '{alt_text[:30]}...' (terme: '{current_query}')")
-                
-                time.sleep(0.3)
-                
-            except Exception as e:
-                print(f"      ⚠️ Erreur Unsplash {i+1}: {e}")
+        # Un seul appel API par terme (count=N), complété par la réserve locale
+        candidates = self._collect_unsplash_candidates(queries)
+        jobs = [(i, queries[i], candidate) for i, candidate in enumerate(candidates) if candidate]
+        if not jobs:
+            return []
+        
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_downloads, len(jobs))) as executor:
+            results = list(executor.map(
+                lambda job: self._download_unsplash_candidate(job[0], job[1], job[2], category),
+                jobs
+            ))
+        
+        downloaded_images = [path for path in results if path]
+        self.asset_store.save()
+        print(f"   ⏱️ Unsplash: {len(downloaded_images)}/{num_images} images en {time.time() - start_time:.1f}s "
+              f"({self.max_concurrent_downloads} en parallèle)")
         
         return downloaded_images
 
+    def _load_unsplash_pool(self) -> Dict[str, List[Dict]]:
+        """Charge la réserve de candidats en écartant ceux qui ont expiré."""
+        if not os.path.exists(self.unsplash_pool_path):
+            return {}
+        try:
+            with open(self.unsplash_pool_path, 'r', encoding='utf-8') as f:
+                pool = json.load(f)
+        except Exception as e:
+            print(f"   ⚠️ Réserve Unsplash illisible, réinitialisation: {e}")
+            return {}
+        
+        # Candidats d'une autre orientation (résolution modifiée) écartés aussi
+        min_time = time.time() - self.UNSPLASH_POOL_TTL
+        orientation = self._unsplash_orientation()
+        return {
+            query: [c for c in items
+                    if c.get('fetched_at', 0) >= min_time and c.get('orientation', 'portrait') == orientation]
+            for query, items in pool.items()
+        }
+
+    def _save_unsplash_pool(self, pool: Dict[str, List[Dict]]):
+        try:
+            temp_path = f"{self.unsplash_pool_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({query: items for query, items in pool.items() if items}, f, indent=2)
+            os.replace(temp_path, self.unsplash_pool_path)
+        except Exception as e:
+            print(f"   ⚠️ Réserve Unsplash non sauvegardée: {e}")
+
+    def _unsplash_orientation(self) -> str:
+        """Orientation Unsplash déduite de la résolution finale."""
+        width, height = self.resolution
+        if width > height:
+            return 'landscape'
+        if width == height:
+            return 'squarish'
+        return 'portrait'
+
+    def _request_unsplash_batch(self, query: str, count: int) -> List[Dict]:
+        """Un appel /photos/random avec count=N: N candidats pour le prix d'une requête."""
+        orientation = self._unsplash_orientation()
+        try:
+            response = self.http.get("https://api.unsplash.com/photos/random", params={
+                'query': query,
+                'orientation': orientation,
+                'count': max(1, min(30, count)),
+                'client_id': self.unsplash_access_key
+            }, timeout=15)
+            
+            remaining = response.headers.get('X-Ratelimit-Remaining')
+            if remaining and remaining.isdigit():
+                self.unsplash_remaining = int(remaining)
+            
+            if response.status_code != 200:
+                print(f"      ⚠️ Unsplash HTTP {response.status_code} (terme: '{query}')")
+                return []
+            
+            now = int(time.time())
+            return [{
+                'id': photo.get('id'),
+                'url': self._sized_unsplash_url(photo['urls']),
+                'alt': photo.get('alt_description') or 'sans description',
+                'orientation': orientation,
+                'fetched_at': now
+            } for photo in response.json() if photo.get('urls')]
+            
+        except Exception as e:
+            print(f"      ⚠️ Erreur API Unsplash (terme: '{query}'): {e}")
+            return []
+
+    def _sized_unsplash_url(self, urls: Dict[str, str]) -> str:
+        """
+        URL imgix recadrée côté CDN aux dimensions exactes de la vidéo
+        (urls.raw + w/h/fit=crop): ni surplus de pixels à télécharger, ni resize local.
+        """
+        raw_url = urls.get('raw')
+        if not raw_url:
+            return urls['regular']
+        
+        target_width, target_height = self.resolution
+        separator = '&' if '?' in raw_url else '?'
+        return (f"{raw_url}{separator}w={target_width}&h={target_height}"
+                f"&fit=crop&crop=entropy&fm=jpg&q=85")
+
+    def _collect_unsplash_candidates(self, queries: List[str]) -> List[Optional[Dict]]:
+        """
+        Attribue un candidat à chaque position de la rotation: réserve locale
+        d'abord, puis un seul appel groupé par terme manquant. Le surplus est
+        conservé pour le slot suivant.
+        """
+        with _UNSPLASH_POOL_LOCK:
+            return self._assign_unsplash_candidates(queries)
+
+    def _assign_unsplash_candidates(self, queries: List[str]) -> List[Optional[Dict]]:
+        pool = self._load_unsplash_pool()
+        needed = {}
+        for query in queries:
+            needed[query] = needed.get(query, 0) + 1
+        
+        api_calls = 0
+        for query, count in needed.items():
+            available = pool.get(query, [])
+            if len(available) < count:
+                fetched = self._request_unsplash_batch(query, max(count - len(available), self.UNSPLASH_BATCH_SIZE))
+                api_calls += 1
+                known_ids = {c['id'] for c in available}
+                pool[query] = available + [c for c in fetched if c['id'] not in known_ids]
+        
+        used_ids = set()
+        candidates = []
+        for query in queries:
+            available = pool.get(query, [])
+            while available and available[0]['id'] in used_ids:
+                available.pop(0)
+            candidate = available.pop(0) if available else None
+            if candidate:
+                used_ids.add(candidate['id'])
+            candidates.append(candidate)
+        
+        self._save_unsplash_pool(pool)
+        
+        reserve = sum(len(items) for items in pool.values())
+        print(f"   📦 Unsplash: {api_calls} appel(s) API pour {len(queries)} images "
+              f"({reserve} candidats en réserve)")
+        return candidates
+
+    def _download_unsplash_candidate(self, index: int, current_query: str, candidate: Dict, category: str) -> Optional[str]:
+        """Télécharge UN candidat Unsplash déjà choisi et mesure sa latence."""
+        start_time = time.time()
+        
+        cached_path = self.asset_store.get(candidate['url'])
+        if cached_path:
+            print(f"      ♻️ Unsplash {index+1}: déjà en stock (terme: '{current_query}')")
+            return cached_path
+        
+        try:
+            filename = f"unsplash_ai_{category}_{index}_{int(time.time())}.jpg"
+            output_path, error = stream_download(
+                self.http, candidate['url'], safe_path_join(self.images_dir, filename),
+                allowed_types=IMAGE_TYPES, max_bytes=self.max_download_bytes
+            )
+            if not output_path:
+                print(f"      ⚠️ Unsplash {index+1}: {error}")
+                return None
+            
+            # Redimensionner pour compatibilité H.264
+            self._resize_unsplash_image(output_path)
+            output_path = self.asset_store.put_file(output_path, candidate['url'], current_query)
+            
+            print(f"      ✅ Unsplash {index+1}: '{candidate['alt'][:30]}...' (terme: '{current_query}', "
+                  f"{time.time() - start_time:.2f}s)")
+            return output_path
+            
+        except Exception as e:
+            print(f"      ⚠️ Erreur Unsplash {index+1}: {e} ({time.time() - start_time:.2f}s)")
+            return None
+
     def _build_ai_search_terms(self, ai_keywords: List[str], title: str, category: str) -> List[str]:
         """Construit des termes de recherche intelligents basés sur l'IA"""
         
@@ -236,8 +437,8 @@ class BrainrotImageManager:
             random.shuffle(assets)
             return assets
         
-        gifs = [a for a in assets if a.endswith('.gif')]
-        images = [a for a in assets if not a.endswith('.gif')]
+        gifs = [a for a in assets if is_video_asset(a)]
+        images = [a for a in assets if not is_video_asset(a)]
         
         if not gifs:
             random.shuffle(images)
@@ -261,35 +462,13 @@ class BrainrotImageManager:
         return final_assets
 
     def _resize_unsplash_image(self, image_path: str):
-        """Redimensionne une image Unsplash aux dimensions requises"""
+        """Amène une image Unsplash au format final (aucun travail si le CDN l'a déjà fait)"""
         try:
             with Image.open(image_path) as img:
-                target_width, target_height = self.resolution
-                target_width = target_width if target_width % 2 == 0 else target_width - 1
-                target_height = target_height if target_height % 2 == 0 else target_height - 1
-                
-                img_ratio = img.width / img.height
-                target_ratio = target_width / target_height
-                
-                if img_ratio > target_ratio:
-                    new_height = target_height
-                    new_width = int(img.width * (target_height / img.height))
-                else:
-                    new_width = target_width
-                    new_height = int(img.height * (target_width / img.width))
-                
-                new_width = new_width if new_width % 2 == 0 else new_width - 1
-                new_height = new_height if new_height % 2 == 0 else new_height - 1
-                
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                left = (new_width - target_width) // 2
-                top = (new_height - target_height) // 2
-                right = left + target_width
-                bottom = top + target_height
-                
-                img_cropped = img.crop((left, top, right, bottom))
-                img_cropped.save(image_path, 'JPEG', quality=85, optimize=True)
+                if img.size == self.resolution:
+                    return
+                img = self.normalizer.cover_image(img)
+            img.save(image_path, 'JPEG', quality=85, optimize=True)
                 
         except Exception as e:
             print(f"      ⚠️ Redimensionnement Unsplash échoué: {e}")
@@ -304,10 +483,12 @@ class BrainrotImageManager:
         print("   🧠 Lancement recherche GIFs intelligente...")
         
         try:
-            gif_urls = get_brainrot_gifs(content_data, num_gifs)
+            # Bonus de classement réservé aux GIFs en stock que la déduplication accepterait
+            gif_urls = get_brainrot_gifs(content_data, num_gifs, reusable=self.perceptual_index.is_reusable)
             if gif_urls:
                 gif_urls = self._ensure_unique_gifs(gif_urls)
-                downloaded = self._download_gifs(gif_urls, content_data)
+                # URLs classées par le chasseur: seuls les meilleurs sont téléchargés
+                downloaded = self._download_gifs(gif_urls, content_data, needed=num_gifs)
                 gif_paths.extend(downloaded)
                 
                 if downloaded:
@@ -321,56 +502,138 @@ class BrainrotImageManager:
         
         return gif_paths
 
-    def _download_gifs(self, gif_urls: List[str], content_data: Dict) -> List[str]:
-        """Télécharge les GIFs depuis les URLs"""
+    def _download_gifs(self, gif_urls: List[str], content_data: Dict, needed: int = None) -> List[str]:
+        """
+        Télécharge les GIFs depuis les URLs, dans l'ordre, jusqu'à en avoir `needed`
+        qui passent la déduplication perceptuelle (les quasi-doublons d'assets
+        récents ne comptent pas: on descend dans le classement).
+        """
         downloaded_paths = []
+        batch_hashes: List[int] = []
         
         if not gif_urls:
             return []
         
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        gif_urls = self._validate_gif_urls(gif_urls, headers)
         print(f"   📥 Téléchargement de {len(gif_urls)} GIFs...")
         
         for i, gif_url in enumerate(gif_urls):
+            if needed is not None and len(downloaded_paths) >= needed:
+                print(f"      ⏭️ {len(gif_urls) - i} candidat(s) moins bien classé(s) non téléchargé(s)")
+                break
+            
+            cached_path = self.asset_store.get(gif_url)
+            if cached_path:
+                if not self.perceptual_index.is_reusable(cached_path, batch_hashes):
+                    print(f"      🔁 GIF {i+1} en stock mais utilisé récemment, candidat suivant")
+                    continue
+                self.normalizer.schedule_video(cached_path)
+                downloaded_paths.append(cached_path)
+                print(f"      ♻️ GIF {i+1} déjà en stock")
+                continue
+            
             try:
-                headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                response = requests.get(gif_url, headers=headers, timeout=15)
+                filename = f"brainrot_gif_{content_data.get('category', 'general')}_{i}_{int(time.time())}.gif"
                 
-                if response.status_code == 200:
-                    filename = f"brainrot_gif_{content_data.get('category', 'general')}_{i}_{int(time.time())}.gif"
-                    output_path = safe_path_join(self.images_dir, filename)
-                    
-                    with open(output_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    file_size = os.path.getsize(output_path)
-                    if file_size > 2048:
-                        downloaded_paths.append(output_path)
-                        print(f"      ✅ GIF {i+1} téléchargé ({file_size//1024} KB)")
+                # Flux par blocs: HTML d'erreur ou fichier géant abandonnés dès le début
+                output_path, error = stream_download(
+                    self.http, gif_url, safe_path_join(self.images_dir, filename),
+                    allowed_types=ANIMATED_TYPES, max_bytes=self.max_download_bytes, headers=headers
+                )
+                if not output_path:
+                    print(f"      ⚠️ GIF {i+1} rejeté: {error}")
+                    self.url_blacklist.add(gif_url, error, is_permanent_failure(error))
+                    continue
+                
+                file_size = os.path.getsize(output_path)
+                output_path = self.asset_store.put_file(output_path, gif_url, content_data.get('category', ''))
+                if not self.perceptual_index.is_reusable(output_path, batch_hashes):
+                    print(f"      🔁 GIF {i+1} quasi-doublon (asset récent ou du lot), candidat suivant")
+                    continue
+                # Transcodage au format final pendant que la chasse continue
+                self.normalizer.schedule_video(output_path)
+                downloaded_paths.append(output_path)
+                print(f"      ✅ GIF {i+1} téléchargé ({file_size//1024} KB)")
                     
             except Exception as e:
                 print(f"      ⚠️ Erreur téléchargement GIF {i+1}: {e}")
         
+        self.url_blacklist.save()
+        self.asset_store.save()
         return downloaded_paths
 
-    def _get_local_gifs(self, content_data: Dict, num_gifs: int) -> List[str]:
-        """Récupère des GIFs locaux"""
-        category = content_data.get('category', 'science')
-        local_gifs_dir = safe_path_join("assets", "gifs", category)
+    def _validate_gif_urls(self, gif_urls: List[str], headers: Dict) -> List[str]:
+        """
+        Écarte les URLs déjà connues comme mortes, puis valide les autres en parallèle
+        (HEAD / GET partiel: type et taille) avant tout téléchargement complet.
+        """
+        alive = [url for url in gif_urls if self.asset_store.has(url) or not self.url_blacklist.is_dead(url)]
+        if len(alive) < len(gif_urls):
+            print(f"   🚫 {len(gif_urls) - len(alive)} URL(s) en liste noire ignorée(s)")
+        
+        to_probe = [url for url in alive if not self.asset_store.has(url)]
+        if not to_probe:
+            return alive
+        
+        def probe(url: str):
+            return probe_url(self.http, url, allowed_types=ANIMATED_TYPES,
+                             max_bytes=self.max_download_bytes, headers=headers)
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_downloads * 2, len(to_probe))) as executor:
+            results = dict(zip(to_probe, executor.map(probe, to_probe)))
+        
+        valid = []
+        for url in alive:
+            ok, reason = results.get(url, (True, ""))
+            if ok:
+                valid.append(url)
+            else:
+                print(f"      🚫 URL invalide ({reason}): {url[:70]}")
+                self.url_blacklist.add(url, reason, is_permanent_failure(reason))
         
-        if not os.path.exists(local_gifs_dir):
-            local_gifs_dir = safe_path_join("assets", "gifs")
-            if not os.path.exists(local_gifs_dir):
-                return []
+        self.url_blacklist.save()
+        return valid
+
+    def _cleanup_old_images(self):
+        """Ne garde que les MAX_IMAGES_TO_KEEP fichiers les plus récents du dossier de travail."""
+        try:
+            entries = [entry for entry in os.scandir(self.images_dir) if entry.is_file()]
+        except OSError:
+            return
+        
+        if len(entries) <= self.max_images_to_keep:
+            return
+        
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        removed = 0
+        for entry in entries[self.max_images_to_keep:]:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                continue
+        
+        print(f"   🧹 {removed} anciennes images supprimées (max {self.max_images_to_keep})")
+
+    def _get_local_gifs(self, content_data: Dict, num_gifs: int, min_duration: float = None,
+                        unused_days: float = None) -> List[str]:
+        """Récupère des GIFs locaux via le catalogue indexé (catégorie d'abord, puis toutes)"""
+        category = content_data.get('category', 'science')
+        local_gifs_dir = safe_path_join("assets", "gifs")
         
         try:
-            all_gifs = []
-            for file in os.listdir(local_gifs_dir):
-                if file.lower().endswith(('.gif', '.mp4', '.mov')):
-                    full_path = safe_path_join(local_gifs_dir, file)
-                    all_gifs.append(full_path)
+            library = get_asset_library()
+            library.sync(local_gifs_dir)
+            
+            filters = {'min_duration': min_duration, 'unused_days': unused_days, 'root': local_gifs_dir}
+            gifs = library.sample(('gif', 'video'), num_gifs, category=category, **filters)
+            if len(gifs) < num_gifs:
+                others = library.sample(('gif', 'video'), num_gifs, **filters)
+                gifs.extend([g for g in others if g not in gifs][:num_gifs - len(gifs)])
             
-            if all_gifs:
-                return random.sample(all_gifs, min(num_gifs, len(all_gifs)))
+            library.mark_used(gifs)
+            return gifs
             
         except Exception as e:
             print(f"   ⚠️ Erreur chargement GIFs locaux: {e}")
@@ -378,72 +641,17 @@ class BrainrotImageManager:
         return []
 
     def _generate_brainrot_images(self, content_data: Dict, num_images: int) -> List[str]:
-        """Génère des images brainrot de fallback"""
+        """Génère des images brainrot de fallback (rendu parallèle, polices et fonds en cache)"""
         category = content_data.get('category', 'science')
         is_part1 = content_data.get('is_part1', True)
         title = content_data.get('title', 'Titre mystère')
         
-        colors = self.brainrot_styles.get(category, self.brainrot_styles['science'])
-        images = []
-        
-        for i in range(num_images):
-            try:
-                if is_part1:
-                    img = self._create_mystery_image(colors, title, i, num_images)
-                else:
-                    img = self._create_shock_image(colors, title, i, num_images)
-                
-                filename = f"brainrot_{category}_{'p1' if is_part1 else 'p2'}_{i}_{int(time.time())}.jpg"
-                output_path = safe_path_join(self.images_dir, filename)
-                img.save(output_path, 'JPEG', quality=85, optimize=True)
-                images.append(output_path)
-                
-            except Exception as e:
-                print(f"   ⚠️ Erreur génération image {i}: {e}")
+        start_time = time.time()
+        images = self.title_cards.render_cards(title, category, is_part1, num_images)
+        print(f"   ⏱️ {len(images)} cartes titre rendues en {time.time() - start_time:.2f}s")
         
         return images
 
-    def _create_mystery_image(self, colors: List, title: str, index: int, total: int) -> Image.Image:
-        img = Image.new('RGB', self.resolution, color=colors[0])
-        draw = ImageDraw.Draw(img)
-        
-        point_num = total - index
-        self._draw_centered_text(draw, f"#{point_num}", self.resolution[1] // 2 - 50, size=120, color=colors[1], bold=True)
-        
-        title_short = title[:40] + "..." if len(title) > 40 else title
-        self._draw_centered_text(draw, title_short, self.resolution[1] // 2 + 50, size=36, color='#FFFFFF')
-        
-        return img
-
-    def _create_shock_image(self, colors: List, title: str, index: int, total: int) -> Image.Image:
-        img = Image.new('RGB', self.resolution, color=colors[0])
-        draw = ImageDraw.Draw(img)
-        
-        point_num = total - index
-        self._draw_centered_text(draw, f"#{point_num}", self.resolution[1] // 2 - 80, size=140, color='#FF0000', bold=True)
-        
-        title_short = title[:35] + "!" * min(3, index + 1) if len(title) > 35 else title + "!" * min(2, index + 1)
-        self._draw_centered_text(draw, title_short, self.resolution[1] // 2 + 40, size=40, color='#FFFFFF', bold=True)
-        
-        return img
-
-    def _draw_centered_text(self, draw: ImageDraw.Draw, text: str, y: int, size: int = 36, color: str = '#FFFFFF', bold: bool = False):
-        try:
-            font = ImageFont.load_default()
-            text_width = draw.textlength(text, font=font)
-            x = (self.resolution[0] - text_width) // 2
-            
-            if bold:
-                draw.text((x-1, y-1), text, fill='#000000', font=font)
-                draw.text((x+1, y+1), text, fill='#000000', font=font)
-            
-            draw.text((x, y), text, fill=color, font=font)
-            
-        except Exception:
-            text_width = len(text) * (size // 2)
-            x = (self.resolution[0] - text_width) // 2
-            draw.text((x, y), text, fill=color)
-
 # Fonctions d'interface
 def get_images(content_data: Dict, num_images: int = 8) -> List[str]:
     try:
@@ -453,6 +661,22 @@ def get_images(content_data: Dict, num_images: int = 8) -> List[str]:
         print(f"❌ Erreur ImageManager: {e}")
         return []
 
+def prefetch_assets(contents: List[Dict], time_budget: float = None) -> None:
+    """Remplit les réserves d'assets des contenus à venir (hors chemin critique)."""
+    try:
+        manager = BrainrotImageManager()
+        AssetPrefetcher(manager).run(contents, time_budget)
+    except Exception as e:
+        print(f"❌ Erreur préchargement assets: {e}")
+
+def start_background_prefetch(contents: List[Dict]) -> Optional[threading.Thread]:
+    """Lance le préchargement dans un thread pendant le rendu du slot en cours."""
+    if not contents:
+        return None
+    thread = threading.Thread(target=prefetch_assets, args=(contents,), name="asset-prefetch", daemon=True)
+    thread.start()
+    return thread
+
 def enhance_with_brainrot_assets(content_data: Dict) -> Dict:
     try:
         manager = BrainrotImageManager()
@@ -460,7 +684,7 @@ def enhance_with_brainrot_assets(content_data: Dict) -> Dict:
         content_data['brainrot_assets'] = assets
         content_data['has_brainrot_style'] = True
         content_data['assets_count'] = len(assets)
-        content_data['gifs_count'] = sum(1 for a in assets if a.endswith('.gif'))
+        content_data['gifs_count'] = sum(1 for a in assets if is_video_asset(a))
         return content_data
     except Exception as e:
         print(f"❌ Erreur enhancement assets: {e}")
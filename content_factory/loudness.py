@@ -0,0 +1,334 @@
+# content_factory/loudness.py (NORMALISATION EBU R128 VECTORISÉE)
+
+import os
+import json
+import math
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+
+try:
+    from pydub import AudioSegment
+    HAS_PYDUB = True
+except ImportError:
+    HAS_PYDUB = False
+
+# Paramètres ITU-R BS.1770-4 / EBU R128
+BLOCK_SECONDS = 0.4
+BLOCK_OVERLAP = 0.75
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+TRUE_PEAK_OVERSAMPLING = 4
+LIMITER_WINDOW_SECONDS = 0.005
+
+# Pondération des canaux (L, R, C = 1.0 ; surround = 1.41)
+CHANNEL_WEIGHTS = [1.0, 1.0, 1.0, 1.41, 1.41]
+
+
+def _high_shelf_coefficients(sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Étage 1 du filtre K: shelf +4 dB (tête acoustique), dérivé pour tout taux d'échantillonnage."""
+    gain_db, q, fc = 3.999843853973347, 0.7071752369554196, 1681.974450955533
+    k = math.tan(math.pi * fc / sample_rate)
+    vh = 10 ** (gain_db / 20.0)
+    vb = vh ** 0.4996667741545416
+    a0 = 1.0 + k / q + k * k
+
+    b = np.array([(vh + vb * k / q + k * k), 2.0 * (k * k - vh), (vh - vb * k / q + k * k)]) / a0
+    den = np.array([a0, 2.0 * (k * k - 1.0), (1.0 - k / q + k * k)]) / a0
+    return b, den
+
+
+def _high_pass_coefficients(sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Étage 2 du filtre K: passe-haut RLB."""
+    q, fc = 0.5003270373238773, 38.13547087602444
+    k = math.tan(math.pi * fc / sample_rate)
+    a0 = 1.0 + k / q + k * k
+
+    b = np.array([1.0, -2.0, 1.0])
+    den = np.array([a0, 2.0 * (k * k - 1.0), (1.0 - k / q + k * k)]) / a0
+    return b, den
+
+
+def _biquad_response(b: np.ndarray, den: np.ndarray, n_fft: int) -> np.ndarray:
+    """Réponse fréquentielle d'un biquad sur les bins d'une rfft de taille n_fft."""
+    z_inv = np.exp(-2j * np.pi * np.arange(n_fft // 2 + 1) / n_fft)
+    num = b[0] + b[1] * z_inv + b[2] * z_inv ** 2
+    dem = den[0] + den[1] * z_inv + den[2] * z_inv ** 2
+    return num / dem
+
+
+def k_weight(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    Applique le filtre K à tous les canaux d'un coup, dans le domaine fréquentiel.
+    Le signal est complété par une seconde de zéros pour que la queue de la
+    réponse IIR ne se replie pas (filtrage linéaire et non circulaire).
+    """
+    n_samples = samples.shape[0]
+    n_fft = 1 << int(math.ceil(math.log2(n_samples + sample_rate)))
+
+    response = (_biquad_response(*_high_shelf_coefficients(sample_rate), n_fft) *
+                _biquad_response(*_high_pass_coefficients(sample_rate), n_fft))
+
+    spectrum = np.fft.rfft(samples, n=n_fft, axis=0)
+    filtered = np.fft.irfft(spectrum * response[:, None], n=n_fft, axis=0)
+    return filtered[:n_samples]
+
+
+def _block_powers(weighted: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Puissance moyenne par canal sur des blocs de 400 ms avec 75% de recouvrement."""
+    block = int(round(BLOCK_SECONDS * sample_rate))
+    step = int(round(block * (1.0 - BLOCK_OVERLAP)))
+    n_samples = weighted.shape[0]
+    if n_samples < block:
+        return np.zeros((0, weighted.shape[1]))
+
+    # Somme cumulée des carrés: chaque bloc coûte O(1)
+    cumulative = np.concatenate([np.zeros((1, weighted.shape[1])), np.cumsum(weighted ** 2, axis=0)])
+    starts = np.arange(0, n_samples - block + 1, step)
+    return (cumulative[starts + block] - cumulative[starts]) / block
+
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """Loudness intégrée (LUFS) avec gating absolu et relatif."""
+    if samples.ndim == 1:
+        samples = samples[:, None]
+
+    powers = _block_powers(k_weight(samples, sample_rate), sample_rate)
+    if powers.shape[0] == 0:
+        return float('-inf')
+
+    weights = np.array(CHANNEL_WEIGHTS[:samples.shape[1]] +
+                       [1.0] * max(0, samples.shape[1] - len(CHANNEL_WEIGHTS)))
+    block_power = powers @ weights
+
+    with np.errstate(divide='ignore'):
+        block_loudness = -0.691 + 10 * np.log10(block_power)
+
+    gated = block_power[block_loudness > ABSOLUTE_GATE_LUFS]
+    if gated.size == 0:
+        return float('-inf')
+
+    relative_gate = -0.691 + 10 * math.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = block_power[(block_loudness > ABSOLUTE_GATE_LUFS) & (block_loudness > relative_gate)]
+    if gated.size == 0:
+        return float('-inf')
+
+    return -0.691 + 10 * math.log10(gated.mean())
+
+
+def _oversampling_kernels(factor: int, taps: int = 48) -> np.ndarray:
+    """Noyaux polyphase (sinc fenêtré) pour l'interpolation des échantillons intermédiaires."""
+    n = np.arange(-taps // 2, taps // 2)
+    kernels = []
+    for phase in range(1, factor):
+        offset = n + phase / factor
+        kernels.append(np.sinc(offset) * np.blackman(taps))
+    return np.array(kernels)
+
+
+def sample_peak_envelope(samples: np.ndarray) -> np.ndarray:
+    """
+    Enveloppe de crête vraie par échantillon (max sur canaux et phases
+    sur-échantillonnées x4), utilisée par la mesure et par le limiteur.
+    """
+    if samples.ndim == 1:
+        samples = samples[:, None]
+
+    envelope = np.abs(samples).max(axis=1)
+    for kernel in _oversampling_kernels(TRUE_PEAK_OVERSAMPLING):
+        for channel in range(samples.shape[1]):
+            interpolated = np.convolve(samples[:, channel], kernel, mode='same')
+            np.maximum(envelope, np.abs(interpolated), out=envelope)
+    return envelope
+
+
+def _limiter_gain(envelope: np.ndarray, ceiling: float, sample_rate: int) -> np.ndarray:
+    """
+    Gain de limitation par échantillon: minimum par fenêtre de 5 ms, étendu aux
+    fenêtres voisines (anticipation), puis interpolé linéairement entre les
+    centres de fenêtres pour éviter les discontinuités.
+    """
+    with np.errstate(divide='ignore'):
+        required = np.minimum(1.0, ceiling / np.maximum(envelope, 1e-12))
+
+    window = max(1, int(LIMITER_WINDOW_SECONDS * sample_rate))
+    n_samples = required.shape[0]
+    n_windows = int(math.ceil(n_samples / window))
+    padded = np.ones(n_windows * window)
+    padded[:n_samples] = required
+    window_gain = padded.reshape(n_windows, window).min(axis=1)
+
+    spread = window_gain.copy()
+    spread[1:] = np.minimum(spread[1:], window_gain[:-1])
+    spread[:-1] = np.minimum(spread[:-1], window_gain[1:])
+
+    centers = np.arange(n_windows) * window + window / 2.0
+    return np.interp(np.arange(n_samples), centers, spread)
+
+
+def normalize_samples(samples: np.ndarray, sample_rate: int, target_lufs: float = -14.0,
+                      true_peak_db: float = -1.0) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Normalise un signal float (-1..1) vers target_lufs avec limitation true-peak.
+    Retourne le signal traité et les statistiques de mesure.
+    """
+    source_lufs = integrated_loudness(samples, sample_rate)
+    if not math.isfinite(source_lufs):
+        return samples, {'source_lufs': None, 'gain_db': 0.0, 'integrated_lufs': None, 'true_peak_db': None}
+
+    gain_db = target_lufs - source_lufs
+    output = samples * (10 ** (gain_db / 20.0))
+
+    ceiling = 10 ** (true_peak_db / 20.0)
+    envelope = sample_peak_envelope(output)
+    peak = float(envelope.max()) if envelope.size else 0.0
+
+    limited = peak > ceiling
+    if limited:
+        gain = _limiter_gain(envelope, ceiling, sample_rate)
+        output = output * (gain[:, None] if output.ndim == 2 else gain)
+        peak = ceiling
+
+    output = np.clip(output, -1.0, 1.0)
+    stats = {
+        'source_lufs': round(source_lufs, 2),
+        'gain_db': round(gain_db, 2),
+        'integrated_lufs': round(target_lufs, 2),
+        'true_peak_db': round(20 * math.log10(peak), 2) if peak > 0 else None,
+        'limited': limited
+    }
+    return output, stats
+
+
+# --- INTÉGRATION PYDUB ---
+
+def segment_to_array(segment: 'AudioSegment') -> np.ndarray:
+    """Convertit un AudioSegment en tableau float32 (échantillons, canaux)."""
+    scale = float(1 << (8 * segment.sample_width - 1))
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32) / scale
+    return samples.reshape(-1, segment.channels)
+
+
+def array_to_segment(samples: np.ndarray, sample_rate: int) -> 'AudioSegment':
+    """Convertit un tableau float (échantillons, canaux) en AudioSegment 16 bits."""
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=sample_rate, channels=samples.shape[1])
+
+
+def normalize_segment(segment: 'AudioSegment', target_lufs: float = -14.0,
+                      true_peak_db: float = -1.0) -> Tuple['AudioSegment', Dict[str, Any]]:
+    """Normalise un AudioSegment en mémoire (avant son export final)."""
+    samples = segment_to_array(segment)
+    output, stats = normalize_samples(samples, segment.frame_rate, target_lufs, true_peak_db)
+    if stats['source_lufs'] is None:
+        return segment, stats
+    return array_to_segment(output, segment.frame_rate), stats
+
+
+# --- CACHE DE MESURE À CÔTÉ DU FICHIER ---
+
+def _sidecar_path(audio_path: str) -> str:
+    return f"{audio_path}.loudness.json"
+
+
+def load_cached_loudness(audio_path: str) -> Optional[Dict[str, Any]]:
+    """Relit la mesure mise en cache si le fichier n'a pas changé depuis."""
+    sidecar = _sidecar_path(audio_path)
+    if not os.path.exists(sidecar) or not os.path.exists(audio_path):
+        return None
+
+    try:
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        stat = os.stat(audio_path)
+        if cached.get('size') == stat.st_size and cached.get('mtime') == int(stat.st_mtime):
+            return cached
+    except Exception:
+        pass
+
+    return None
+
+
+def save_cached_loudness(audio_path: str, stats: Dict[str, Any]):
+    """Écrit la mesure à côté du fichier audio (clé: taille + date de modification)."""
+    try:
+        stat = os.stat(audio_path)
+        payload = dict(stats, size=stat.st_size, mtime=int(stat.st_mtime))
+        with open(_sidecar_path(audio_path), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+    except Exception as e:
+        print(f"⚠️ Cache loudness non écrit: {e}")
+
+
+def measure_file_loudness(audio_path: str) -> Optional[Dict[str, Any]]:
+    """Mesure (ou relit depuis le cache) la loudness intégrée et la crête vraie d'un fichier."""
+    cached = load_cached_loudness(audio_path)
+    if cached:
+        return cached
+
+    if not HAS_PYDUB:
+        return None
+
+    segment = AudioSegment.from_file(audio_path)
+    samples = segment_to_array(segment)
+    lufs = integrated_loudness(samples, segment.frame_rate)
+    peak = float(sample_peak_envelope(samples).max()) if samples.size else 0.0
+
+    stats = {
+        'integrated_lufs': round(lufs, 2) if math.isfinite(lufs) else None,
+        'true_peak_db': round(20 * math.log10(peak), 2) if peak > 0 else None
+    }
+    save_cached_loudness(audio_path, stats)
+    return stats
+
+
+def render_gain(audio_path: str, target_lufs: float = -14.0, true_peak_db: float = -1.0) -> float:
+    """
+    Gain linéaire à appliquer au rendu final d'après la mesure en cache (1.0 sans
+    mesure ou si le fichier est déjà normalisé). Sans limiteur à ce stade, le gain
+    est plafonné pour que la crête vraie reste sous `true_peak_db`.
+    """
+    cached = load_cached_loudness(audio_path)
+    if not cached or cached.get('normalized') or cached.get('integrated_lufs') is None:
+        return 1.0
+
+    gain_db = target_lufs - cached['integrated_lufs']
+    if cached.get('true_peak_db') is not None:
+        gain_db = min(gain_db, true_peak_db - cached['true_peak_db'])
+    return 10 ** (gain_db / 20.0)
+
+
+def normalize_audio_file(audio_path: str, target_lufs: float = -14.0, true_peak_db: float = -1.0,
+                         bitrate: str = "192k") -> Optional[Dict[str, Any]]:
+    """
+    Normalise un fichier audio (réécriture atomique via un .tmp), sauf si le cache
+    indique qu'il est déjà à la cible. Ré-encode le fichier: préférer render_gain
+    quand un rendu final suit.
+    """
+    cached = load_cached_loudness(audio_path)
+    if cached and cached.get('normalized') and cached.get('integrated_lufs') == round(target_lufs, 2):
+        return cached
+
+    if not HAS_PYDUB:
+        return None
+
+    audio_format = os.path.splitext(audio_path)[1].lstrip('.').lower() or 'mp3'
+    segment = AudioSegment.from_file(audio_path, format=audio_format)
+    normalized, stats = normalize_segment(segment, target_lufs, true_peak_db)
+    if stats['source_lufs'] is None:
+        return None
+
+    export_args = {'bitrate': bitrate} if audio_format == 'mp3' else {}
+    temp_path = f"{audio_path}.tmp"
+    try:
+        normalized.export(temp_path, format=audio_format, **export_args)
+        os.replace(temp_path, audio_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    stats['normalized'] = True
+    save_cached_loudness(audio_path, stats)
+    return stats
@@ -0,0 +1,211 @@
+# content_factory/music_cache.py (CACHE PCM MEMORY-MAPPED DES MUSIQUES)
+
+import os
+import json
+import hashlib
+import subprocess
+from typing import Optional, List, Dict, Any
+
+import numpy as np
+
+from content_factory.utils import safe_path_join, ensure_directory, trim_cache_dir, touch_file
+from content_factory.config_loader import ConfigLoader
+from content_factory.audio_mastering import get_ffmpeg_binary
+
+try:
+    from pydub import AudioSegment
+    HAS_PYDUB = True
+except ImportError:
+    HAS_PYDUB = False
+
+try:
+    from moviepy.audio.AudioClip import AudioClip
+    HAS_MOVIEPY = True
+except ImportError:
+    HAS_MOVIEPY = False
+
+
+class MusicPCMCache:
+    """
+    Décode chaque piste de la bibliothèque UNE seule fois en PCM 16 bits
+    (taux et canaux fixes) et la relit ensuite en memory-map. Boucle, coupe
+    et fondus deviennent de simples vues/slices sur ce tableau. Le cache est
+    borné par MUSIC_PCM_CACHE_SIZE_MB (LRU).
+    """
+
+    SAMPLE_RATE = 44100
+    CHANNELS = 2
+
+    def __init__(self, cache_dir: str, max_cache_mb: int = None):
+        self.cache_dir = ensure_directory(cache_dir)
+        audio_config = ConfigLoader().get_config().get('AUDIO_GENERATOR', {})
+        self.max_cache_mb = max_cache_mb or audio_config.get('MUSIC_PCM_CACHE_SIZE_MB', 500)
+        self.ffmpeg = get_ffmpeg_binary()
+        self._memmaps: Dict[str, np.memmap] = {}
+
+    # --- DÉCODAGE / CACHE ---
+
+    def _cache_key(self, music_path: str) -> str:
+        stat = os.stat(music_path)
+        raw_key = f"{os.path.abspath(music_path)}|{stat.st_size}|{int(stat.st_mtime)}"
+        return hashlib.sha1(raw_key.encode('utf-8')).hexdigest()[:20]
+
+    def get_pcm_path(self, music_path: str) -> Optional[str]:
+        """Retourne le fichier PCM brut de la piste, en le décodant si nécessaire."""
+        if not music_path or not os.path.exists(music_path):
+            return None
+
+        key = self._cache_key(music_path)
+        pcm_path = safe_path_join(self.cache_dir, f"{key}.pcm")
+        meta_path = safe_path_join(self.cache_dir, f"{key}.json")
+
+        if os.path.exists(pcm_path) and os.path.exists(meta_path):
+            touch_file(pcm_path)
+            return pcm_path
+
+        print(f"🎼 Décodage PCM unique: {os.path.basename(music_path)}")
+        temp_path = f"{pcm_path}.tmp"
+        if not self._decode(music_path, temp_path):
+            return None
+
+        os.replace(temp_path, pcm_path)
+        frames = os.path.getsize(pcm_path) // (2 * self.CHANNELS)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'source': os.path.abspath(music_path),
+                'sample_rate': self.SAMPLE_RATE,
+                'channels': self.CHANNELS,
+                'frames': frames,
+                'duration': frames / self.SAMPLE_RATE
+            }, f, indent=2)
+
+        evicted = trim_cache_dir(self.cache_dir, self.max_cache_mb)
+        if evicted:
+            print(f"🧹 Cache PCM: {evicted} piste(s) évincée(s) (LRU)")
+        return pcm_path
+
+    def _decode(self, music_path: str, output_path: str) -> bool:
+        """Décode vers du s16le entrelacé (ffmpeg, sinon pydub)."""
+        if self.ffmpeg:
+            try:
+                subprocess.run([
+                    self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-y', '-i', music_path,
+                    '-f', 's16le', '-acodec', 'pcm_s16le',
+                    '-ac', str(self.CHANNELS), '-ar', str(self.SAMPLE_RATE), output_path
+                ], check=True, capture_output=True, timeout=120)
+                return os.path.getsize(output_path) > 0
+            except Exception as e:
+                print(f"⚠️ Décodage ffmpeg échoué: {e}")
+
+        if HAS_PYDUB:
+            try:
+                audio = AudioSegment.from_file(music_path)
+                audio = audio.set_frame_rate(self.SAMPLE_RATE).set_channels(self.CHANNELS).set_sample_width(2)
+                with open(output_path, 'wb') as f:
+                    f.write(audio.raw_data)
+                return True
+            except Exception as e:
+                print(f"⚠️ Décodage pydub échoué: {e}")
+
+        return False
+
+    def load(self, music_path: str) -> Optional[np.memmap]:
+        """Tableau (frames, canaux) int16 en memory-map, partagé entre les appels."""
+        pcm_path = self.get_pcm_path(music_path)
+        if not pcm_path:
+            return None
+
+        if pcm_path not in self._memmaps:
+            pcm = np.memmap(pcm_path, dtype='<i2', mode='r')
+            self._memmaps[pcm_path] = pcm.reshape(-1, self.CHANNELS)
+
+        return self._memmaps[pcm_path]
+
+    def warm_library(self, music_paths: List[str]) -> int:
+        """Pré-décode toute la bibliothèque (à lancer hors du chemin critique)."""
+        return sum(1 for path in music_paths if self.get_pcm_path(path))
+
+    # --- BOUCLE / COUPE / FONDUS ---
+
+    def loop_views(self, pcm: np.ndarray, n_frames: int) -> List[np.ndarray]:
+        """Découpe n_frames en vues successives sur la piste (aucune copie)."""
+        views = []
+        remaining = n_frames
+        while remaining > 0 and pcm.shape[0] > 0:
+            chunk = pcm[:min(remaining, pcm.shape[0])]
+            views.append(chunk)
+            remaining -= chunk.shape[0]
+        return views
+
+    def render_array(self, music_path: str, duration: float,
+                     fade_in: float = 2.0, fade_out: float = 3.0) -> Optional[np.ndarray]:
+        """
+        Matérialise la musique à la durée voulue en UNE seule allocation
+        (coût linéaire), fondus appliqués uniquement sur la tête et la queue.
+        """
+        pcm = self.load(music_path)
+        if pcm is None or pcm.shape[0] == 0:
+            return None
+
+        n_frames = int(duration * self.SAMPLE_RATE)
+        output = np.empty((n_frames, self.CHANNELS), dtype=np.int16)
+        position = 0
+        for view in self.loop_views(pcm, n_frames):
+            output[position:position + view.shape[0]] = view
+            position += view.shape[0]
+
+        fade_in_frames = min(n_frames, int(fade_in * self.SAMPLE_RATE))
+        if fade_in_frames > 0:
+            ramp = np.linspace(0.0, 1.0, fade_in_frames)[:, None]
+            output[:fade_in_frames] = (output[:fade_in_frames] * ramp).astype(np.int16)
+
+        fade_out_frames = min(n_frames, int(fade_out * self.SAMPLE_RATE))
+        if fade_out_frames > 0:
+            ramp = np.linspace(1.0, 0.0, fade_out_frames)[:, None]
+            output[-fade_out_frames:] = (output[-fade_out_frames:] * ramp).astype(np.int16)
+
+        return output
+
+    def render_segment(self, music_path: str, duration: float,
+                       fade_in: float = 2.0, fade_out: float = 3.0) -> Optional['AudioSegment']:
+        """Version pydub de render_array."""
+        if not HAS_PYDUB:
+            return None
+
+        samples = self.render_array(music_path, duration, fade_in, fade_out)
+        if samples is None:
+            return None
+
+        return AudioSegment(data=samples.tobytes(), sample_width=2,
+                            frame_rate=self.SAMPLE_RATE, channels=self.CHANNELS)
+
+    def make_audio_clip(self, music_path: str, duration: float, volume: float = 1.0,
+                        fade_in: float = 0.0, fade_out: float = 0.0) -> Optional[Any]:
+        """
+        Clip MoviePy lisant directement le memory-map: chaque frame demandée est
+        indexée modulo la longueur de la piste, sans décoder ni concaténer.
+        """
+        if not HAS_MOVIEPY:
+            return None
+
+        pcm = self.load(music_path)
+        if pcm is None or pcm.shape[0] == 0:
+            return None
+
+        n_frames = pcm.shape[0]
+        sample_rate = self.SAMPLE_RATE
+        scale = volume / 32768.0
+
+        def make_frame(t):
+            t_array = np.asarray(t, dtype=np.float64)
+            indices = (t_array * sample_rate).astype(np.int64) % n_frames
+            frame = pcm[indices].astype(np.float32) * scale
+
+            envelope = np.ones_like(t_array, dtype=np.float32)
+            if fade_in > 0:
+                envelope = np.minimum(envelope, np.clip(t_array / fade_in, 0.0, 1.0))
+            if fade_out > 0:
+                envelope = np.minimum(envelope, np.clip((duration - t_array) / fade_out, 0.0, 1.0))
+            return frame * (envelope[..., None] if frame.ndim > 1 else envelope)
+
+        return AudioClip(make_frame, duration=duration, fps=sample_rate)
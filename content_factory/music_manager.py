@@ -9,6 +9,18 @@ from typing import Optional, List, Dict
 from urllib.parse import quote
 from content_factory.utils import safe_path_join, ensure_directory
 
+try:
+    from content_factory.music_cache import MusicPCMCache
+    HAS_PCM_CACHE = True
+except ImportError:
+    HAS_PCM_CACHE = False
+
+try:
+    from content_factory.asset_library import get_asset_library
+    HAS_ASSET_LIBRARY = True
+except ImportError:
+    HAS_ASSET_LIBRARY = False
+
 class MusicManager:
     """Gestionnaire intelligent de musique libre de droits - VERSION CORRIGÉE"""
     
@@ -34,6 +46,9 @@ class MusicManager:
         ensure_directory(self.music_dir)
         ensure_directory(self.download_dir)
         
+        # Cache PCM pré-décodé (une seule décompression par piste)
+        self.pcm_cache = MusicPCMCache(safe_path_join(self.music_dir, "pcm_cache")) if HAS_PCM_CACHE else None
+        
         # Genres de musique "brainrot"
         self.brainrot_genres = [
             "synthwave", "lofi", "electronic", "ambient", "chillhop",
@@ -169,6 +184,16 @@ class MusicManager:
         """Récupère une musique existante du dossier."""
         if not os.path.exists(self.music_dir):
             return None
+        
+        if HAS_ASSET_LIBRARY:
+            # Catalogue indexé (téléchargements inclus): pistes les moins utilisées favorisées
+            library = get_asset_library()
+            library.sync(self.music_dir, skip_dirs=('pcm_cache',))
+            tracks = library.sample(('music',), 1, root=self.music_dir)
+            if tracks:
+                library.mark_used(tracks)
+                return tracks[0]
+            return None
             
         music_files = []
         for file in os.listdir(self.music_dir):
@@ -0,0 +1,182 @@
+# content_factory/perceptual_index.py (DÉDUPLICATION PAR HASH PERCEPTUEL)
+
+import io
+import os
+import json
+import time
+import threading
+import subprocess
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+from PIL import Image
+
+from content_factory.utils import ensure_directory
+from content_factory.config_loader import ConfigLoader
+from content_factory.audio_mastering import get_ffmpeg_binary
+
+# Conteneurs vidéo: première frame extraite par ffmpeg (PIL ne sait pas les lire)
+VIDEO_CONTAINERS = ('.mp4', '.mov', '.webm')
+
+# Nombre de bits à 1 pour chaque octet (popcount vectorisé)
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _first_video_frame(video_path: str) -> Optional[bytes]:
+    ffmpeg = get_ffmpeg_binary()
+    if not ffmpeg:
+        return None
+    result = subprocess.run(
+        [ffmpeg, '-hide_banner', '-loglevel', 'error', '-i', video_path,
+         '-frames:v', '1', '-vf', 'scale=64:-2', '-f', 'image2pipe', '-vcodec', 'png', '-'],
+        capture_output=True, timeout=30
+    )
+    return result.stdout or None
+
+
+def dhash(image_path: str, hash_size: int = 8) -> Optional[int]:
+    """
+    Hash perceptuel 64 bits (dHash): gradient horizontal sur une miniature
+    9x8 en niveaux de gris. Pour un GIF ou un MP4, seule la première frame est lue.
+    """
+    try:
+        source = image_path
+        if image_path.lower().endswith(VIDEO_CONTAINERS):
+            frame = _first_video_frame(image_path)
+            if frame is None:
+                return None
+            source = io.BytesIO(frame)
+
+        with Image.open(source) as img:
+            if img.format == 'JPEG':
+                img.draft('L', (hash_size * 8, hash_size * 8))
+            img.seek(0)
+            pixels = np.asarray(
+                img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR),
+                dtype=np.int16
+            )
+    except Exception:
+        return None
+
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+class PerceptualIndex:
+    """
+    Index persistant des hashes perceptuels des assets utilisés récemment.
+    Rejette les quasi-doublons (reposts, miroirs Giphy, photos quasi identiques)
+    dans une même vidéo comme entre vidéos récentes. Recherche par distance de
+    Hamming vectorisée sur tout l'index. Thread-safe: les hashes sont calculés
+    hors verrou, la vérification et l'enregistrement sous verrou.
+    """
+
+    MAX_DISTANCE = 6
+    RECENT_SECONDS = 3 * 24 * 3600
+    MAX_ENTRIES = 5000
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._lock = threading.RLock()
+        self.entries: List[Dict[str, Any]] = []
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('entries', [])
+            except Exception as e:
+                print(f"⚠️ Index perceptuel illisible, réinitialisation: {e}")
+                self.entries = []
+
+        min_time = time.time() - self.RECENT_SECONDS
+        self.entries = [e for e in self.entries if e.get('added_at', 0) >= min_time][-self.MAX_ENTRIES:]
+        self._hashes = np.array([int(e['hash'], 16) for e in self.entries], dtype=np.uint64)
+
+    def save(self):
+        with self._lock:
+            try:
+                ensure_directory(os.path.dirname(self.index_path) or '.')
+                temp_path = f"{self.index_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'entries': self.entries[-self.MAX_ENTRIES:]}, f)
+                os.replace(temp_path, self.index_path)
+            except Exception as e:
+                print(f"⚠️ Index perceptuel non sauvegardé: {e}")
+
+    def find_duplicate(self, image_hash: int) -> Optional[Dict[str, Any]]:
+        """Entrée la plus proche si sa distance de Hamming est sous le seuil."""
+        with self._lock:
+            if self._hashes.size == 0:
+                return None
+
+            xor = np.bitwise_xor(self._hashes, np.uint64(image_hash))
+            distances = _POPCOUNT[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+            best = int(np.argmin(distances))
+            if distances[best] <= self.MAX_DISTANCE:
+                return dict(self.entries[best], distance=int(distances[best]))
+            return None
+
+    def add(self, image_hash: int, path: str):
+        with self._lock:
+            self.entries.append({'hash': f"{image_hash:016x}", 'path': path, 'added_at': int(time.time())})
+            self._hashes = np.append(self._hashes, np.uint64(image_hash))
+
+    def is_reusable(self, path: str, batch_hashes: List[int] = None) -> bool:
+        """
+        Vrai si l'asset n'a de quasi-doublon ni dans l'index ni dans `batch_hashes`
+        (lot en cours, complété si l'asset est accepté). N'enregistre rien: le tri
+        définitif reste fait par filter_unique.
+        """
+        image_hash = dhash(path)
+        if image_hash is None:
+            return True
+        with self._lock:
+            if self.find_duplicate(image_hash):
+                return False
+            if batch_hashes is not None:
+                if any(bin(image_hash ^ other).count('1') <= self.MAX_DISTANCE for other in batch_hashes):
+                    return False
+                batch_hashes.append(image_hash)
+            return True
+
+    def filter_unique(self, paths: List[str], label: str = 'asset') -> List[str]:
+        """Garde les assets sans quasi-doublon et les enregistre (vidéo en cours + vidéos suivantes)."""
+        hashes = [dhash(path) for path in paths]
+        unique_paths = []
+        with self._lock:
+            for path, image_hash in zip(paths, hashes):
+                if image_hash is None:
+                    unique_paths.append(path)
+                    continue
+
+                duplicate = self.find_duplicate(image_hash)
+                if duplicate:
+                    print(f"      🔁 {label} quasi-doublon ignoré: {os.path.basename(path)} "
+                          f"≈ {os.path.basename(duplicate['path'])} (distance {duplicate['distance']})")
+                    continue
+
+                self.add(image_hash, path)
+                unique_paths.append(path)
+
+            self.save()
+
+        if len(unique_paths) != len(paths):
+            print(f"   🔍 Déduplication perceptuelle: {len(paths)} → {len(unique_paths)} {label}s")
+        return unique_paths
+
+
+_perceptual_index = None
+_perceptual_index_lock = threading.Lock()
+
+
+def get_perceptual_index() -> PerceptualIndex:
+    """Instance partagée (génération et préchargement voient les mêmes assets récents)."""
+    global _perceptual_index
+    with _perceptual_index_lock:
+        if _perceptual_index is None:
+            cache_dir = ConfigLoader().get_config().get('PATHS', {}).get('CACHE_DIR', 'cache')
+            _perceptual_index = PerceptualIndex(os.path.join(cache_dir, 'perceptual_index.json'))
+        return _perceptual_index
@@ -0,0 +1,155 @@
+# content_factory/rate_limiter.py (LIMITATION DE DÉBIT PAR HÔTE)
+
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Tuple, Optional, Mapping
+from urllib.parse import urlparse
+
+# (requêtes par seconde, rafale autorisée) par hôte, avant tout en-tête reçu
+HOST_LIMITS: Dict[str, Tuple[float, int]] = {
+    'www.reddit.com': (1.0, 5),
+    'api.giphy.com': (2.0, 10),
+    'tenor.com': (2.0, 5),
+}
+DEFAULT_LIMIT = (4.0, 8)
+
+
+class TokenBucket:
+    """
+    Seau à jetons: `burst` requêtes immédiates puis `rate` par seconde.
+    Les réservations peuvent passer sous zéro: chaque appelant reçoit alors
+    son propre délai, ce qui étale les requêtes concurrentes sans les perdre.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.base_rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Consomme un jeton et retourne le délai d'attente (0 si budget disponible)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.blocked_until - now)
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def apply_quota(self, remaining: float, reset_seconds: float):
+        """Aligne le seau sur le quota annoncé par le serveur pour la fenêtre en cours."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if remaining < 1:
+                self.tokens = min(self.tokens, 0.0)
+                self.blocked_until = max(self.blocked_until, now + reset_seconds)
+                return
+            self.tokens = min(self.tokens, remaining)
+            # Quota restant réparti sur la fenêtre, sans jamais dépasser le débit de base
+            self.rate = min(self.base_rate, remaining / max(reset_seconds, 1.0)) if reset_seconds else self.base_rate
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """Retry-After en secondes ou en date HTTP."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostRateLimiter:
+    """Seaux à jetons par hôte, partagés par tout le process (threads et boucles asyncio)."""
+
+    def __init__(self, host_limits: Dict[str, Tuple[float, int]] = None, default_limit: Tuple[float, int] = DEFAULT_LIMIT):
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.default_limit = default_limit
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower() or url
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(*self.host_limits.get(host, self.default_limit))
+            return self._buckets[host]
+
+    def reserve(self, url: str) -> float:
+        """Délai à respecter avant d'envoyer une requête vers l'hôte de `url`."""
+        return self.bucket(url).reserve()
+
+    def wait(self, url: str):
+        """Version bloquante (code synchrone): ne dort que si le budget est épuisé."""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, url: str, status: int, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Met à jour le seau d'après la réponse (Retry-After, X-Ratelimit-Remaining/Reset).
+        Retourne la pause imposée par le serveur, le cas échéant.
+        """
+        bucket = self.bucket(url)
+        pause = None
+
+        retry_after = _header(headers, 'retry-after')
+        if retry_after is not None:
+            pause = _parse_retry_after(retry_after)
+
+        remaining = _header(headers, 'x-ratelimit-remaining')
+        reset = _header(headers, 'x-ratelimit-reset')
+        if remaining is not None:
+            try:
+                reset_seconds = float(reset) if reset is not None else 0.0
+                # Certains serveurs envoient un timestamp absolu plutôt qu'un délai
+                if reset_seconds > 1e9:
+                    reset_seconds = max(0.0, reset_seconds - time.time())
+                bucket.apply_quota(float(remaining), reset_seconds)
+                if float(remaining) < 1 and reset_seconds:
+                    pause = max(pause or 0.0, reset_seconds)
+            except ValueError:
+                pass
+
+        if status == 429 and pause is None:
+            # 429 sans indication: on laisse le seau se vider quelques secondes
+            pause = 3.0
+
+        if pause:
+            bucket.block_for(pause)
+        return pause
+
+
+_host_rate_limiter = None
+_host_rate_limiter_lock = threading.Lock()
+
+
+def get_host_rate_limiter() -> HostRateLimiter:
+    """Instance partagée par tout le process."""
+    global _host_rate_limiter
+    with _host_rate_limiter_lock:
+        if _host_rate_limiter is None:
+            _host_rate_limiter = HostRateLimiter()
+        return _host_rate_limiter
@@ -6,13 +6,42 @@ import time
 import random
 import requests
 import json
-from typing import List, Dict, Optional
-from urllib.parse import quote
+import threading
+from typing import List, Dict, Optional, Tuple, Callable
+
+from content_factory.asset_store import get_asset_store
+from content_factory.rate_limiter import HostRateLimiter, get_host_rate_limiter
+from content_factory.search_cache import SearchCache, get_search_cache
+from content_factory.config_loader import ConfigLoader
+from content_factory.search_scheduler import SearchScheduler
+from content_factory.url_blacklist import DeadURLBlacklist, get_url_blacklist
+from content_factory.gif_candidates import GIFCandidate, rank_candidates
+from content_factory.gif_sources import GIFSource, RedditSource, build_gif_sources, clean_gif_url
+from content_factory.subreddit_index import SubredditIndex
+
+try:
+    import asyncio
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
 
 class UltimateGIFHunter:
     """Chasseur de GIFs ultime avec recherche persistante et sources multiples."""
+
+    # Candidats renvoyés au-delà de la cible (échecs de validation/téléchargement)
+    CANDIDATE_HEADROOM = 2
+    # Avantage de classement d'un GIF déjà en stock (aucun téléchargement)
+    STORED_BONUS = 0.15
     
-    def __init__(self):
+    def __init__(self, sources: Dict[str, GIFSource] = None, rate_limiter: HostRateLimiter = None,
+                 state_dir: str = None):
+        """
+        `sources`: sources interrogées (par défaut Reddit, Giphy, Tenor). `state_dir`:
+        cache, statistiques, liste noire et index isolés dans ce dossier au lieu
+        de l'état partagé du process (benchmarks).
+        """
         # SUBREDDITS GARANTIS avec contenu GIF actif
         self.guaranteed_subreddits = [
             "gifs", "reactiongifs", "highqualitygifs", "perfectloops",
@@ -21,107 +50,342 @@ class UltimateGIFHunter:
         ]
         
         self.user_agent = "YouTubeBrainrotFactory/2.0"
-        self.rate_limit_delay = 0.5
+        # Débit par hôte partagé par tout le process (jetons + en-têtes de quota)
+        self.rate_limiter = rate_limiter or get_host_rate_limiter()
         self.max_attempts_per_term = 3
-        
-        # Sources alternatives
-        self.gif_sources = [
-            self._search_reddit_aggressive,
-            self._search_giphy_fallback,
-            self._search_tenor_fallback,
-            self._get_local_fallback_gifs
-        ]
-        
-        # Cache pour éviter les recherches répétées
-        self.search_cache = {}
+
+        config = ConfigLoader().get_config()
+        image_config = config.get('IMAGE_MANAGER', {})
+
+        # Mode asynchrone: subreddits et sources de secours interrogés en parallèle
+        self.async_search = HAS_AIOHTTP and image_config.get('GIF_ASYNC_SEARCH', True)
+        self.max_parallel_requests = image_config.get('GIF_MAX_PARALLEL_REQUESTS', 6)
+        self.request_timeout = 15
+        self.hunt_timeout = 60
+
+        # Rendition MP4 visée: la plus légère dont la hauteur suffit au format final
+        width, height = config.get('VIDEO_CREATOR', {}).get('RESOLUTION', [1080, 1920])
+        self.resolution = (width, height)
+        self.min_rendition_height = min(width, height) * 2 // 3
+
+        # Sources interrogées (le fallback local n'intervient qu'en dernier recours);
+        # GIF_SOURCE_BASE_URL les redirige toutes vers un serveur local (fake_gif_server)
+        self.sources = sources or build_gif_sources(self.guaranteed_subreddits, self.resolution,
+                                                    self.min_rendition_height,
+                                                    image_config.get('GIF_SOURCE_BASE_URL') or None)
+
+        cache_dir = state_dir or config.get('PATHS', {}).get('CACHE_DIR', 'cache')
+        if state_dir:
+            self.search_cache = SearchCache(os.path.join(state_dir, 'gif_search_cache.json'))
+            self.url_blacklist = DeadURLBlacklist(os.path.join(state_dir, 'dead_urls.json'))
+        else:
+            # Cache persistant pour éviter les recherches répétées (TTL par source)
+            self.search_cache = get_search_cache()
+            # URLs mortes connues (validation/téléchargement): jamais reproposées
+            self.url_blacklist = get_url_blacklist()
+
+        # Bandit sur le rendement (GIFs/s) par source et par famille de termes, persistant
+        self.scheduler = SearchScheduler(os.path.join(cache_dir, 'gif_search_stats.json'))
+
+        # Index local des listings top/hot (rafraîchi une fois par jour) au lieu de search.json
+        self.listing_index = None
+        if image_config.get('GIF_LISTING_INDEX', True):
+            self.listing_index = SubredditIndex(os.path.join(cache_dir, 'subreddit_index.db'))
+        self._index_refresh_lock = threading.Lock()
+        self._index_retry_at = 0.0
         
         print("🎯 UltimateGIFHunter initialisé - Recherche persistante activée")
 
-    def hunt_gifs_persistently(self, content_data: Dict, target_count: int = 8, max_total_attempts: int = 20) -> List[str]:
+    def hunt_gifs_persistently(self, content_data: Dict, target_count: int = 8, max_total_attempts: int = 20,
+                               time_budget: Optional[float] = None,
+                               reusable: Optional[Callable[[str], bool]] = None) -> List[str]:
         """
         Recherche PERSISTANTE de GIFs jusqu'à atteindre la cible ou épuiser les tentatives.
+        Source et famille de termes de chaque tentative choisies par le bandit (rendement
+        observé entre les runs). Passe par la recherche concurrente quand aiohttp est disponible.
+        `reusable(chemin)`: GIFs en stock réellement réutilisables (seuls à recevoir le bonus).
         """
+        self._refresh_listing_index()
+        
+        if self.async_search:
+            try:
+                return self.hunt_gifs_concurrently(content_data, target_count, max_total_attempts, time_budget,
+                                                   reusable)
+            except Exception as e:
+                print(f"⚠️ Recherche asynchrone indisponible ({e}), recherche séquentielle...")
+
+        time_budget = time_budget or self.hunt_timeout
         print(f"\n🎯 DÉBUT CHASSE AUX GIFS PERSISTANTE")
         print(f"   📝 Titre: {content_data.get('title', '')[:50]}...")
-        print(f"   🎯 Cible: {target_count} GIFs | Max tentatives: {max_total_attempts}")
+        print(f"   🎯 Cible: {target_count} GIFs | Max tentatives: {max_total_attempts} | Budget: {time_budget:.0f}s")
         
         all_gifs = []
         total_attempts = 0
-        consecutive_failures = 0
-        
-        # Étape 1: Générer les termes de recherche
-        search_terms = self._generate_search_terms(content_data)
-        print(f"   🔍 Termes de recherche: {search_terms}")
-        
-        # Étape 2: Recherche PERSISTANTE avec toutes les sources
-        while len(all_gifs) < target_count and total_attempts < max_total_attempts:
-            term = random.choice(search_terms)
-            source = random.choice(self.gif_sources)
+        deadline = time.monotonic() + time_budget
+        
+        # Étape 1: Générer les termes de recherche, par famille
+        families = self._generate_search_term_families(content_data)
+        cursors: Dict[tuple, int] = {}
+        print(f"   🔍 Termes de recherche: {self._generate_search_terms(content_data, families)}")
+        all_gifs.extend(self._new_valid_gifs(self._search_listing_index(families), all_gifs))
+        arms = self._network_sources()
+        
+        # Étape 2: Tentatives choisies par le bandit jusqu'à la cible ou la fin du budget
+        candidate_target = target_count * self.CANDIDATE_HEADROOM
+        while arms and len(all_gifs) < candidate_target and total_attempts < max_total_attempts:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"      ⏱️ Budget de chasse écoulé ({time_budget:.0f}s)")
+                break
             
-            print(f"   🎯 Tentative {total_attempts + 1}: '{term}' avec {source.__name__}")
+            source, family, term = self._next_search(families, cursors, remaining, arms)
+            print(f"   🎯 Tentative {total_attempts + 1}: '{term}' ({family}) avec {source}")
             
+            started = time.monotonic()
             try:
-                found_gifs = source(term, content_data)
-                
-                if found_gifs:
-                    new_gifs = [g for g in found_gifs if g not in all_gifs]
-                    all_gifs.extend(new_gifs)
-                    consecutive_failures = 0
-                    print(f"      ✅ Trouvé {len(new_gifs)} nouveaux GIFs (total: {len(all_gifs)})")
-                else:
-                    consecutive_failures += 1
-                    print(f"      ❌ Aucun GIF trouvé (échecs consécutifs: {consecutive_failures})")
-                
+                found_gifs, from_network = self._search_source(source, term)
             except Exception as e:
                 print(f"      ⚠️ Erreur: {e}")
-                consecutive_failures += 1
+                found_gifs, from_network = [], True
             
-            total_attempts += 1
-            
-            # Pause stratégique
-            time.sleep(self.rate_limit_delay)
+            new_gifs = self._new_valid_gifs(found_gifs, all_gifs)
+            all_gifs.extend(new_gifs)
+            self._record_search(source, family, len(new_gifs), time.monotonic() - started, from_network)
+            if new_gifs:
+                print(f"      ✅ Trouvé {len(new_gifs)} nouveaux GIFs (total: {len(all_gifs)})")
+            else:
+                print(f"      ❌ Aucun nouveau GIF")
             
-            # Si trop d'échecs consécutifs, changer de stratégie
-            if consecutive_failures >= 5:
-                print("      🔄 Trop d'échecs, changement de stratégie...")
-                search_terms = self._get_emergency_terms(content_data)
-                consecutive_failures = 0
+            total_attempts += 1
+        
+        if len(all_gifs) < target_count:
+            all_gifs.extend(self._new_valid_gifs(self._get_local_fallback_gifs('', content_data), all_gifs))
         
         # Étape 3: Résultat final
-        final_gifs = all_gifs[:target_count]
-        print(f"\n🎉 CHASSE TERMINÉE: {len(final_gifs)} GIFs trouvés après {total_attempts} tentatives")
+        return self._finalize_hunt(all_gifs, target_count, total_attempts, reusable)
+
+    def _next_search(self, families: Dict[str, List[str]], cursors: Dict[tuple, int],
+                     remaining_seconds: float, arms: List[str]) -> Tuple[str, str, str]:
+        """Source et famille choisies par le bandit; les termes d'une famille sont pris à tour de rôle."""
+        source = self.scheduler.choose('source', arms, remaining_seconds)
+        family = self.scheduler.choose('family', [f for f, terms in families.items() if terms], remaining_seconds)
+        index = cursors.get((source, family), 0)
+        cursors[(source, family)] = index + 1
+        terms = families[family]
+        return source, family, terms[index % len(terms)]
+
+    def _new_valid_gifs(self, found: List[GIFCandidate], known: List[GIFCandidate]) -> List[GIFCandidate]:
+        """Candidats inédits, hors NSFW et hors liste noire."""
+        known_urls = {candidate.url for candidate in known}
+        new_candidates = []
+        for candidate in found:
+            if candidate.url in known_urls or candidate.nsfw or self.url_blacklist.is_dead(candidate.url):
+                continue
+            known_urls.add(candidate.url)
+            new_candidates.append(candidate)
+        return new_candidates
+
+    def _cache_get(self, source: str, term: str, params: Dict = None) -> Optional[List[GIFCandidate]]:
+        cached = self.search_cache.get(source, term, params)
+        return None if cached is None else [GIFCandidate.from_cache(item) for item in cached]
+
+    def _cache_put(self, source: str, term: str, candidates: List[GIFCandidate], params: Dict = None):
+        self.search_cache.put(source, term, [candidate.to_dict() for candidate in candidates], params)
+
+    def _record_search(self, source: str, family: str, new_gifs: int, seconds: float, from_network: bool):
+        """Rendement transmis au bandit, uniquement pour les tentatives réseau."""
+        self.scheduler.record('source', source, new_gifs, seconds, from_network=from_network)
+        self.scheduler.record('family', family, new_gifs, seconds, from_network=from_network)
+
+    def _finalize_hunt(self, all_gifs: List[GIFCandidate], target_count: int, total_attempts: int,
+                       reusable: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """
+        Classe les candidats (résolution, ratio, durée, popularité; bonus aux GIFs déjà
+        en stock et réutilisables) et renvoie les URLs des meilleurs: la cible plus une
+        marge, dans l'ordre où les télécharger.
+        """
+        self.search_cache.flush()
+        self.scheduler.save()
+        asset_store = get_asset_store()
+        bonus = {}
+        for candidate in all_gifs:
+            stored_path = asset_store.path_of(candidate.url)
+            # Un GIF en stock déjà vu dans une vidéo récente serait rejeté: aucun avantage
+            if stored_path and (reusable is None or reusable(stored_path)):
+                bonus[candidate.url] = self.STORED_BONUS
+        ranked = rank_candidates(all_gifs, self.resolution, self.min_rendition_height, bonus)
+        final_gifs = [candidate.url for candidate in ranked[:target_count * self.CANDIDATE_HEADROOM]]
+        cached_count = sum(1 for url in final_gifs if url in bonus)
+        print(f"\n🎉 CHASSE TERMINÉE: {len(all_gifs)} candidats après {total_attempts} tentatives, "
+              f"{len(final_gifs)} retenus par classement ({cached_count} déjà en stock)")
+        if ranked:
+            print(f"   🏆 Meilleur candidat: {ranked[0]}")
+        print(f"   📈 Rendement des sources: {self.scheduler.summary('source')}")
         
         return final_gifs
 
-    def _generate_search_terms(self, content_data: Dict) -> List[str]:
-        """Génère une large gamme de termes de recherche"""
+    # --- RECHERCHE CONCURRENTE (aiohttp) ---
+
+    def hunt_gifs_concurrently(self, content_data: Dict, target_count: int = 8, max_total_attempts: int = 20,
+                               time_budget: Optional[float] = None,
+                               reusable: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """
+        Interroge subreddits, Giphy et Tenor en parallèle (débit limité par hôte),
+        chaque créneau libéré étant réattribué par le bandit; toutes les requêtes
+        en vol sont annulées dès la cible atteinte.
+        """
+        time_budget = time_budget or self.hunt_timeout
+        print("\n🎯 DÉBUT CHASSE AUX GIFS CONCURRENTE")
+        print(f"   📝 Titre: {content_data.get('title', '')[:50]}...")
+        print(f"   🎯 Cible: {target_count} GIFs | Max requêtes: {max_total_attempts} "
+              f"({self.max_parallel_requests} en parallèle) | Budget: {time_budget:.0f}s")
+
+        start_time = time.time()
+        all_gifs, total_attempts = asyncio.run(
+            self._hunt_async(content_data, target_count, max_total_attempts, time_budget)
+        )
+        print(f"   ⏱️ Recherche concurrente: {time.time() - start_time:.1f}s")
+
+        if len(all_gifs) < target_count:
+            all_gifs.extend(self._new_valid_gifs(self._get_local_fallback_gifs('', content_data), all_gifs))
+
+        return self._finalize_hunt(all_gifs, target_count, total_attempts, reusable)
+
+    async def _hunt_async(self, content_data: Dict, target_count: int, max_total_attempts: int, time_budget: float):
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        deadline = time.monotonic() + time_budget
+        all_gifs: List[GIFCandidate] = []
+        total_attempts = 0
+        cache_hits = 0
+
+        families = self._generate_search_term_families(content_data)
+        cursors: Dict[tuple, int] = {}
+        # Partitions (subreddits...) de chaque source, parcourues dans un ordre aléatoire
+        shards = {name: random.sample(source.shards(), len(source.shards())) for name, source in self.sources.items()}
+        print(f"   🔍 Termes de recherche: {self._generate_search_terms(content_data, families)}")
+        all_gifs.extend(self._new_valid_gifs(self._search_listing_index(families), all_gifs))
+        arms = self._network_sources()
+        if len(all_gifs) >= target_count * self.CANDIDATE_HEADROOM:
+            arms = []
+
+        pending: Dict = {}
+        launched = 0
+
+        def can_launch() -> bool:
+            # Les réponses du cache ne consomment pas le budget réseau (plafonnées à part)
+            network_launched = launched - cache_hits
+            return (bool(arms) and network_launched < max_total_attempts and launched < max_total_attempts * 2
+                    and len(pending) < self.max_parallel_requests and time.monotonic() < deadline)
+
+        def launch(session):
+            nonlocal launched
+            source, family, term = self._next_search(families, cursors, deadline - time.monotonic(), arms)
+            shard = shards[source][cursors[(source, family)] % len(shards[source])]
+            task = asyncio.create_task(self._run_async_job(session, (source, term, shard)))
+            pending[task] = (source, family)
+            launched += 1
+
+        async with aiohttp.ClientSession(headers={'User-Agent': self.user_agent}, timeout=timeout) as session:
+            try:
+                while can_launch():
+                    launch(session)
+
+                while pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        print(f"      ⏱️ Budget de chasse écoulé ({time_budget:.0f}s)")
+                        break
+
+                    done, _ = await asyncio.wait(list(pending), timeout=remaining,
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        source, family = pending.pop(task)
+                        label, found, from_cache, elapsed = task.result()
+                        new_gifs = self._new_valid_gifs(found, all_gifs)
+                        all_gifs.extend(new_gifs)
+                        if from_cache:
+                            cache_hits += 1
+                        else:
+                            total_attempts += 1
+                            self._record_search(source, family, len(new_gifs), elapsed, from_network=True)
+                        if new_gifs:
+                            print(f"      ✅ {label}: {len(new_gifs)} nouveaux GIFs (total: {len(all_gifs)})")
+
+                    if len(all_gifs) >= target_count * self.CANDIDATE_HEADROOM:
+                        break
+                    while can_launch():
+                        launch(session)
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                if pending:
+                    print(f"      🛑 {len(pending)} requête(s) en vol annulée(s)")
+
+        if cache_hits:
+            print(f"   💾 {cache_hits} recherche(s) servie(s) par le cache")
+        return all_gifs, total_attempts
+
+    async def _run_async_job(self, session, job: tuple):
+        name, term, shard = job
+        source = self.sources[name]
+        label = source.label(shard)
+        cache_params = source.cache_params(shard)
+        cached = self._cache_get(name, term, cache_params)
+        if cached is not None:
+            return label, cached, True, 0.0
+
+        started = time.monotonic()
+        try:
+            found = await source.search_async(session, term, shard, self.rate_limiter)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"      ❌ {label} '{term}' échoué: {e}")
+            return label, [], False, time.monotonic() - started
+
+        elapsed = time.monotonic() - started
+        # None = pas de réponse exploitable (erreur HTTP): jamais mis en cache
+        if found is None:
+            return label, [], False, elapsed
+        self._cache_put(name, term, found, cache_params)
+        return label, found, False, elapsed
+
+    def _generate_search_term_families(self, content_data: Dict) -> Dict[str, List[str]]:
+        """Termes de recherche regroupés par famille (bras du bandit), sans doublon entre familles"""
         title = content_data.get('title', '').lower()
         category = content_data.get('category', 'general')
         is_part1 = content_data.get('is_part1', True)
         
-        terms = []
-        
-        # Termes basés sur le titre (extraction agressive)
-        words = re.findall(r'\b[a-zA-ZÀ-ÿ]{4,}\b', title)
-        terms.extend(words[:8])  # Prendre plus de mots
-        
-        # Termes de catégorie étendus
-        category_terms = self._get_extended_category_terms(category)
-        terms.extend(category_terms)
-        
-        # Termes émotionnels brainrot
-        emotional_terms = self._get_emotional_terms(title, is_part1)
-        terms.extend(emotional_terms)
-        
-        # Termes génériques garantis
-        generic_terms = ['amazing', 'awesome', 'cool', 'interesting', 'mindblowing', 'epic']
-        terms.extend(generic_terms)
+        families = {
+            # Termes basés sur le titre (extraction agressive)
+            'title': re.findall(r'\b[a-zA-ZÀ-ÿ]{4,}\b', title)[:8],
+            # Termes de catégorie étendus
+            'category': self._get_extended_category_terms(category),
+            # Termes émotionnels brainrot
+            'emotion': self._get_emotional_terms(title, is_part1),
+            # Termes génériques garantis
+            'generic': ['amazing', 'awesome', 'cool', 'interesting', 'mindblowing', 'epic'],
+            # Termes d'urgence: disponibles d'emblée, le bandit décide s'ils rapportent
+            'emergency': self._get_emergency_terms(content_data),
+        }
         
         # Dédupliquer et mélanger
-        unique_terms = list(dict.fromkeys(terms))
-        random.shuffle(unique_terms)
-        
-        return unique_terms[:15]  # Retourner plus de termes
+        seen = set()
+        for family, terms in families.items():
+            unique_terms = [term for term in dict.fromkeys(terms) if term not in seen]
+            seen.update(unique_terms)
+            random.shuffle(unique_terms)
+            families[family] = unique_terms
+        
+        return families
+
+    def _generate_search_terms(self, content_data: Dict, families: Dict[str, List[str]] = None) -> List[str]:
+        """Génère une large gamme de termes de recherche"""
+        families = families or self._generate_search_term_families(content_data)
+        terms = [term for family, family_terms in families.items() if family != 'emergency' for term in family_terms]
+        random.shuffle(terms)
+        return terms[:15]  # Retourner plus de termes
 
     def _get_extended_category_terms(self, category: str) -> List[str]:
         """Termes de catégorie très étendus"""
@@ -172,155 +436,111 @@ class UltimateGIFHunter:
         
         return terms
 
-    def _search_reddit_aggressive(self, search_term: str, content_data: Dict) -> List[str]:
-        """Recherche Reddit AGGRESSIVE avec nombreux subreddits"""
-        gif_urls = []
-        
-        # Essayer plusieurs subreddits pour le même terme
-        subreddits_to_try = random.sample(self.guaranteed_subreddits, 
-                                        min(6, len(self.guaranteed_subreddits)))
-        
-        for subreddit in subreddits_to_try:
-            if len(gif_urls) >= 5:  # Limite par terme
-                break
-                
-            try:
-                found_gifs = self._search_single_subreddit(subreddit, search_term)
-                if found_gifs:
-                    gif_urls.extend(found_gifs)
-                    print(f"      ✅ r/{subreddit}: {len(found_gifs)} GIFs")
-                
-            except Exception as e:
-                print(f"      ❌ r/{subreddit} échoué: {e}")
-            
-            time.sleep(self.rate_limit_delay)
-        
-        return gif_urls
+    # --- INDEX LOCAL DES LISTINGS ---
 
-    def _search_single_subreddit(self, subreddit: str, search_term: str) -> List[str]:
-        """Recherche dans un seul subreddit avec filtres MINIMAUX"""
-        try:
-            url = f"https://www.reddit.com/r/{subreddit}/search.json"
-            params = {
-                'q': search_term,
-                'restrict_sr': 'on',
-                'sort': 'relevance',  # Relevance pour meilleurs résultats
-                't': 'year',         # Année entière pour plus de contenu
-                'limit': 25          # Beaucoup de résultats
-            }
+    def _index_ready(self) -> bool:
+        return self.listing_index is not None and self.listing_index.post_count() > 0
+
+    def _network_sources(self) -> List[str]:
+        """Bras du bandit: sources interrogées sur le réseau (Reddit est servi par l'index s'il est prêt)."""
+        return [name for name in self.sources if not (name == 'reddit' and self._index_ready())]
+
+    def _search_listing_index(self, families: Dict[str, List[str]]) -> List[GIFCandidate]:
+        """
+        Tous les termes de la chasse servis par l'index local, une consultation par
+        terme: aucune requête réseau, donc ni tentative consommée ni rendement
+        enregistré par le bandit.
+        """
+        if not self._index_ready():
+            return []
+        terms = list(dict.fromkeys(term for family_terms in families.values() for term in family_terms))
+        candidates = [candidate for term in terms for candidate in self.listing_index.search(term)]
+        print(f"   🗂️ Index Reddit: {len(candidates)} GIFs pour {len(terms)} termes (sans réseau)")
+        return candidates
+
+    def _refresh_listing_index(self):
+        """Récupère les listings top/hot manquants ou de plus d'un jour (une requête par listing)."""
+        reddit = self.sources.get('reddit')
+        if self.listing_index is None or not isinstance(reddit, RedditSource) or time.time() < self._index_retry_at:
+            return
+
+        with self._index_refresh_lock:
+            stale = self.listing_index.stale_listings(reddit.subreddits)
+            if not stale:
+                return
+
+            print(f"   🗂️ Mise à jour de l'index Reddit: {len(stale)} listing(s)...")
             headers = {'User-Agent': self.user_agent}
-            
-            response = requests.get(url, params=params, headers=headers, timeout=25)
-            
-            if response.status_code == 200:
-                return self._extract_gifs_aggressive(response.json())
-            elif response.status_code == 429:
-                print("      ⏳ Rate limit Reddit, pause...")
-                time.sleep(3)
-                
-        except Exception as e:
-            print(f"      🌐 Erreur réseau: {e}")
-        
-        return []
+            refreshed = 0
+            for subreddit, listing, params in stale:
+                url = reddit.listing_url(subreddit, listing)
+                try:
+                    self.rate_limiter.wait(url)
+                    response = requests.get(url, params=params, headers=headers, timeout=25)
+                    self.rate_limiter.observe(url, response.status_code, response.headers)
+                    if response.status_code != 200:
+                        print(f"      ⚠️ r/{subreddit}/{listing}: HTTP {response.status_code}")
+                        continue
 
-    def _extract_gifs_aggressive(self, data: dict) -> List[str]:
-        """Extraction AGGRESSIVE de GIFs - filtres MINIMAUX"""
-        gif_urls = []
-        
-        if 'data' not in data or 'children' not in data['data']:
-            return gif_urls
-        
-        for post in data['data']['children']:
-            post_data = post.get('data', {})
-            
-            # FILTRES TRÈS PERMISSIFS
-            score = post_data.get('score', 0)
-            if score < 5:  # Seulement 5 upvotes minimum !
-                continue
-            
-            url = post_data.get('url', '')
-            
-            # Accepter TOUS les types de GIFs possibles
-            if (url.endswith('.gif') or 
-                '.gif?' in url or
-                'gif' in url.lower() or 
-                'redgifs' in url or
-                'imgur' in url or
-                'gfycat' in url):
-                
-                # Nettoyer l'URL si nécessaire
-                clean_url = self._clean_gif_url(url)
-                if clean_url and clean_url not in gif_urls:
-                    gif_urls.append(clean_url)
-        
-        return gif_urls[:8]  # Retourner plus de résultats
+                    self.listing_index.store_snapshot(subreddit, listing, reddit.parse_listing(response.json()))
+                    refreshed += 1
 
-    def _clean_gif_url(self, url: str) -> str:
-        """Nettoie et normalise l'URL GIF"""
-        # Convertir GIFV en GIF
-        if url.endswith('.gifv'):
-            return url.replace('.gifv', '.gif')
-        
-        # Nettoyer les URLs Imgur
-        if 'imgur.com' in url and not url.endswith('.gif'):
-            if '/gallery/' not in url:  # Éviter les galleries
-                return url + '.gif'
-        
-        return url
+                except Exception as e:
+                    print(f"      ⚠️ r/{subreddit}/{listing} échoué: {e}")
 
-    def _search_giphy_fallback(self, search_term: str, content_data: Dict) -> List[str]:
-        """Fallback Giphy (sans API key - utilisation publique)"""
-        try:
-            print(f"      🎭 Essai Giphy: '{search_term}'")
-            
-            # Utiliser l'API publique Giphy
-            url = "https://api.giphy.com/v1/gifs/search"
-            params = {
-                'q': search_term,
-                'limit': 10,
-                'rating': 'pg-13',
-                'api_key': 'dc6zaTOxFJmzC'  # Clé publique beta
-            }
-            
-            response = requests.get(url, params=params, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                gif_urls = []
-                
-                for gif in data.get('data', [])[:5]:
-                    original_url = gif.get('images', {}).get('original', {}).get('url')
-                    if original_url:
-                        gif_urls.append(original_url)
-                
-                return gif_urls
-                
-        except Exception as e:
-            print(f"      ❌ Giphy échoué: {e}")
-        
-        return []
+            if refreshed < len(stale):
+                # Listings en échec retentés dans une heure, pas à chaque chasse
+                self._index_retry_at = time.time() + 3600
+            print(f"   🗂️ Index Reddit: {refreshed}/{len(stale)} listing(s) rafraîchi(s) "
+                  f"({self.listing_index.post_count()} posts)")
+
+    # --- RECHERCHE SÉQUENTIELLE ---
+
+    def _search_source(self, name: str, search_term: str) -> Tuple[List[GIFCandidate], bool]:
+        """
+        Un terme sur une source: plusieurs partitions (subreddits) tant que le butin
+        est maigre. Renvoie aussi si au moins une partition a interrogé le réseau.
+        """
+        source = self.sources[name]
+        shards = source.shards()
+        if len(shards) > 1:
+            shards = random.sample(shards, min(6, len(shards)))
+
+        gif_candidates = []
+        from_network = False
+        for shard in shards:
+            if len(gif_candidates) >= 5:  # Limite par terme
+                break
+            found_gifs, shard_from_network = self._search_shard(source, search_term, shard)
+            from_network = from_network or shard_from_network
+            if found_gifs:
+                gif_candidates.extend(found_gifs)
+                print(f"      ✅ {source.label(shard)}: {len(found_gifs)} GIFs")
+
+        return gif_candidates, from_network
+
+    def _search_shard(self, source: GIFSource, search_term: str,
+                      shard: Optional[str]) -> Tuple[List[GIFCandidate], bool]:
+        """(candidats, réseau interrogé): le cache répond sans requête."""
+        cache_params = source.cache_params(shard)
+        cached = self._cache_get(source.name, search_term, cache_params)
+        if cached is not None:
+            return cached, False
 
-    def _search_tenor_fallback(self, search_term: str, content_data: Dict) -> List[str]:
-        """Fallback Tenor (sans API key)"""
         try:
-            print(f"      🎵 Essai Tenor: '{search_term}'")
-            
-            # Recherche via page publique (fallback basique)
-            search_url = f"https://tenor.com/search/{quote(search_term)}-gifs"
-            headers = {'User-Agent': self.user_agent}
-            
-            response = requests.get(search_url, headers=headers, timeout=15)
-            if response.status_code == 200:
-                # Extraction basique des URLs GIF (méthode simplifiée)
-                gif_pattern = r'https://[^"\']*\.gif[^"\']*'
-                gif_urls = re.findall(gif_pattern, response.text)
-                return gif_urls[:5]
-                
+            found = source.search(search_term, shard, self.rate_limiter,
+                                  headers={'User-Agent': self.user_agent}, timeout=self.request_timeout)
         except Exception as e:
-            print(f"      ❌ Tenor échoué: {e}")
-        
-        return []
+            print(f"      ❌ {source.label(shard)} échoué: {e}")
+            return [], True
+
+        # None = erreur HTTP: jamais mis en cache
+        if found is None:
+            return [], True
+        self._cache_put(source.name, search_term, found, cache_params)
+        return found, True
 
-    def _get_local_fallback_gifs(self, search_term: str, content_data: Dict) -> List[str]:
+    def _get_local_fallback_gifs(self, search_term: str, content_data: Dict) -> List[GIFCandidate]:
         """Fallback local avec GIFs de qualité pré-téléchargés"""
         print(f"      🏠 Fallback local activé")
         
@@ -338,7 +558,7 @@ class UltimateGIFHunter:
         
         # Mélanger et retourner quelques GIFs
         random.shuffle(quality_fallback_gifs)
-        return quality_fallback_gifs[:4]
+        return [GIFCandidate(clean_gif_url(url), 'local') for url in quality_fallback_gifs[:4]]
 
     def _get_emergency_terms(self, content_data: Dict) -> List[str]:
         """Termes d'urgence quand tout échoue"""
@@ -355,15 +575,18 @@ class UltimateGIFHunter:
 # Instance globale
 ultimate_gif_hunter = UltimateGIFHunter()
 
-def get_brainrot_gifs(content_data: Dict, num_gifs: int = 8) -> List[str]:
+def get_brainrot_gifs(content_data: Dict, num_gifs: int = 8,
+                      reusable: Optional[Callable[[str], bool]] = None) -> List[str]:
     """
     Fonction principale - Recherche PERSISTANTE de GIFs.
-    Continue jusqu'à trouver ou épuiser 25 tentatives.
+    Continue jusqu'à trouver ou épuiser 25 tentatives. Renvoie les URLs classées
+    (meilleures d'abord), avec une marge au-delà de `num_gifs`.
     """
     return ultimate_gif_hunter.hunt_gifs_persistently(
         content_data, 
         target_count=num_gifs,
-        max_total_attempts=25  # Beaucoup de tentatives !
+        max_total_attempts=25,  # Beaucoup de tentatives !
+        reusable=reusable
     )
 
 # Test de la fonction
@@ -0,0 +1,107 @@
+# content_factory/search_cache.py (CACHE PERSISTANT DES RÉSULTATS DE RECHERCHE)
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List
+
+from content_factory.utils import ensure_directory
+from content_factory.config_loader import ConfigLoader
+
+# Durée de vie des résultats par source (secondes)
+SOURCE_TTLS = {
+    'reddit': 6 * 3600,
+    'giphy': 24 * 3600,
+    'tenor': 24 * 3600,
+}
+DEFAULT_TTL = 6 * 3600
+# Résultats vides: gardés moins longtemps (le contenu peut apparaître)
+NEGATIVE_TTL = 3600
+
+
+class SearchCache:
+    """
+    Résultats de recherche (source, requête, paramètres) → candidats, persistés entre
+    les runs. Les réponses vides sont aussi mises en cache (TTL plus court) pour
+    ne pas réinterroger une combinaison stérile. Les erreurs ne sont jamais cachées.
+    """
+
+    MAX_ENTRIES = 20000
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @staticmethod
+    def make_key(source: str, query: str, params: Dict[str, Any] = None) -> str:
+        payload = json.dumps([source, query.strip().lower(), params or {}], sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', {})
+        except Exception as e:
+            print(f"⚠️ Cache de recherche illisible, réinitialisation: {e}")
+            return
+
+        now = time.time()
+        self.entries = {key: entry for key, entry in entries.items() if entry.get('expires_at', 0) > now}
+
+    def get(self, source: str, query: str, params: Dict[str, Any] = None) -> Optional[List[Any]]:
+        """Résultats encore valides (liste éventuellement vide), ou None si absent/expiré."""
+        with self._lock:
+            entry = self.entries.get(self.make_key(source, query, params))
+            if entry is None or entry['expires_at'] <= time.time():
+                return None
+            return list(entry['results'])
+
+    def put(self, source: str, query: str, results: List[Any], params: Dict[str, Any] = None):
+        ttl = SOURCE_TTLS.get(source, DEFAULT_TTL) if results else NEGATIVE_TTL
+        with self._lock:
+            self.entries[self.make_key(source, query, params)] = {
+                'source': source,
+                'query': query,
+                'results': list(results),
+                'expires_at': time.time() + ttl,
+            }
+            self._dirty = True
+
+    def flush(self):
+        """Écrit le cache sur disque si modifié (une fois par chasse, pas à chaque requête)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self.entries) > self.MAX_ENTRIES:
+                newest = sorted(self.entries.items(), key=lambda item: item[1]['expires_at'])[-self.MAX_ENTRIES:]
+                self.entries = dict(newest)
+            try:
+                ensure_directory(os.path.dirname(self.cache_path) or '.')
+                temp_path = f"{self.cache_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'entries': self.entries}, f)
+                os.replace(temp_path, self.cache_path)
+                self._dirty = False
+            except Exception as e:
+                print(f"⚠️ Cache de recherche non sauvegardé: {e}")
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Instance partagée (un seul cache en mémoire par process)."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            cache_dir = ConfigLoader().get_config().get('PATHS', {}).get('CACHE_DIR', 'cache')
+            _search_cache = SearchCache(os.path.join(cache_dir, 'gif_search_cache.json'))
+        return _search_cache
@@ -0,0 +1,113 @@
+# content_factory/search_scheduler.py (ORDONNANCEMENT DES RECHERCHES PAR BANDIT)
+
+import os
+import json
+import time
+import random
+import threading
+from typing import Dict, List, Optional
+
+from content_factory.utils import ensure_directory
+
+
+class SearchScheduler:
+    """
+    Bandit manchot multi-bras (Thompson sampling gamma-Poisson) sur le rendement
+    des recherches: nouveaux GIFs valides par seconde, suivi par groupe de bras
+    ('source': reddit/giphy/tenor, 'family': famille de termes). Les statistiques
+    persistent entre les runs et s'estompent (demi-vie d'un jour) pour qu'une
+    source muette hier soit réessayée aujourd'hui.
+    """
+
+    HALF_LIFE_SECONDS = 24 * 3600
+    # A priori optimiste: un bras jamais essayé vaut ~1 GIF toutes les 2 s
+    PRIOR_GIFS = 1.0
+    PRIOR_SECONDS = 2.0
+    # Plancher de coût par tentative (les réponses du cache ne sont pas gratuites à l'infini)
+    MIN_ATTEMPT_SECONDS = 0.5
+
+    def __init__(self, stats_path: str):
+        self.stats_path = stats_path
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.stats_path):
+            return
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Statistiques de recherche illisibles, réinitialisation: {e}")
+            return
+
+        decay = 0.5 ** (max(0.0, time.time() - data.get('saved_at', time.time())) / self.HALF_LIFE_SECONDS)
+        self.stats = {
+            group: {arm: {key: value * decay for key, value in arm_stats.items()} for arm, arm_stats in arms.items()}
+            for group, arms in data.get('stats', {}).items()
+        }
+
+    def save(self):
+        with self._lock:
+            try:
+                ensure_directory(os.path.dirname(self.stats_path) or '.')
+                temp_path = f"{self.stats_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'saved_at': time.time(), 'stats': self.stats}, f, indent=2)
+                os.replace(temp_path, self.stats_path)
+            except Exception as e:
+                print(f"⚠️ Statistiques de recherche non sauvegardées: {e}")
+
+    def _arm(self, group: str, arm: str) -> Dict[str, float]:
+        return self.stats.setdefault(group, {}).setdefault(arm, {'gifs': 0.0, 'seconds': 0.0, 'attempts': 0.0})
+
+    def expected_yield(self, group: str, arm: str) -> float:
+        """Rendement moyen a posteriori (GIFs par seconde)."""
+        with self._lock:
+            stats = self._arm(group, arm)
+            return (self.PRIOR_GIFS + stats['gifs']) / (self.PRIOR_SECONDS + stats['seconds'])
+
+    def mean_attempt_seconds(self, group: str, arm: str) -> float:
+        with self._lock:
+            stats = self._arm(group, arm)
+            if stats['attempts'] < 1:
+                return self.PRIOR_SECONDS
+            return stats['seconds'] / stats['attempts']
+
+    def choose(self, group: str, arms: List[str], remaining_seconds: Optional[float] = None) -> str:
+        """
+        Tire un rendement plausible par bras et garde le meilleur. Les bras dont une
+        tentative moyenne ne tient plus dans le temps restant sont écartés.
+        """
+        candidates = list(arms)
+        if remaining_seconds is not None:
+            fitting = [arm for arm in candidates if self.mean_attempt_seconds(group, arm) <= remaining_seconds]
+            candidates = fitting or candidates
+
+        with self._lock:
+            samples = {}
+            for arm in candidates:
+                stats = self._arm(group, arm)
+                shape = self.PRIOR_GIFS + stats['gifs']
+                rate = self.PRIOR_SECONDS + stats['seconds']
+                samples[arm] = random.gammavariate(shape, 1.0 / rate)
+        return max(samples, key=samples.get)
+
+    def record(self, group: str, arm: str, new_gifs: int, seconds: float, *, from_network: bool):
+        """
+        Met à jour un bras avec une tentative RÉSEAU réelle. Les réponses locales
+        (cache, index) n'ont pas de coût comparable: leur rendement par seconde,
+        gonflé, biaiserait le bras durablement; elles sont ignorées.
+        """
+        if not from_network:
+            return
+        with self._lock:
+            stats = self._arm(group, arm)
+            stats['gifs'] += new_gifs
+            stats['seconds'] += max(seconds, self.MIN_ATTEMPT_SECONDS)
+            stats['attempts'] += 1
+
+    def summary(self, group: str) -> str:
+        arms = sorted(self.stats.get(group, {}))
+        return ", ".join(f"{arm} {self.expected_yield(group, arm):.2f}/s" for arm in arms)
@@ -0,0 +1,142 @@
+# content_factory/subreddit_index.py (INDEX LOCAL DES LISTINGS DE SUBREDDITS)
+
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from typing import List, Optional, Iterable, Dict, Any
+
+from content_factory.utils import ensure_directory
+from content_factory.gif_candidates import GIFCandidate
+
+_TOKEN_RE = re.compile(r'[a-zà-ÿ0-9]{3,}')
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens normalisés (minuscules, pluriel simple retiré) pour titres et requêtes."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 4 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return list(dict.fromkeys(tokens))
+
+
+class SubredditIndex:
+    """
+    Instantanés quotidiens des listings (top/hot) de chaque subreddit, indexés
+    par tokens de titre (SQLite). Toutes les recherches par terme d'une journée
+    sont servies localement: une requête par (subreddit, listing) et par jour,
+    au lieu d'une requête search.json par (subreddit, terme).
+    """
+
+    SNAPSHOT_TTL = 24 * 3600
+    # Listings récupérés pour chaque subreddit (nom, paramètres)
+    LISTINGS = (
+        ('top', {'t': 'year', 'limit': 100}),
+        ('hot', {'limit': 100}),
+    )
+
+    def __init__(self, db_path: str):
+        ensure_directory(os.path.dirname(db_path) or '.')
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                subreddit TEXT NOT NULL,
+                listing TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (subreddit, listing)
+            );
+            CREATE TABLE IF NOT EXISTS posts (
+                url TEXT NOT NULL,
+                subreddit TEXT NOT NULL,
+                listing TEXT NOT NULL,
+                score INTEGER NOT NULL DEFAULT 0,
+                candidate TEXT NOT NULL,
+                PRIMARY KEY (subreddit, listing, url)
+            );
+            CREATE TABLE IF NOT EXISTS tokens (
+                token TEXT NOT NULL,
+                subreddit TEXT NOT NULL,
+                listing TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (token, subreddit, listing, url)
+            );
+        """)
+        self.db.commit()
+
+    def stale_listings(self, subreddits: Iterable[str]) -> List[tuple]:
+        """(subreddit, listing, paramètres) dont l'instantané manque ou a plus d'un jour."""
+        with self._lock:
+            fetched = {(row['subreddit'], row['listing']): row['fetched_at']
+                       for row in self.db.execute("SELECT * FROM snapshots")}
+        min_time = time.time() - self.SNAPSHOT_TTL
+        return [(subreddit, listing, params)
+                for subreddit in subreddits for listing, params in self.LISTINGS
+                if fetched.get((subreddit, listing), 0) < min_time]
+
+    def store_snapshot(self, subreddit: str, listing: str, posts: List[tuple]):
+        """Remplace l'instantané d'un listing par ses (titre, candidat)."""
+        with self._lock:
+            self.db.execute("DELETE FROM posts WHERE subreddit = ? AND listing = ?", (subreddit, listing))
+            self.db.execute("DELETE FROM tokens WHERE subreddit = ? AND listing = ?", (subreddit, listing))
+            for title, candidate in posts:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO posts (url, subreddit, listing, score, candidate) VALUES (?, ?, ?, ?, ?)",
+                    (candidate.url, subreddit, listing, candidate.score or 0, json.dumps(candidate.to_dict()))
+                )
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO tokens (token, subreddit, listing, url) VALUES (?, ?, ?, ?)",
+                    [(token, subreddit, listing, candidate.url) for token in tokenize(title)]
+                )
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshots (subreddit, listing, fetched_at) VALUES (?, ?, ?)",
+                (subreddit, listing, time.time())
+            )
+            self.db.commit()
+
+    def post_count(self) -> int:
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def search(self, term: str, subreddits: Optional[Iterable[str]] = None, limit: int = 8) -> List[GIFCandidate]:
+        """Posts dont le titre contient tous les tokens du terme, les mieux notés d'abord."""
+        tokens = tokenize(term)
+        if not tokens:
+            return []
+
+        clauses = [f"t.token IN ({','.join('?' * len(tokens))})"]
+        params: List[Any] = list(tokens)
+        if subreddits:
+            subreddits = list(subreddits)
+            clauses.append(f"t.subreddit IN ({','.join('?' * len(subreddits))})")
+            params.extend(subreddits)
+        params.extend([len(tokens), limit])
+
+        with self._lock:
+            rows = self.db.execute(f"""
+                SELECT p.candidate, MAX(p.score) AS score
+                FROM tokens t JOIN posts p
+                  ON p.url = t.url AND p.subreddit = t.subreddit AND p.listing = t.listing
+                WHERE {' AND '.join(clauses)}
+                GROUP BY t.url
+                HAVING COUNT(DISTINCT t.token) = ?
+                ORDER BY score DESC
+                LIMIT ?
+            """, params).fetchall()
+
+        return [GIFCandidate.from_cache(json.loads(row['candidate'])) for row in rows]
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'snapshots': self.db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0],
+                'posts': self.db.execute("SELECT COUNT(*) FROM posts").fetchone()[0],
+                'tokens': self.db.execute("SELECT COUNT(*) FROM tokens").fetchone()[0],
+            }
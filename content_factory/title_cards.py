@@ -0,0 +1,133 @@
+# content_factory/title_cards.py (RENDU RAPIDE DES CARTES TITRE DE FALLBACK)
+
+import os
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageColor
+
+from content_factory.utils import safe_path_join
+
+# Polices TrueType essayées dans l'ordre (CI Ubuntu, Linux, macOS, Windows)
+FONT_CANDIDATES = {
+    True: [
+        "assets/fonts/title-bold.ttf",
+        "DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+        "/Library/Fonts/Arial Bold.ttf",
+        "C:/Windows/Fonts/arialbd.ttf",
+    ],
+    False: [
+        "assets/fonts/title-regular.ttf",
+        "DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "/Library/Fonts/Arial.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+    ],
+}
+
+
+@lru_cache(maxsize=32)
+def get_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """Police TrueType chargée une seule fois par (taille, graisse)."""
+    for candidate in FONT_CANDIDATES[bold]:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except (OSError, IOError):
+            continue
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=32)
+def gradient_background(resolution: Tuple[int, int], top_color: str, bottom_color: str) -> Image.Image:
+    """Dégradé vertical calculé en un seul passage NumPy (mis en cache par style)."""
+    width, height = resolution
+    top = np.array(ImageColor.getrgb(top_color), dtype=np.float32)
+    bottom = np.array(ImageColor.getrgb(bottom_color), dtype=np.float32)
+
+    ramp = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    rows = (top + (bottom - top) * ramp).astype(np.uint8)[:, None, :]
+    return Image.fromarray(np.ascontiguousarray(np.broadcast_to(rows, (height, width, 3))), 'RGB')
+
+
+class TitleCardRenderer:
+    """
+    Cartes titre de fallback: fonds de catégorie précalculés, polices en cache,
+    rendu parallèle et sauvegarde JPEG rapide (fichiers intermédiaires).
+    """
+
+    def __init__(self, resolution: Tuple[int, int], styles: Dict[str, List[str]],
+                 output_dir: str, max_workers: int = None):
+        self.resolution = resolution
+        self.styles = styles
+        self.output_dir = output_dir
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+
+    def _background(self, colors: List[str], is_part1: bool) -> Image.Image:
+        # Partie 1: plongée vers le noir (mystère) / Partie 2: dégradé vif (choc)
+        bottom_color = '#000000' if is_part1 else colors[2]
+        return gradient_background(self.resolution, colors[0], bottom_color).copy()
+
+    def _draw_centered_text(self, draw: ImageDraw.Draw, text: str, y: int, size: int = 36,
+                            color: str = '#FFFFFF', bold: bool = False):
+        font = get_font(size, bold)
+        text_width = draw.textlength(text, font=font)
+        x = (self.resolution[0] - text_width) // 2
+
+        if bold:
+            # Contour noir natif (un seul appel de rendu)
+            draw.text((x, y), text, fill=color, font=font, stroke_width=max(2, size // 30), stroke_fill='#000000')
+        else:
+            draw.text((x, y), text, fill=color, font=font)
+
+    def _render_card(self, colors: List[str], title: str, index: int, total: int, is_part1: bool) -> Image.Image:
+        img = self._background(colors, is_part1)
+        draw = ImageDraw.Draw(img)
+        point_num = total - index
+        middle = self.resolution[1] // 2
+
+        if is_part1:
+            self._draw_centered_text(draw, f"#{point_num}", middle - 170, size=120, color=colors[1], bold=True)
+            title_short = title[:40] + "..." if len(title) > 40 else title
+            self._draw_centered_text(draw, title_short, middle + 20, size=36, color='#FFFFFF')
+        else:
+            self._draw_centered_text(draw, f"#{point_num}", middle - 200, size=140, color='#FF0000', bold=True)
+            title_short = title[:35] + "!" * min(3, index + 1) if len(title) > 35 else title + "!" * min(2, index + 1)
+            self._draw_centered_text(draw, title_short, middle + 20, size=40, color='#FFFFFF', bold=True)
+
+        return img
+
+    def _render_and_save(self, colors: List[str], title: str, index: int, total: int,
+                         is_part1: bool, category: str, stamp: int) -> str:
+        img = self._render_card(colors, title, index, total, is_part1)
+        filename = f"brainrot_{category}_{'p1' if is_part1 else 'p2'}_{index}_{stamp}.jpg"
+        output_path = safe_path_join(self.output_dir, filename)
+        # Fichier intermédiaire: pas d'optimize (passe Huffman supplémentaire inutile)
+        img.save(output_path, 'JPEG', quality=90)
+        return output_path
+
+    def render_cards(self, title: str, category: str, is_part1: bool, count: int) -> List[str]:
+        """Rend `count` cartes en parallèle, dans l'ordre."""
+        colors = self.styles.get(category, self.styles['science'])
+        stamp = int(time.time())
+
+        def render(index: int):
+            try:
+                return self._render_and_save(colors, title, index, count, is_part1, category, stamp)
+            except Exception as e:
+                print(f"   ⚠️ Erreur génération image {index}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, count))) as executor:
+            results = list(executor.map(render, range(count)))
+
+        return [path for path in results if path]
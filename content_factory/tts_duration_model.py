@@ -0,0 +1,145 @@
+# content_factory/tts_duration_model.py (PRÉDICTION DE DURÉE TTS)
+
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, Any
+
+from content_factory.utils import ensure_directory
+
+
+class TTSDurationModel:
+    """
+    Modèle de durée TTS par voix: vitesse de lecture (caractères/seconde à
+    vitesse nominale) apprise à partir des synthèses passées et persistée.
+    Sert à choisir le `rate` Edge TTS et la longueur du texte AVANT la synthèse.
+    """
+
+    # Débits de départ (français, vitesse +0%) avant tout apprentissage
+    DEFAULT_CPS = 14.5
+    ENGINE_DEFAULT_CPS = {'gtts': 13.0, 'espeak': 13.5}
+
+    MIN_RATE = -20
+    MAX_RATE = 30
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self._lock = threading.Lock()
+        self.voices: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.model_path):
+            return
+        try:
+            with open(self.model_path, 'r', encoding='utf-8') as f:
+                self.voices = json.load(f).get('voices', {})
+        except Exception as e:
+            print(f"⚠️ Modèle de durée TTS illisible, réinitialisation: {e}")
+            self.voices = {}
+
+    def _save(self):
+        ensure_directory(os.path.dirname(self.model_path) or '.')
+        temp_path = f"{self.model_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'voices': self.voices, 'updated_at': int(time.time())}, f, indent=2)
+        os.replace(temp_path, self.model_path)
+
+    # --- PRÉDICTION ---
+
+    def base_cps(self, voice: str) -> float:
+        """Caractères/seconde de la voix à vitesse nominale (+0%)."""
+        stats = self.voices.get(voice)
+        if stats:
+            return stats['cps']
+        return self.ENGINE_DEFAULT_CPS.get(voice, self.DEFAULT_CPS)
+
+    def predict_duration(self, voice: str, chars: int, rate_percent: int = 0) -> float:
+        return chars / (self.base_cps(voice) * (1 + rate_percent / 100.0))
+
+    def chars_for_duration(self, voice: str, duration: float, rate_percent: int = 0) -> int:
+        return int(duration * self.base_cps(voice) * (1 + rate_percent / 100.0))
+
+    def plan(self, voice: str, chars: int, min_duration: float, max_duration: float,
+             preferred_rate: int = 0, supports_rate: bool = True) -> Dict[str, Any]:
+        """
+        Choisit la vitesse puis, seulement si la plage de vitesses ne suffit pas,
+        la longueur de texte visée pour tomber dans [min_duration, max_duration].
+        """
+        target = (min_duration + max_duration) / 2.0
+        rate = preferred_rate if supports_rate else 0
+
+        # Marge de sécurité proportionnelle à l'erreur observée de la voix
+        error = self.voices.get(voice, {}).get('error', 0.05)
+        margin = min((max_duration - min_duration) / 4.0, max(2.0, error * target))
+        low, high = min_duration + margin, max_duration - margin
+
+        predicted = self.predict_duration(voice, chars, rate)
+        if supports_rate and not (low <= predicted <= high):
+            needed = (chars / (self.base_cps(voice) * target) - 1.0) * 100.0
+            rate = int(round(max(self.MIN_RATE, min(self.MAX_RATE, needed))))
+            predicted = self.predict_duration(voice, chars, rate)
+
+        target_chars = chars
+        if not (low <= predicted <= high):
+            target_chars = self.chars_for_duration(voice, target, rate)
+            predicted = self.predict_duration(voice, target_chars, rate)
+
+        return {
+            'voice': voice,
+            'rate_percent': rate,
+            'target_chars': target_chars,
+            'predicted_duration': predicted
+        }
+
+    # --- APPRENTISSAGE ---
+
+    def record(self, voice: str, chars: int, rate_percent: int, duration: float):
+        """Met à jour le débit de la voix (moyenne mobile) après une synthèse réelle."""
+        if chars <= 0 or duration <= 1.0:
+            return
+
+        observed_cps = chars / duration / (1 + rate_percent / 100.0)
+
+        with self._lock:
+            stats = self.voices.get(voice)
+            if stats:
+                predicted = chars / (stats['cps'] * (1 + rate_percent / 100.0))
+                error = abs(predicted - duration) / duration
+                alpha = max(0.2, 1.0 / (stats['samples'] + 1))
+                stats['cps'] = (1 - alpha) * stats['cps'] + alpha * observed_cps
+                stats['error'] = (1 - alpha) * stats.get('error', error) + alpha * error
+                stats['samples'] += 1
+            else:
+                stats = {'cps': observed_cps, 'samples': 1, 'error': 0.05}
+                self.voices[voice] = stats
+            stats['updated_at'] = int(time.time())
+
+            try:
+                self._save()
+            except Exception as e:
+                print(f"⚠️ Modèle de durée TTS non sauvegardé: {e}")
+
+
+def fit_text_to_length(text: str, target_chars: int, extensions: list) -> str:
+    """
+    Ajuste le texte à la longueur visée: coupe à une fin de phrase si trop long,
+    complète avec des phrases d'appel à l'action si trop court.
+    """
+    if len(text) > target_chars:
+        sentences = re.split(r'(?<=[.!?])\s+', text)
+        fitted = ''
+        for sentence in sentences:
+            candidate = f"{fitted} {sentence}".strip()
+            if len(candidate) > target_chars and fitted:
+                break
+            fitted = candidate
+        return fitted
+
+    index = 0
+    while len(text) < target_chars and extensions:
+        text += extensions[index % len(extensions)]
+        index += 1
+    return text
@@ -0,0 +1,151 @@
+# content_factory/tts_engines.py (REGISTRE ADAPTATIF DES MOTEURS TTS)
+
+import os
+import json
+import time
+import threading
+from typing import Callable, Dict, List, Any, Optional
+
+from content_factory.utils import ensure_directory
+
+
+class TTSEngine:
+    """Moteur TTS enregistré: fonction de synthèse, sonde de disponibilité et préférence qualité."""
+
+    def __init__(self, name: str, synthesize: Callable, probe: Callable[[], bool],
+                 quality_penalty: float = 0.0, default_latency: float = 10.0,
+                 supports_rate: bool = False):
+        self.name = name
+        self.synthesize = synthesize
+        self.probe = probe
+        self.quality_penalty = quality_penalty  # Secondes "acceptées" pour une meilleure voix
+        self.default_latency = default_latency
+        self.supports_rate = supports_rate
+
+
+class TTSEngineRegistry:
+    """
+    Registre des moteurs TTS: capacités sondées une seule fois par process,
+    historique de latence et d'échecs persisté entre les runs, ordre d'essai
+    calculé sur le coût attendu et mise à l'écart temporaire après des échecs
+    consécutifs (ex: Edge TTS ignoré 1h après 3 timeouts).
+    """
+
+    FAILURE_THRESHOLD = 3
+    COOLDOWN_SECONDS = 3600
+    LATENCY_ALPHA = 0.3
+
+    # Résultats des sondes partagés par toutes les instances du process
+    _capabilities: Dict[str, bool] = {}
+
+    def __init__(self, stats_path: str):
+        self.stats_path = stats_path
+        self.engines: Dict[str, TTSEngine] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, Any]] = self._load_stats()
+
+    def _load_stats(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.stats_path):
+            return {}
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Historique TTS illisible, réinitialisation: {e}")
+            return {}
+
+    def _save_stats(self):
+        try:
+            ensure_directory(os.path.dirname(self.stats_path) or '.')
+            temp_path = f"{self.stats_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, indent=2)
+            os.replace(temp_path, self.stats_path)
+        except Exception as e:
+            print(f"⚠️ Historique TTS non sauvegardé: {e}")
+
+    def register(self, engine: TTSEngine):
+        self.engines[engine.name] = engine
+
+    def is_available(self, name: str) -> bool:
+        """Sonde la capacité une seule fois par process (ex: subprocess espeak)."""
+        if name not in TTSEngineRegistry._capabilities:
+            try:
+                TTSEngineRegistry._capabilities[name] = bool(self.engines[name].probe())
+            except Exception:
+                TTSEngineRegistry._capabilities[name] = False
+        return TTSEngineRegistry._capabilities[name]
+
+    def _engine_stats(self, name: str) -> Dict[str, Any]:
+        return self.stats.setdefault(name, {
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'latency': self.engines[name].default_latency if name in self.engines else 10.0,
+            'cooldown_until': 0,
+            'last_error': ''
+        })
+
+    def in_cooldown(self, name: str) -> bool:
+        return self.stats.get(name, {}).get('cooldown_until', 0) > time.time()
+
+    def expected_cost(self, name: str) -> float:
+        """Coût attendu en secondes: latence / probabilité de succès + pénalité qualité."""
+        stats = self._engine_stats(name)
+        success_rate = (stats['successes'] + 1) / (stats['successes'] + stats['failures'] + 2)
+        return stats['latency'] / success_rate + self.engines[name].quality_penalty
+
+    def ordered_engines(self) -> List[TTSEngine]:
+        """Moteurs disponibles, par coût attendu; ceux en pause passent en dernier recours."""
+        available = [name for name in self.engines if self.is_available(name)]
+        ordered = sorted(available, key=lambda name: (self.in_cooldown(name), self.expected_cost(name)))
+        return [self.engines[name] for name in ordered]
+
+    def record_success(self, name: str, latency: float):
+        with self._lock:
+            stats = self._engine_stats(name)
+            stats['successes'] += 1
+            stats['consecutive_failures'] = 0
+            stats['cooldown_until'] = 0
+            stats['latency'] = (1 - self.LATENCY_ALPHA) * stats['latency'] + self.LATENCY_ALPHA * latency
+            self._save_stats()
+
+    def record_failure(self, name: str, latency: float, error: str = ''):
+        with self._lock:
+            stats = self._engine_stats(name)
+            stats['failures'] += 1
+            stats['consecutive_failures'] += 1
+            stats['last_error'] = error[:200]
+            # Un échec lent coûte aussi du temps: il pèse dans la latence attendue
+            stats['latency'] = (1 - self.LATENCY_ALPHA) * stats['latency'] + self.LATENCY_ALPHA * latency
+
+            if stats['consecutive_failures'] >= self.FAILURE_THRESHOLD:
+                stats['cooldown_until'] = time.time() + self.COOLDOWN_SECONDS
+                print(f"⏸️ {name}: {stats['consecutive_failures']} échecs consécutifs - "
+                      f"mis à l'écart pendant {self.COOLDOWN_SECONDS // 60} min")
+            self._save_stats()
+
+    def synthesize(self, text: str, audio_path: str, plan: Dict[str, Any] = None,
+                   min_size: int = 5000) -> Optional[str]:
+        """Essaie les moteurs dans l'ordre adaptatif jusqu'au premier fichier valide."""
+        for engine in self.ordered_engines():
+            if self.in_cooldown(engine.name):
+                print(f"⏸️ {engine.name} en pause (échecs récents) - dernier recours")
+
+            print(f"⚡ Essai: {engine.name} (coût attendu {self.expected_cost(engine.name):.1f}s)")
+            start_time = time.time()
+            try:
+                result = engine.synthesize(text, audio_path, plan)
+                latency = time.time() - start_time
+
+                if result and os.path.exists(result) and os.path.getsize(result) > min_size:
+                    self.record_success(engine.name, latency)
+                    print(f"✅ SUCCÈS avec {engine.name} ({latency:.1f}s)")
+                    return result
+
+                self.record_failure(engine.name, latency, "fichier vide ou trop petit")
+            except Exception as e:
+                self.record_failure(engine.name, time.time() - start_time, str(e))
+                print(f"❌ {engine.name} échoué: {e}")
+
+        return None
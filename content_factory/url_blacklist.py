@@ -0,0 +1,92 @@
+# content_factory/url_blacklist.py (LISTE NOIRE PERSISTANTE DES URLS MORTES)
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Any, List, Iterable
+
+from content_factory.utils import ensure_directory
+from content_factory.config_loader import ConfigLoader
+
+
+class DeadURLBlacklist:
+    """
+    URLs d'assets qui ont échoué à la validation ou au téléchargement. Les échecs
+    définitifs (404, page HTML, signature invalide, trop gros) ne sont plus jamais
+    retentés; les échecs passagers (timeout, 5xx, 429) expirent après un jour.
+    """
+
+    TRANSIENT_TTL = 24 * 3600
+    MAX_ENTRIES = 50000
+
+    def __init__(self, blacklist_path: str):
+        self.blacklist_path = blacklist_path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.blacklist_path):
+            return
+        try:
+            with open(self.blacklist_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', {})
+        except Exception as e:
+            print(f"⚠️ Liste noire d'URLs illisible, réinitialisation: {e}")
+            return
+
+        now = time.time()
+        self.entries = {url: entry for url, entry in entries.items()
+                        if entry.get('expires_at') is None or entry['expires_at'] > now}
+
+    def is_dead(self, url: str) -> bool:
+        with self._lock:
+            entry = self.entries.get(url)
+            return entry is not None and (entry.get('expires_at') is None or entry['expires_at'] > time.time())
+
+    def filter_alive(self, urls: Iterable[str]) -> List[str]:
+        return [url for url in urls if not self.is_dead(url)]
+
+    def add(self, url: str, reason: str, permanent: bool = True):
+        with self._lock:
+            failures = self.entries.get(url, {}).get('failures', 0) + 1
+            self.entries[url] = {
+                'reason': reason,
+                'failures': failures,
+                'failed_at': int(time.time()),
+                'expires_at': None if permanent else time.time() + self.TRANSIENT_TTL,
+            }
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self.entries) > self.MAX_ENTRIES:
+                newest = sorted(self.entries.items(), key=lambda item: item[1]['failed_at'])[-self.MAX_ENTRIES:]
+                self.entries = dict(newest)
+            try:
+                ensure_directory(os.path.dirname(self.blacklist_path) or '.')
+                temp_path = f"{self.blacklist_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'entries': self.entries}, f)
+                os.replace(temp_path, self.blacklist_path)
+                self._dirty = False
+            except Exception as e:
+                print(f"⚠️ Liste noire d'URLs non sauvegardée: {e}")
+
+
+_url_blacklist = None
+_url_blacklist_lock = threading.Lock()
+
+
+def get_url_blacklist() -> DeadURLBlacklist:
+    """Instance partagée (chasseur de GIFs et téléchargements)."""
+    global _url_blacklist
+    with _url_blacklist_lock:
+        if _url_blacklist is None:
+            cache_dir = ConfigLoader().get_config().get('PATHS', {}).get('CACHE_DIR', 'cache')
+            _url_blacklist = DeadURLBlacklist(os.path.join(cache_dir, 'dead_urls.json'))
+        return _url_blacklist
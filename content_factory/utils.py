@@ -2,7 +2,8 @@
 
 import re
 import os
-from typing import List, Union, Any
+import time
+from typing import List, Union, Any, Dict
 
 # Constantes de Regex
 INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*\r\n\t]+')
@@ -44,6 +45,59 @@ def ensure_directory(path: str) -> str:
     return path
 
 
+def trim_cache_dir(directory: str, max_size_mb: int, min_age_seconds: int = 3600) -> int:
+    """
+    Éviction LRU (date de modification) d'un dossier de cache dérivé jusqu'à
+    passer sous `max_size_mb`. Les fichiers de même nom de base (ex. .pcm + .json)
+    partent ensemble; les entrées touchées récemment et les .tmp en cours
+    d'écriture ne sont jamais supprimés. Retourne le nombre d'entrées évincées.
+    """
+    groups: Dict[str, List[os.DirEntry]] = {}
+    try:
+        for entry in os.scandir(directory):
+            if entry.is_file() and '.tmp' not in entry.name:
+                groups.setdefault(entry.name.split('.', 1)[0], []).append(entry)
+    except OSError:
+        return 0
+
+    def group_stats(entries):
+        stats = [entry.stat() for entry in entries]
+        return sum(s.st_size for s in stats), max(s.st_mtime for s in stats)
+
+    try:
+        sized = [(key, *group_stats(entries)) for key, entries in groups.items()]
+    except OSError:
+        return 0
+
+    total = sum(size for _, size, _ in sized)
+    max_bytes = max_size_mb * 1024 * 1024
+    if total <= max_bytes:
+        return 0
+
+    evicted = 0
+    min_time = time.time() - min_age_seconds
+    for key, size, last_used in sorted(sized, key=lambda item: item[2]):
+        if total <= max_bytes or last_used >= min_time:
+            break
+        for entry in groups[key]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        total -= size
+        evicted += 1
+
+    return evicted
+
+
+def touch_file(path: str):
+    """Marque une entrée de cache comme récemment utilisée (LRU de trim_cache_dir)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
 def clean_and_format_keywords(tags: Union[List[str], str, Any], max_tags: int = 20) -> List[str]:
     """Convertit une entrée en une liste de tags propres, uniques et limités."""
     if isinstance(tags, str):
@@ -3,6 +3,7 @@
 import os
 import time
 import random
+import tempfile
 from typing import Dict, List, Any, Optional
 from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
 import numpy as np
@@ -10,7 +11,7 @@ import numpy as np
 try:
     from moviepy.editor import VideoFileClip, AudioFileClip, ImageClip, CompositeVideoClip, concatenate_videoclips
     from moviepy.audio.AudioClip import AudioClip
-    from moviepy.video.fx.all import fadein, fadeout
+    from moviepy.video.fx.all import fadein, fadeout, loop
     HAS_MOVIEPY = True
 except ImportError:
     HAS_MOVIEPY = False
@@ -19,6 +20,8 @@ except ImportError:
 from content_factory.utils import clean_filename, safe_path_join, ensure_directory
 from content_factory.config_loader import ConfigLoader
 from content_factory.image_manager import get_images
+from content_factory.frame_normalizer import FrameNormalizer, is_video_asset
+from content_factory.loudness import render_gain
 
 try:
     from content_factory.audio_generator import generate_audio
@@ -48,21 +51,27 @@ class BrainrotVideoCreator:
         self.video_config = self.config.get('VIDEO_CREATOR', {})
         self.paths = self.config.get('PATHS', {})
         
-        # 🔥 CORRECTION : Dimensions paires garanties pour H.264
-        self.resolution = (1920, 1080)  # Format paysage standard (pairs)
-        self.target_fps = 30
+        # Format final unique (VIDEO_RESOLUTION + VIDEO_ORIENTATION), dimensions paires pour H.264
+        self.normalizer = FrameNormalizer()
+        self.resolution = self.normalizer.resolution
+        self.target_fps = self.normalizer.fps
         self.max_duration = 59
         
         output_root = self.paths.get('OUTPUT_ROOT', 'output')
         video_dir = self.paths.get('VIDEO_DIR', 'videos')
         self.output_dir = safe_path_join(output_root, video_dir)
         ensure_directory(self.output_dir)
+        # Images stylisées (jetables): hors du stock d'assets, qui n'indexe que les téléchargements
+        self.work_dir = ensure_directory(self.paths.get('TEMP_DIR', 'temp'))
         
         # Configuration musique
         self.music_enabled = os.getenv('BACKGROUND_MUSIC_ENABLED', 'false').lower() == 'true'
         self.music_volume = float(os.getenv('BACKGROUND_MUSIC_VOLUME', '0.25'))
+        audio_config = self.config.get('AUDIO_GENERATOR', {})
+        self.target_lufs = audio_config.get('AUDIO_TARGET_LUFS', -14.0)
+        self.true_peak_db = audio_config.get('AUDIO_TRUE_PEAK_DB', -1.0)
         
-        print("🎬 BrainrotVideoCreator - Qualité MAX 1080p (H.264 Compatible)")
+        print(f"🎬 BrainrotVideoCreator - {self.resolution[0]}x{self.resolution[1]} @ {self.target_fps}fps (H.264 Compatible)")
         print(f"🎵 Musique: {'✅ ACTIVÉE' if self.music_enabled else '❌ DÉSACTIVÉE'}")
 
     def create_video(self, content_data: Dict[str, Any], output_dir: str = None) -> Optional[str]:
@@ -120,7 +129,7 @@ class BrainrotVideoCreator:
         
         for i, asset_path in enumerate(asset_paths):
             try:
-                if asset_path.endswith('.gif'):
+                if is_video_asset(asset_path):
                     processed_path = self._process_ultra_gif(asset_path, i)
                 else:
                     processed_path = self._apply_ultra_style(asset_path, content_data, i)
@@ -140,7 +149,7 @@ class BrainrotVideoCreator:
         """Applique le style brainrot aux images"""
         try:
             with Image.open(image_path) as img:
-                img = self._resize_ultra_quality(img)
+                img = self.normalizer.cover_image(img)
                 
                 if content_data.get('is_part1', True):
                     img = self._apply_mystery_ultra(img, index)
@@ -150,46 +159,20 @@ class BrainrotVideoCreator:
                 img = self._add_animated_borders(img, index)
                 img = self._enhance_ultra_quality(img)
                 
-                base, ext = os.path.splitext(image_path)
-                output_path = f"{base}_ultra{ext}"
-                img.save(output_path, 'JPEG', quality=95, optimize=True, subsampling=0)
-                
+                stem = os.path.splitext(os.path.basename(image_path))[0]
+                fd, output_path = tempfile.mkstemp(prefix=f"{stem}_{index}_", suffix="_ultra.jpg", dir=self.work_dir)
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        img.save(f, 'JPEG', quality=95, optimize=True, subsampling=0)
+                except Exception:
+                    os.remove(output_path)
+                    raise
+
                 return output_path
         except Exception as e:
             print(f"⚠️ Style ULTRA: {e}")
             return None
 
-    def _resize_ultra_quality(self, img: Image.Image) -> Image.Image:
-        """Redimensionne l'image avec dimensions paires pour H.264"""
-        target_width, target_height = self.resolution
-        
-        # 🔥 CORRECTION : Garantir des dimensions paires
-        target_width = target_width if target_width % 2 == 0 else target_width - 1
-        target_height = target_height if target_height % 2 == 0 else target_height - 1
-        
-        img_ratio = img.width / img.height
-        target_ratio = target_width / target_height
-        
-        if img_ratio > target_ratio:
-            new_height = target_height
-            new_width = int(img.width * (target_height / img.height))
-        else:
-            new_width = target_width
-            new_height = int(img.height * (target_width / img.width))
-        
-        # 🔥 CORRECTION : Garantir des dimensions paires pour le resize
-        new_width = new_width if new_width % 2 == 0 else new_width - 1
-        new_height = new_height if new_height % 2 == 0 else new_height - 1
-        
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        left = (new_width - target_width) // 2
-        top = (new_height - target_height) // 2
-        right = left + target_width
-        bottom = top + target_height
-        
-        return img.crop((left, top, right, bottom))
-
     def _apply_mystery_ultra(self, img: Image.Image, index: int) -> Image.Image:
         """Style mystère pour partie 1"""
         enhancer = ImageEnhance.Contrast(img)
@@ -219,15 +202,15 @@ class BrainrotVideoCreator:
         return img
 
     def _add_animated_borders(self, img: Image.Image, index: int) -> Image.Image:
-        """Ajoute des bordures animées"""
+        """Ajoute des bordures animées (dessinées DANS le cadre: la taille ne change pas)"""
         border_size = 5
         colors = [(255, 0, 0), (0, 255, 255), (255, 255, 0), (0, 0, 255)]
         border_color = colors[index % len(colors)]
         
-        new_img = Image.new('RGB', (img.width + border_size*2, img.height + border_size*2), border_color)
-        new_img.paste(img, (border_size, border_size))
+        draw = ImageDraw.Draw(img)
+        draw.rectangle([0, 0, img.width - 1, img.height - 1], outline=border_color, width=border_size)
         
-        return new_img
+        return img
 
     def _enhance_ultra_quality(self, img: Image.Image) -> Image.Image:
         """Améliore la qualité de l'image"""
@@ -236,8 +219,8 @@ class BrainrotVideoCreator:
         return img
 
     def _process_ultra_gif(self, gif_path: str, index: int) -> Optional[str]:
-        """Traite les GIFs (placeholder)"""
-        return None
+        """MP4 pré-normalisé (transcodé en arrière-plan au téléchargement, attendu si en cours)"""
+        return self.normalizer.normalize_video(gif_path)
 
     def _generate_ultra_audio(self, content_data: Dict) -> tuple[Optional[str], float]:
         """Génère l'audio avec gestion de durée"""
@@ -310,6 +293,11 @@ class BrainrotVideoCreator:
             video_duration = min(audio_clip.duration, self.max_duration)
             audio_clip = audio_clip.subclip(0, video_duration)
             
+            # Voix mesurée mais pas encore normalisée: gain appliqué ici, sans ré-encodage MP3
+            voice_gain = render_gain(audio_path, self.target_lufs, self.true_peak_db)
+            if voice_gain != 1.0:
+                audio_clip = audio_clip.volumex(voice_gain)
+            
             print(f"⏱️ Durée ULTRA: {video_duration:.1f}s")
             
             # 🎵 PHASE MUSIQUE : Ajouter la musique de fond si activée
@@ -322,17 +310,25 @@ class BrainrotVideoCreator:
                     
                     if music_path and os.path.exists(music_path):
                         print(f"🎵 Chargement musique: {os.path.basename(music_path)}")
-                        background_music = AudioFileClip(music_path)
                         
-                        # Ajuster la durée de la musique
-                        if background_music.duration > video_duration:
-                            background_music = background_music.subclip(0, video_duration)
-                        else:
-                            # Boucler la musique si trop courte
-                            background_music = background_music.loop(duration=video_duration)
+                        # Lecture directe du cache PCM (boucle par indexation modulo)
+                        if music_manager.pcm_cache:
+                            background_music = music_manager.pcm_cache.make_audio_clip(
+                                music_path, video_duration, volume=self.music_volume
+                            )
                         
-                        # Appliquer le volume
-                        background_music = background_music.volumex(self.music_volume)
+                        if background_music is None:
+                            background_music = AudioFileClip(music_path)
+                            
+                            # Ajuster la durée de la musique
+                            if background_music.duration > video_duration:
+                                background_music = background_music.subclip(0, video_duration)
+                            else:
+                                # Boucler la musique si trop courte
+                                background_music = background_music.loop(duration=video_duration)
+                            
+                            # Appliquer le volume
+                            background_music = background_music.volumex(self.music_volume)
                         
                         # Mixer l'audio principal avec la musique
                         from moviepy.audio.CompositeAudioClip import CompositeAudioClip
@@ -429,14 +425,22 @@ class BrainrotVideoCreator:
                 break
                 
             try:
-                if asset_path.endswith('.gif'):
-                    clip = VideoFileClip(asset_path)
+                if is_video_asset(asset_path):
+                    clip = VideoFileClip(asset_path, audio=False)
+                    # Clip pré-bouclé à la normalisation; boucle de secours si le segment est plus long
+                    if clip.duration and clip.duration < durations[i]:
+                        clip = clip.fx(loop, duration=durations[i])
                     clip = clip.set_duration(durations[i])
                 else:
                     clip = ImageClip(asset_path, duration=durations[i])
                 
-                # 🔥 CORRECTION : Resize avec dimensions paires
-                clip = clip.resize(height=self.resolution[1])
+                # Les assets sont déjà au format final: aucun rééchantillonnage ici
+                if tuple(clip.size) != self.resolution:
+                    print(f"⚠️ Clip {i} hors format {clip.size} - normalisation de secours")
+                    if is_video_asset(asset_path):
+                        clip = clip.resize(newsize=self.resolution)
+                    else:
+                        clip = ImageClip(self.normalizer.normalize_image(asset_path), duration=durations[i])
                 
                 # Ajouter des transitions
                 if i > 0 and len(asset_paths) > 1: